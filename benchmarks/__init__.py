@@ -0,0 +1,27 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+benchmarks --- Timing benchmarks for brew.
+==========================================
+
+Run all benchmarks with::
+
+    python -m benchmarks
+
+See ``python -m benchmarks --help`` for options.
+
+"""
+
+from . import harness
+from . import bench_archive
+from . import bench_beerxml
+from . import bench_brew
+from . import bench_brewlogs
+from . import bench_cache
+from . import bench_catalog
+from . import bench_history
+from . import bench_ingredients
+from . import bench_json
+from . import bench_table
+from . import bench_util
+from . import bench_yaml
@@ -0,0 +1,23 @@
+# Licensed under an MIT style license - see LICENSE
+import argparse
+from . import harness
+from .recipes import SIZES
+
+parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                 description='Time the brew pipeline.')
+parser.add_argument('-k', dest='match',
+                    help='only run benchmarks with names containing this')
+parser.add_argument('--sizes', default=','.join(SIZES.keys()),
+                    help='comma-separated recipe sizes: {}'.format(
+                        ', '.join('{} ({})'.format(k, v)
+                                  for k, v in SIZES.items())))
+parser.add_argument('--repeat', type=int, default=3,
+                    help='timing repeats, the best is reported')
+parser.add_argument('--min-time', type=float, default=0.2,
+                    help='minimum seconds per repeat')
+parser.add_argument('-o', '--output',
+                    help='save results to this JSON file')
+args = parser.parse_args()
+
+harness.run(sizes=args.sizes.split(','), match=args.match,
+            repeat=args.repeat, min_time=args.min_time, output=args.output)
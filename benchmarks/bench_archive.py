@@ -0,0 +1,52 @@
+# Licensed under an MIT style license - see LICENSE
+"""Binary recipe archives: 1000 recipes of each size."""
+import os
+import tempfile
+import brew as b
+from brew.archive import Archive, write_archive
+from brew.frame import TYPES
+from .harness import benchmark
+from .recipes import recipes
+
+_sizes = ('small', 'medium')
+
+
+def _archive(n):
+    fd, path = tempfile.mkstemp(suffix='.brew')
+    os.close(fd)
+    write_archive(path, recipes(1000, n))
+    return path
+
+
+@benchmark('Archive.write', sizes=_sizes)
+def write(n):
+    fd, path = tempfile.mkstemp(suffix='.brew')
+    os.close(fd)
+    items = list(recipes(1000, n))
+    return lambda: write_archive(path, items)
+
+
+@benchmark('Archive.open', sizes=_sizes)
+def open_(n):
+    path = _archive(n)
+    return lambda: Archive(path)
+
+
+@benchmark('Archive.scan', sizes=_sizes)
+def scan(n):
+    archive = Archive(_archive(n))
+    hop = TYPES.index(b.Hop)
+    return lambda: (archive.records['weight'][archive.records['code'] == hop]
+                    .sum())
+
+
+@benchmark('Archive.frame', sizes=_sizes)
+def frame(n):
+    archive = Archive(_archive(n))
+    return lambda: [archive.frame(i) for i in range(0, 1000, 10)]
+
+
+@benchmark('Archive.ingredients', sizes=_sizes)
+def ingredients(n):
+    archive = Archive(_archive(n))
+    return lambda: [archive.ingredients(i) for i in range(0, 1000, 10)]
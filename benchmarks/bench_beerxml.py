@@ -0,0 +1,22 @@
+# Licensed under an MIT style license - see LICENSE
+"""BeerXML: 100 recipes of each size."""
+import io
+from brew.beerxml import read_beerxml, write_beerxml
+from .harness import benchmark
+from .recipes import recipes
+
+_sizes = ('small', 'medium')
+
+
+@benchmark('beerxml.write', sizes=_sizes)
+def write(n):
+    items = list(recipes(100, n))
+    return lambda: write_beerxml(items, io.StringIO())
+
+
+@benchmark('beerxml.read', sizes=_sizes)
+def read(n):
+    f = io.StringIO()
+    write_beerxml(recipes(100, n), f)
+    data = f.getvalue().encode()
+    return lambda: list(read_beerxml(io.BytesIO(data)))
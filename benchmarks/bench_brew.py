@@ -0,0 +1,88 @@
+# Licensed under an MIT style license - see LICENSE
+"""Brew pipeline: mash, boil, and ferment.
+
+Stage results are cached by `Brew`, so stage benchmarks clear the
+cache before each call, except for the `cached` and `hop_change`
+benchmarks.
+
+"""
+import brew as b
+from .harness import benchmark
+from .recipes import ingredients
+
+
+def _brew(n):
+    return b.Brew(ingredients(n), 5.5)
+
+
+def _cold(n, stage):
+    brew = _brew(n)
+    method = getattr(brew, stage)
+
+    def run():
+        brew.clear_cache()
+        return method()
+
+    return run
+
+
+@benchmark('Brew.__init__')
+def init(n):
+    i = ingredients(n)
+    return lambda: b.Brew(i, 5.5)
+
+
+@benchmark('Brew.mash')
+def mash(n):
+    return _cold(n, 'mash')
+
+
+@benchmark('Brew.boil')
+def boil(n):
+    return _cold(n, 'boil')
+
+
+@benchmark('Brew.ferment')
+def ferment(n):
+    return _cold(n, 'ferment')
+
+
+@benchmark('Brew.compute_ferment')
+def compute_ferment(n):
+    return _cold(n, 'compute_ferment')
+
+
+@benchmark('Brew.compute_ferment.cached')
+def compute_ferment_cached(n):
+    brew = _brew(n)
+    brew.compute_ferment()
+    return brew.compute_ferment
+
+
+@benchmark('Brew.compute_ferment.hop_change')
+def compute_ferment_hop_change(n):
+    brew = _brew(n)
+    hop = brew.ingredients.hops[0]
+
+    def run():
+        hop.alpha = 12.0 if hop.alpha != 12.0 else 6.0
+        return brew.compute_ferment()
+
+    return run
+
+
+@benchmark('Brew.infusion')
+def infusion(n):
+    return _cold(n, 'infusion')
+
+
+@benchmark('Brew.volume')
+def volume(n):
+    brew = _brew(n)
+    return lambda: brew.volume(b.Primary(), upto=True)
+
+
+@benchmark('Brew.extract')
+def extract(n):
+    brew = _brew(n)
+    return lambda: brew.extract(b.Final())
@@ -0,0 +1,42 @@
+# Licensed under an MIT style license - see LICENSE
+"""Directories of brewlogs, one batch per file."""
+import os
+import tempfile
+from brew.brewlogs import load_directory
+from brew.yaml import dump_brewlog
+from .harness import benchmark
+from .recipes import ingredients
+
+# n files of batches of this many ingredients
+N_INGREDIENTS = 10
+
+
+def _directory(n):
+    directory = tempfile.mkdtemp()
+    for i in range(n):
+        path = os.path.join(directory, 'batch{:05d}.yaml'.format(i))
+        with open(path, 'w') as f:
+            dump_brewlog([{'batch': i, 'target_volume': 5.5,
+                           'ingredients': list(ingredients(N_INGREDIENTS,
+                                                           seed=i))}], f)
+    return directory
+
+
+@benchmark('load_directory[serial]', sizes=('small', 'medium'))
+def serial(n):
+    directory = _directory(n)
+    return lambda: load_directory(directory, workers=1)
+
+
+@benchmark('load_directory[parallel]', sizes=('small', 'medium'))
+def parallel(n):
+    directory = _directory(n)
+    return lambda: load_directory(directory)
+
+
+@benchmark('load_directory[cached]', sizes=('small', 'medium', 'large'))
+def cached(n):
+    directory = _directory(n)
+    cache = os.path.join(directory, 'cache.json')
+    load_directory(directory, cache=cache, workers=1)
+    return lambda: load_directory(directory, cache=cache)
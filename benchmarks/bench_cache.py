@@ -0,0 +1,43 @@
+# Licensed under an MIT style license - see LICENSE
+"""Persistent result cache, compare with Brew.compute_ferment.
+
+`Brew` keeps its own stage results, so `Brew.compute_ferment[cold]`
+clears them before each call.
+
+"""
+import os
+import tempfile
+import brew as b
+from brew.cache import ResultCache, recipe_key
+from .harness import benchmark
+from .recipes import ingredients
+
+
+def _brew(n):
+    return b.Brew(ingredients(n), 5.5)
+
+
+@benchmark('Brew.compute_ferment[cold]')
+def cold(n):
+    brew = _brew(n)
+
+    def run():
+        brew.clear_cache()
+        return brew.compute_ferment()
+
+    return run
+
+
+@benchmark('ResultCache.key')
+def key(n):
+    brew = _brew(n)
+    return lambda: recipe_key(brew)
+
+
+@benchmark('ResultCache.hit')
+def hit(n):
+    path = os.path.join(tempfile.mkdtemp(), 'results.sqlite')
+    cache = ResultCache(path)
+    brew = _brew(n)
+    brew.compute_ferment(cache=cache)
+    return lambda: brew.compute_ferment(cache=cache)
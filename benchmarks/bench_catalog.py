@@ -0,0 +1,37 @@
+# Licensed under an MIT style license - see LICENSE
+"""Ingredient catalog."""
+from brew.catalog import Catalog, Spec
+from .harness import benchmark
+
+
+def _specs(n):
+    return [Spec('Hop', 'Hop lot {:05d}'.format(i), alpha=3 + i % 12)
+            for i in range(n)]
+
+
+@benchmark('Catalog.insert')
+def insert(n):
+    specs = _specs(n)
+    catalog = Catalog(seed=False)
+    return lambda: catalog.insert(specs)
+
+
+@benchmark('Catalog.find[prefix]')
+def find_prefix(n):
+    catalog = Catalog()
+    catalog.insert(_specs(n))
+    return lambda: catalog.find(prefix='hop lot 0001')
+
+
+@benchmark('Catalog.find[alpha]')
+def find_alpha(n):
+    catalog = Catalog()
+    catalog.insert(_specs(n))
+    return lambda: catalog.find(type='Hop', alpha=(12.5, 13.5), limit=10)
+
+
+@benchmark('Catalog.fuzzy')
+def fuzzy(n):
+    catalog = Catalog()
+    catalog.insert(_specs(n))
+    return lambda: catalog.fuzzy('hop lot 0001x', type='Hop')
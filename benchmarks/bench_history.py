@@ -0,0 +1,68 @@
+# Licensed under an MIT style license - see LICENSE
+"""Brewlog history index, compare History.query with History.scan."""
+import os
+import tempfile
+import brew as b
+from brew.history import History
+from brew.yaml import dump_brewlog, iter_brewlog
+from .harness import benchmark
+from .recipes import ingredients
+
+# n batches of this many ingredients
+N_INGREDIENTS = 10
+
+QUERY = dict(og=(1.040, 1.070), ibu=(None, 60),
+             ingredients={'%rye%': (0.05, None)})
+
+
+def _brewlog(n):
+    """Brewlog file of `n` batches."""
+    fd, path = tempfile.mkstemp(suffix='.yaml')
+    batches = [{'batch': i, 'target_volume': 5.5,
+                'ingredients': list(ingredients(N_INGREDIENTS, seed=i))}
+               for i in range(n)]
+    with os.fdopen(fd, 'w') as f:
+        dump_brewlog(batches, f, explicit_start=True)
+    return path
+
+
+def _history(n):
+    history = History()
+    history.update(_brewlog(n))
+    return history
+
+
+@benchmark('History.update', sizes=('small', 'medium'))
+def update(n):
+    path = _brewlog(n)
+    return lambda: History().update(path)
+
+
+@benchmark('History.update[unchanged]', sizes=('small', 'medium', 'large'))
+def update_unchanged(n):
+    history = _history(n)
+    path = history.get(1).source
+    return lambda: history.update(path)
+
+
+@benchmark('History.query', sizes=('small', 'medium', 'large'))
+def query(n):
+    history = _history(n)
+    return lambda: history.query(**QUERY)
+
+
+@benchmark('History.scan', sizes=('small', 'medium'))
+def scan(n):
+    """Without an index: load and brew every batch."""
+    path = _brewlog(n)
+
+    def run():
+        ids = []
+        with open(path) as f:
+            for i, batch in enumerate(iter_brewlog(f)):
+                result = b.Brew(batch.ingredients, 5.5).compute_ferment()
+                if (1.040 <= result.beer.sg <= 1.070
+                        and result.bitterness <= 60):
+                    ids.append(i)
+        return ids
+    return run
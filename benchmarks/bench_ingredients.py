@@ -0,0 +1,44 @@
+# Licensed under an MIT style license - see LICENSE
+"""Ingredients queries.
+
+Queries return lazy views, so each benchmark iterates the result.
+
+"""
+from collections import deque
+import brew as b
+from .harness import benchmark
+from .recipes import ingredients
+
+
+def consume(items):
+    deque(items, maxlen=0)
+
+
+@benchmark('Ingredients.filter')
+def filter(n):
+    i = ingredients(n)
+    return lambda: consume(i.filter(b.Grain, b.Mash))
+
+
+@benchmark('Ingredients.upto')
+def upto(n):
+    i = ingredients(n)
+    return lambda: consume(i.upto(b.Primary()))
+
+
+@benchmark('Ingredients.at')
+def at(n):
+    i = ingredients(n)
+    return lambda: consume(i.at(b.Boil(10)))
+
+
+@benchmark('Ingredients.hops')
+def hops(n):
+    i = ingredients(n)
+    return lambda: consume(i.hops)
+
+
+@benchmark('Ingredients.fermentables.upto')
+def fermentables_upto(n):
+    i = ingredients(n)
+    return lambda: consume(i.fermentables.upto(b.Primary()))
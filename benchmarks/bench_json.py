@@ -0,0 +1,27 @@
+# Licensed under an MIT style license - see LICENSE
+"""brew.json round trip, compare with yaml.brewlog_round_trip."""
+import brew.json
+from .harness import benchmark
+from .recipes import ingredients
+
+
+def _recipes(n):
+    return [(list(ingredients(n)), 5.5, {'efficiency': 0.7})]
+
+
+@benchmark('json.dump_recipes', sizes=('small', 'medium', 'large'))
+def dump_recipes(n):
+    recipes = _recipes(n)
+    return lambda: brew.json.dump_recipes(recipes)
+
+
+@benchmark('json.load_recipes', sizes=('small', 'medium', 'large'))
+def load_recipes(n):
+    s = brew.json.dump_recipes(_recipes(n))
+    return lambda: brew.json.load_recipes(s)
+
+
+@benchmark('json.round_trip', sizes=('small', 'medium', 'large'))
+def round_trip(n):
+    recipes = _recipes(n)
+    return lambda: brew.json.load_recipes(brew.json.dump_recipes(recipes))
@@ -0,0 +1,24 @@
+# Licensed under an MIT style license - see LICENSE
+"""Table formatting."""
+from brew.table import Table
+from .harness import benchmark
+
+
+def _table(n, format):
+    tab = Table(data=(['Item {}'.format(i) for i in range(n)],
+                      [i * 0.1 for i in range(n)],
+                      [i for i in range(n)]),
+                names=('Item', 'Weight', 'Count'),
+                caption='Benchmark', format=format)
+    tab.colformats = ('{}', '{:.2f}', '{:d}')
+    tab.footer = 'Footer\n'
+    return tab
+
+
+for format in ['text', 'html', 'yaml']:
+    def setup(n, format=format):
+        tab = _table(n, format)
+        return lambda: str(tab)
+
+    benchmark('Table.__str__[{}]'.format(format),
+              sizes=('small', 'medium', 'large'))(setup)
@@ -0,0 +1,44 @@
+# Licensed under an MIT style license - see LICENSE
+"""Brewing formulas, scalar and array."""
+import numpy as np
+from brew import util
+from brew.util import bbtn
+from .harness import benchmark
+
+
+@benchmark('util.utilization[scalar]', sizes=('small',))
+def utilization(n):
+    return lambda: util.utilization(60, 1.050)
+
+
+@benchmark('util.utilization[array]')
+def utilization_array(n):
+    t = np.linspace(0, 90, n)
+    return lambda: util.utilization(t, 1.050)
+
+
+@benchmark('util.final_gravity[scalar]', sizes=('small',))
+def final_gravity(n):
+    return lambda: util.final_gravity(1.050, (152,), ('', 70, 80))
+
+
+@benchmark('util.final_gravity[array]')
+def final_gravity_array(n):
+    sg = np.linspace(1.030, 1.100, n)
+    return lambda: util.final_gravity(sg, (152,), ('', 70, 80))
+
+
+@benchmark('util.calories[scalar]', sizes=('small',))
+def calories(n):
+    return lambda: util.calories(1.050, 1.010)
+
+
+@benchmark('util.calories[array]')
+def calories_array(n):
+    og = np.linspace(1.030, 1.100, n)
+    return lambda: util.calories(og, og - 0.030)
+
+
+@benchmark('bbtn.abv[scalar]', sizes=('small',))
+def abv(n):
+    return lambda: bbtn.abv(1.050, 1.010)
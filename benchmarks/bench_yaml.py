@@ -0,0 +1,46 @@
+# Licensed under an MIT style license - see LICENSE
+"""brew.yaml round trip."""
+import yaml
+import brew.yaml
+from .harness import benchmark
+from .recipes import ingredients
+
+
+@benchmark('yaml.dump', sizes=('small', 'medium', 'large'))
+def dump(n):
+    items = list(ingredients(n))
+    return lambda: yaml.dump(items)
+
+
+@benchmark('yaml.load', sizes=('small', 'medium', 'large'))
+def load(n):
+    s = yaml.dump(list(ingredients(n)))
+    return lambda: yaml.load(s, Loader=yaml.Loader)
+
+
+def _brewlog(n):
+    return [{'batch': 1, 'ingredients': list(ingredients(n))}]
+
+
+@benchmark('yaml.dump_brewlog', sizes=('small', 'medium', 'large'))
+def dump_brewlog(n):
+    documents = _brewlog(n)
+    return lambda: brew.yaml.dump_brewlog(documents)
+
+
+@benchmark('yaml.load_brewlog', sizes=('small', 'medium', 'large'))
+def load_brewlog(n):
+    s = brew.yaml.dump_brewlog(_brewlog(n))
+    return lambda: brew.yaml.load_brewlog(s)
+
+
+@benchmark('yaml.brewlog_round_trip', sizes=('small', 'medium', 'large'))
+def brewlog_round_trip(n):
+    documents = _brewlog(n)
+    return lambda: brew.yaml.load_brewlog(brew.yaml.dump_brewlog(documents))
+
+
+@benchmark('yaml.iter_brewlog', sizes=('small', 'medium', 'large'))
+def iter_brewlog(n):
+    s = brew.yaml.dump_brewlog(_brewlog(n))
+    return lambda: list(brew.yaml.iter_brewlog(s))
@@ -0,0 +1,111 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+harness --- Benchmark registration and timing.
+==============================================
+
+"""
+
+import io
+import json
+import timeit
+from contextlib import redirect_stdout
+from .recipes import SIZES
+
+__all__ = [
+    'benchmark',
+    'run',
+]
+
+# name -> (setup function, sizes)
+BENCHMARKS = {}
+
+
+def benchmark(name, sizes=tuple(SIZES.keys())):
+    """Register a benchmark.
+
+    The decorated function takes the number of ingredients and returns
+    the callable to time.
+
+    Parameters
+    ----------
+    name : string
+      Benchmark name.
+    sizes : tuple of strings, optional
+      Run for these sizes, keys of `SIZES`.
+
+    """
+
+    def decorator(setup):
+        BENCHMARKS[name] = (setup, sizes)
+        return setup
+
+    return decorator
+
+
+def time_call(func, repeat=3, min_time=0.2):
+    """Best time per call, seconds.
+
+    Output printed by `func` is discarded.
+
+    """
+
+    def quiet():
+        with redirect_stdout(io.StringIO()):
+            func()
+
+    timer = timeit.Timer(quiet)
+    number = 1
+    while True:
+        t = timer.timeit(number)
+        if t >= min_time or number >= 10**6:
+            break
+        number *= 10
+
+    times = [t] + timer.repeat(repeat - 1, number)
+    return min(times) / number
+
+
+def run(sizes=None, match=None, repeat=3, min_time=0.2, output=None):
+    """Run benchmarks and print the results.
+
+    Parameters
+    ----------
+    sizes : list of strings, optional
+      Only run these sizes.
+    match : string, optional
+      Only run benchmarks with names containing this string.
+    repeat : int, optional
+      Number of timing repeats, the best is reported.
+    min_time : float, optional
+      Minimum time per repeat, seconds.
+    output : string, optional
+      Also save the results to this JSON file.
+
+    Returns
+    -------
+    results : list of dict
+
+    """
+
+    results = []
+    for name, (setup, bench_sizes) in sorted(BENCHMARKS.items()):
+        if match is not None and match not in name:
+            continue
+
+        for size in bench_sizes:
+            if sizes is not None and size not in sizes:
+                continue
+
+            t = time_call(setup(SIZES[size]), repeat=repeat,
+                          min_time=min_time)
+            results.append({'name': name, 'size': size,
+                            'n': SIZES[size], 'seconds': t})
+            print('{:40} {:8} {:>12.3f} ms'.format(name, size, t * 1e3),
+                  flush=True)
+
+    if output is not None:
+        with open(output, 'w') as outf:
+            json.dump(results, outf, indent=2)
+
+    return results
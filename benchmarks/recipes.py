@@ -0,0 +1,105 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+recipes --- Synthetic recipe generators for benchmarks.
+=======================================================
+
+"""
+
+import random
+import brew as b
+
+__all__ = [
+    'SIZES',
+    'ingredients',
+    'recipes',
+]
+
+# number of ingredients per recipe
+SIZES = {
+    'small': 10,
+    'medium': 100,
+    'large': 1000,
+    'huge': 10000,
+}
+
+GRAINS = [p for p in b.PPG if p.value[1] > 0]
+CULTURES = list(b.CultureBank)
+HOPS = ['Cascade', 'Centennial', 'Citra', 'Saaz', 'Hallertau', 'Fuggle']
+
+
+def ingredients(n, seed=0):
+    """A brewable recipe with `n` ingredients.
+
+    About half of the ingredients are grains, totaling 12 lbs so that
+    the mash is always feasible, and a third are hops.  The rest are
+    sugars, water, and spices, plus one culture.
+
+    Parameters
+    ----------
+    n : int
+      Number of ingredients.
+    seed : int, optional
+      Random number generator seed.
+
+    Returns
+    -------
+    ingredients : Ingredients
+
+    """
+
+    rng = random.Random(seed)
+    n_grains = max(1, n // 2)
+    n_hops = max(1, n // 3)
+    n_other = max(0, n - n_grains - n_hops - 1)
+
+    items = []
+    for i in range(n_grains):
+        timing = b.Vorlauf() if rng.random() < 0.1 else b.Mash()
+        items.append(b.Grain(rng.choice(GRAINS), 12 / n_grains,
+                             timing=timing))
+
+    for i in range(n_hops):
+        timing = rng.choice([b.Boil(rng.choice([60, 30, 15, 5, 0])),
+                             b.HopStand(rng.choice([10, 20])),
+                             b.FirstWort(60)])
+        items.append(b.Hop(rng.choice(HOPS), rng.uniform(3, 14),
+                           rng.uniform(0.1, 2) / n_hops * 3, timing=timing,
+                           whole=rng.random() < 0.2))
+
+    for i in range(n_other):
+        r = rng.random()
+        if r < 0.3:
+            items.append(b.Sugar(b.PPG.TableSugar, 0.1,
+                                 timing=rng.choice([b.Boil(10),
+                                                    b.Primary()])))
+        elif r < 0.5:
+            items.append(b.Water('Top off', 0.01, b.Primary()))
+        else:
+            items.append(b.Spice('Coriander', '0.1 oz', b.Boil(5)))
+
+    items.append(b.Culture(rng.choice(CULTURES)))
+    rng.shuffle(items)
+    return b.Ingredients(items)
+
+
+def recipes(count, n, seed=0):
+    """Generate `(ingredients, target_volume, config)` tuples.
+
+    Parameters
+    ----------
+    count : int
+      Number of recipes.
+    n : int
+      Number of ingredients per recipe.
+    seed : int, optional
+      Random number generator seed.
+
+    """
+
+    rng = random.Random(seed)
+    for i in range(count):
+        config = {'efficiency': rng.uniform(0.6, 0.8),
+                  'r_mash': rng.uniform(1.25, 2.0),
+                  'boil_time': rng.choice([60, 90])}
+        yield ingredients(n, seed=seed + i), rng.uniform(5, 6), config
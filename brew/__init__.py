@@ -9,6 +9,7 @@ brew --- A homebrew calculator.
 from . import ingredients
 from . import timing
 from . import brew
+from . import render
 from . import util
 
 from .brew import *
@@ -30,3 +31,4 @@ def set_format(format):
     global _default_format
     assert format in ['text', 'html', 'notebook', 'yaml']
     _default_format = format
+    render.default_format = format
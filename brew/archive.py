@@ -0,0 +1,371 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+archive --- Binary recipe archives.
+===================================
+
+An archive stores many recipes: ingredients, `Brew` configuration,
+and optionally the results of `brew.batch`.  It is read through a
+memory map, and numeric data are NumPy views of the file, so opening
+an archive is immediate, and scanning or slicing recipes does not
+create ingredients::
+
+    >>> with Archive('recipes.brew') as archive:
+    ...     strong = np.flatnonzero(archive.results['abv'] > 8)
+    ...     ingredients = archive.ingredients(strong[0])
+
+Layout, all little endian and aligned to 8 bytes:
+
+  * header (`header_dtype`);
+  * ingredient records (`record_dtype`), one per ingredient, with the
+    `IngredientFrame` columns, strings as indices of the string table;
+  * recipe records (`recipe_dtype`), one per recipe, with the range of
+    its ingredient records, target volume, configuration, and results;
+  * string table: offsets (uint64, one more than the number of
+    strings), then UTF-8 data.
+
+"""
+
+import json
+import mmap
+import numpy as np
+from .batch import summary_dtype
+from .brew import Brew
+from .configuration import _tuples, config_default, get_config
+from .frame import IngredientFrame, _columns
+
+__all__ = [
+    'Archive',
+    'ArchiveWriter',
+    'write_archive',
+]
+
+MAGIC = b'BREWARCH'
+VERSION = 1
+
+# string index for `None`
+NO_STRING = 0xffffffff
+
+header_dtype = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u8'),
+    ('n_records', '<u8'),
+    ('n_recipes', '<u8'),
+    ('n_strings', '<u8'),
+    ('records', '<u8'),
+    ('recipes', '<u8'),
+    ('strings', '<u8'),
+])
+
+record_dtype = np.dtype([
+    (k, '<u4' if dtype == 'O' else np.dtype(dtype).newbyteorder('<'))
+    for k, dtype in _columns])
+
+# parameters that may be array-like, stored as JSON strings
+_json_parameters = ('T_rest', 'T_sacc')
+
+config_dtype = np.dtype([
+    (k, '<u4' if k in _json_parameters
+     else '?' if isinstance(v, bool) else '<f8')
+    for k, v in config_default.items()])
+
+recipe_dtype = np.dtype([
+    ('start', '<u8'),
+    ('count', '<u8'),
+    ('target_volume', '<f8'),
+    ('config', config_dtype),
+    ('result', summary_dtype.newbyteorder('<')),
+])
+
+
+def _padding(n):
+    return -n % 8
+
+
+class ArchiveWriter:
+    """Write a recipe archive, one recipe at a time.
+
+    Parameters
+    ----------
+    path : string
+      The archive file, replaced if it exists.
+    chunksize : int, optional
+      Ingredient records are written in chunks of about this many
+      records.
+
+    """
+
+    def __init__(self, path, chunksize=10000):
+        self.chunksize = chunksize
+        self._file = open(path, 'wb')
+        self._file.write(np.zeros(1, header_dtype).tobytes())
+        self._pending = []
+        self._n_records = 0
+        self._recipes = []
+        self._strings = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        if type is None:
+            self.close()
+        else:
+            self._file.close()
+
+    def _string(self, s):
+        if s is None:
+            return NO_STRING
+        return self._strings.setdefault(s, len(self._strings))
+
+    def _flush(self):
+        frame = IngredientFrame.from_ingredients(self._pending)
+        records = np.empty(len(frame), record_dtype)
+        for k, dtype in _columns:
+            if dtype == 'O':
+                records[k] = [self._string(s) for s in getattr(frame, k)]
+            else:
+                records[k] = getattr(frame, k)
+        self._file.write(records.tobytes())
+        self._pending = []
+
+    def add(self, ingredients, target_volume, config=None, result=None):
+        """Add a recipe.
+
+        Parameters
+        ----------
+        ingredients : Ingredients or list
+          The ingredients.
+        target_volume : float
+          Target volume, gallons.
+        config : dict, optional
+          `Brew` keyword arguments, and optionally 'parameter_sets',
+          as for `brew.batch`.  Parameters not given are taken from
+          the configuration file.
+        result : tuple or ndarray, optional
+          A `brew.batch` summary, in the order of `summary_dtype`.
+
+        """
+        config = {} if config is None else dict(config)
+        full = get_config(config.pop('parameter_sets', None))
+        full.update(config)
+        unknown = set(full) - set(config_dtype.names)
+        if len(unknown) > 0:
+            raise ValueError('Cannot archive parameters: {}'.format(
+                ', '.join(sorted(unknown))))
+
+        values = []
+        for k in config_dtype.names:
+            v = full[k]
+            if config_dtype[k].kind == 'u':
+                v = self._string(json.dumps(v))
+            values.append(v)
+
+        if result is None:
+            result = (np.nan,) * len(summary_dtype)
+
+        self._recipes.append((self._n_records, len(ingredients),
+                              target_volume, tuple(values), tuple(result)))
+        self._pending.extend(ingredients)
+        self._n_records += len(ingredients)
+        if len(self._pending) >= self.chunksize:
+            self._flush()
+
+    def add_brew(self, brew, result=None):
+        """Add a recipe from a `Brew`.
+
+        Parameters
+        ----------
+        brew : Brew
+          The recipe and its configuration.
+        result : FermentResult, optional
+          Summarized as by `brew.batch`.
+
+        """
+        if result is not None:
+            mash = result.boil.mash
+            result = (result.beer.sg, result.beer.fg, result.bitterness,
+                      result.beer.abv, mash.v_mash, mash.v_sparge)
+        self.add(brew.ingredients, brew.target_volume, brew.config, result)
+
+    def close(self):
+        """Write the recipes and string table, and close the file."""
+        f = self._file
+        if len(self._pending) > 0:
+            self._flush()
+        header = np.zeros(1, header_dtype)
+        header['magic'] = MAGIC
+        header['version'] = VERSION
+        header['n_records'] = self._n_records
+        header['n_recipes'] = len(self._recipes)
+        header['n_strings'] = len(self._strings)
+        header['records'] = header_dtype.itemsize
+
+        f.write(b'\0' * _padding(f.tell()))
+        header['recipes'] = f.tell()
+        f.write(np.array(self._recipes, recipe_dtype).tobytes())
+
+        f.write(b'\0' * _padding(f.tell()))
+        header['strings'] = f.tell()
+        data = [s.encode('utf8') for s in self._strings]
+        offsets = np.zeros(len(data) + 1, '<u8')
+        np.cumsum([len(s) for s in data], out=offsets[1:])
+        f.write(offsets.tobytes())
+        f.write(b''.join(data))
+
+        f.seek(0)
+        f.write(header.tobytes())
+        f.close()
+
+
+def write_archive(path, recipes, results=None):
+    """Write recipes to an archive.
+
+    Parameters
+    ----------
+    path : string
+      The archive file, replaced if it exists.
+    recipes : iterable
+      `(ingredients, target_volume, config)` tuples, as for
+      `brew.batch`.
+    results : ndarray, optional
+      Summaries from `brew.batch.evaluate`, in the order of
+      `recipes`.
+
+    """
+    with ArchiveWriter(path) as writer:
+        for i, (ingredients, target_volume, config) in enumerate(recipes):
+            result = None if results is None else results[i]
+            writer.add(ingredients, target_volume, config, result)
+
+
+class Archive:
+    """Read a recipe archive.
+
+    Parameters
+    ----------
+    path : string
+      The archive file.
+
+    Attributes
+    ----------
+    records : ndarray
+      All ingredient records, `record_dtype`.
+    recipes : ndarray
+      All recipe records, `recipe_dtype`.
+    results : ndarray
+      Recipe results, `summary_dtype`, NaN where not archived.
+
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header = np.frombuffer(self._mmap, header_dtype, count=1)[0]
+        if header['magic'] != MAGIC:
+            raise ValueError('{} is not a recipe archive'.format(path))
+        if header['version'] != VERSION:
+            raise ValueError('Unsupported archive version: {}'.format(
+                header['version']))
+
+        n_strings = int(header['n_strings'])
+        self.records = np.frombuffer(self._mmap, record_dtype,
+                                     count=int(header['n_records']),
+                                     offset=int(header['records']))
+        self.recipes = np.frombuffer(self._mmap, recipe_dtype,
+                                     count=int(header['n_recipes']),
+                                     offset=int(header['recipes']))
+        self._offsets = np.frombuffer(self._mmap, '<u8', count=n_strings + 1,
+                                      offset=int(header['strings']))
+        self._data = int(header['strings']) + self._offsets.nbytes
+        self._decoded = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Release the memory map.
+
+        Views of the archive keep the file mapped until they are
+        deleted.
+
+        """
+        self.records = self.recipes = self._offsets = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def __len__(self):
+        return len(self.recipes)
+
+    def __repr__(self):
+        return '<Archive: {} recipes>'.format(len(self))
+
+    @property
+    def results(self):
+        return self.recipes['result']
+
+    def string(self, k):
+        """String `k` of the string table, `None` for `NO_STRING`."""
+        if k == NO_STRING:
+            return None
+        try:
+            return self._decoded[k]
+        except KeyError:
+            i = self._data + int(self._offsets[k])
+            j = self._data + int(self._offsets[k + 1])
+            s = self._decoded[k] = self._mmap[i:j].decode('utf8')
+            return s
+
+    def _records(self, i):
+        recipe = self.recipes[i]
+        start = int(recipe['start'])
+        return self.records[start:start + int(recipe['count'])]
+
+    def frame(self, i):
+        """Ingredients of recipe `i`, as an `IngredientFrame`.
+
+        Numeric columns are views of the archive.
+
+        """
+        records = self._records(i)
+        columns = {}
+        for k, dtype in _columns:
+            if dtype == 'O':
+                columns[k] = [self.string(s) for s in records[k].tolist()]
+            else:
+                columns[k] = records[k]
+        return IngredientFrame(**columns)
+
+    def ingredients(self, i):
+        """Ingredients of recipe `i`."""
+        return self.frame(i).to_ingredients()
+
+    def config(self, i):
+        """`Brew` configuration of recipe `i`, lists as tuples."""
+        config = {}
+        record = self.recipes[i]['config']
+        for k in config_dtype.names:
+            v = record[k].item()
+            if config_dtype[k].kind == 'u':
+                v = json.loads(self.string(v))
+            config[k] = v
+        return _tuples(config)
+
+    def brew(self, i):
+        """A `Brew` for recipe `i`."""
+        return Brew(self.ingredients(i),
+                    float(self.recipes[i]['target_volume']),
+                    **self.config(i))
+
+    def __iter__(self):
+        """Iterate over recipes as `(ingredients, target_volume, config)`."""
+        for i in range(len(self)):
+            yield (self.ingredients(i),
+                   float(self.recipes[i]['target_volume']),
+                   self.config(i))
@@ -0,0 +1,140 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+batch --- Evaluate many recipes in parallel.
+============================================
+
+Recipes are `(ingredients, target_volume, config)` tuples, where
+`config` is a dictionary of `Brew` keyword arguments (or `None`).  A
+`parameter_sets` item in `config` is passed on to `Brew`.
+
+"""
+
+from functools import partial
+from multiprocessing import Pool
+import numpy as np
+from .brew import Brew
+from .configuration import load_config, set_config
+from .profiling import Profile
+
+__all__ = [
+    'summary_dtype',
+    'evaluate',
+    'imap',
+]
+
+# one row per recipe
+summary_dtype = np.dtype([
+    ('og', 'f8'),
+    ('fg', 'f8'),
+    ('ibu', 'f8'),
+    ('abv', 'f8'),
+    ('v_mash', 'f8'),
+    ('v_sparge', 'f8'),
+])
+
+
+def _evaluate(recipe, cache=None):
+    """Brew one recipe and summarize the results."""
+    ingredients, target_volume, config = recipe
+    config = {} if config is None else dict(config)
+    parameter_sets = config.pop('parameter_sets', None)
+
+    brew = Brew(ingredients, target_volume, parameter_sets=parameter_sets,
+                **config)
+    result = brew.compute_ferment(cache=cache)
+    mash = result.boil.mash
+    return (result.beer.sg, result.beer.fg, result.bitterness,
+            result.beer.abv, mash.v_mash, mash.v_sparge)
+
+
+def _evaluate_indexed(item, profile=False, cache=None):
+    i, recipe = item
+    if not profile:
+        return i, _evaluate(recipe, cache), None
+
+    with Profile() as prof:
+        row = _evaluate(recipe, cache)
+    return i, row, prof.to_dict()
+
+
+def imap(recipes, workers=None, chunksize=100, profile=None, cache=None):
+    """Evaluate recipes, yielding results as they finish.
+
+    Parameters
+    ----------
+    recipes : iterable
+      `(ingredients, target_volume, config)` tuples.
+    workers : int, optional
+      Number of worker processes, default is the number of CPUs.  Use
+      1 to evaluate in this process.
+    chunksize : int, optional
+      Number of recipes sent to a worker at a time.
+    profile : Profile, optional
+      Add the stage timings of all workers to this profile.
+    cache : ResultCache, optional
+      Reuse and store results in this cache, see `brew.cache`.  Worker
+      processes open the same file.
+
+    Yields
+    ------
+    i : int
+      Index of the recipe in `recipes`.
+    row : tuple
+      The recipe summary, in the order of `summary_dtype`.
+
+    """
+
+    evaluate = partial(_evaluate_indexed, profile=profile is not None,
+                       cache=cache)
+
+    def collect(items):
+        for i, row, stats in items:
+            if stats is not None:
+                profile.merge(Profile.from_dict(stats))
+            yield i, row
+
+    if workers == 1:
+        yield from collect(map(evaluate, enumerate(recipes)))
+        return
+
+    # read the configuration once, workers keep it in memory
+    with Pool(workers, initializer=set_config,
+              initargs=(load_config(),)) as pool:
+        yield from collect(pool.imap_unordered(evaluate, enumerate(recipes),
+                                               chunksize=chunksize))
+
+
+def evaluate(recipes, workers=None, chunksize=100, profile=None,
+             cache=None):
+    """Evaluate recipes in a process pool.
+
+    Parameters
+    ----------
+    recipes : iterable
+      `(ingredients, target_volume, config)` tuples.
+    workers : int, optional
+      Number of worker processes, default is the number of CPUs.  Use
+      1 to evaluate in this process.
+    chunksize : int, optional
+      Number of recipes sent to a worker at a time.
+    profile : Profile, optional
+      Add the stage timings of all workers to this profile.
+    cache : ResultCache, optional
+      See `imap`.
+
+    Returns
+    -------
+    summary : ndarray
+      Structured array, with `summary_dtype`, in the order of
+      `recipes`.
+
+    """
+
+    rows = dict(imap(recipes, workers=workers, chunksize=chunksize,
+                     profile=profile, cache=cache))
+    summary = np.empty(len(rows), summary_dtype)
+    for i, row in rows.items():
+        summary[i] = row
+
+    return summary
@@ -0,0 +1,464 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+beerxml --- Read and write BeerXML 1.0 recipes.
+===============================================
+
+Recipes are read one at a time, so files with thousands of recipes
+are read with constant memory::
+
+    >>> from brew.batch import evaluate
+    >>> with open('recipes.xml', 'rb') as f:
+    ...     summary = evaluate(r[:3] for r in read_beerxml(f))
+
+BeerXML uses SI units, brew uses pounds, ounces, gallons, and degrees
+Fahrenheit.  BeerXML has fewer ingredient types than brew, so some
+conversions are lossy:
+
+  * Fermentables: 'Grain' is `Grain`, 'Adjunct' is `Fermentable`,
+    'Sugar', 'Extract', and 'Dry Extract' are `Sugar`.  `Unfermentable`
+    and other fermentables are written as 'Adjunct'; `Unfermentable`
+    is marked with a BREW_TYPE element, which other programs ignore.
+  * Hops: 'Boil', 'First Wort', 'Mash', 'Aroma' (`HopStand`), and 'Dry
+    Hop' (`Secondary`).
+  * Miscs: 'Spice', 'Herb', and 'Flavor' are `Spice`, 'Water Agent' is
+    `WaterTreatment`, others are `Other`.  The quantity is kept as
+    DISPLAY_AMOUNT.
+  * Yeasts: `Culture`, with the CultureBank item when the name matches.
+    BeerXML has one attenuation, the mean of the culture's range.
+  * Water profiles and styles are not read or written.
+
+Records without a NAME, and records that cannot be converted, raise
+`ValueError`.
+
+"""
+
+from collections import namedtuple
+from xml.etree import ElementTree as ET
+from . import ingredients as I
+from . import timing as T
+from .configuration import get_config
+
+__all__ = [
+    'Recipe',
+    'read_beerxml',
+    'write_beerxml',
+]
+
+Recipe = namedtuple('Recipe', ['ingredients', 'target_volume', 'config',
+                               'name'])
+Recipe.__doc__ = """A recipe.
+
+The first three items are the `(ingredients, target_volume, config)`
+tuples of `brew.batch`.
+
+Parameters
+----------
+ingredients : Ingredients
+  The ingredients.
+target_volume : float
+  Batch size, gallons.
+config : dict
+  `Brew` keyword arguments.
+name : string
+  Recipe name.
+
+"""
+
+LB_PER_KG = 2.20462262
+OZ_PER_KG = 35.2739619
+GAL_PER_L = 0.264172052
+
+# gravity points per pound per gallon of sucrose, the 100% yield
+PPG_SUCROSE = 46.214
+
+# degrees C, mash steps at or above this temperature are mash outs
+MASH_OUT = 75
+
+# minutes per day, dry hop and secondary times
+DAY = 1440
+
+_cultures = {c.value[0].lower(): c for c in I.CultureBank}
+
+
+def _c2f(t):
+    return t * 9 / 5 + 32
+
+
+def _f2c(t):
+    return (t - 32) * 5 / 9
+
+
+def _text(elem, tag, default=None):
+    child = elem.find(tag)
+    if child is None or child.text is None or child.text.strip() == '':
+        return default
+    return child.text.strip()
+
+
+def _float(elem, tag, default=None):
+    text = _text(elem, tag)
+    return default if text is None else float(text)
+
+
+def _bool(elem, tag):
+    return (_text(elem, tag) or 'false').lower() == 'true'
+
+
+def _required(elem, tag):
+    text = _text(elem, tag)
+    if text is None:
+        raise ValueError('missing {}'.format(tag))
+    return text
+
+
+def _fermentable(elem):
+    name = _required(elem, 'NAME')
+    kind = (_text(elem, 'TYPE') or 'Grain').lower()
+    weight = _float(elem, 'AMOUNT', 0) * LB_PER_KG
+    ppg = round(_float(elem, 'YIELD', 0) / 100 * PPG_SUCROSE)
+    if kind == 'grain':
+        cls = I.Grain
+    elif _text(elem, 'BREW_TYPE') == 'Unfermentable':
+        cls = I.Unfermentable
+    elif kind == 'adjunct':
+        cls = I.Fermentable
+    else:
+        cls = I.Sugar
+    timing = T.Primary() if _bool(elem, 'ADD_AFTER_BOIL') else None
+    kwargs = {} if timing is None else {'timing': timing}
+    return cls(ppg, weight, name=name, **kwargs)
+
+
+def _hop(elem, boil_time):
+    use = (_text(elem, 'USE') or 'Boil').lower()
+    time = _float(elem, 'TIME', 0)
+    if use == 'first wort':
+        timing = T.FirstWort(boil_time)
+    elif use == 'mash':
+        timing = T.Mash()
+    elif use == 'aroma':
+        timing = T.HopStand(time)
+    elif use == 'dry hop':
+        timing = T.Secondary(time / DAY)
+    else:
+        timing = T.Boil(time)
+
+    form = (_text(elem, 'FORM') or 'Pellet').lower()
+    return I.Hop(_required(elem, 'NAME'), _float(elem, 'ALPHA', 0),
+                 _float(elem, 'AMOUNT', 0) * OZ_PER_KG, timing,
+                 whole=form in ('leaf', 'plug'), beta=_float(elem, 'BETA'))
+
+
+def _misc(elem):
+    kind = (_text(elem, 'TYPE') or 'Other').lower()
+    if kind in ('spice', 'herb', 'flavor'):
+        cls = I.Spice
+    elif kind == 'water agent':
+        cls = I.WaterTreatment
+    else:
+        cls = I.Other
+
+    use = (_text(elem, 'USE') or 'Boil').lower()
+    time = _float(elem, 'TIME', 0)
+    timing = {
+        'mash': T.Mash,
+        'primary': T.Primary,
+        'bottling': T.Packaging,
+    }.get(use)
+    if timing is not None:
+        timing = timing()
+    elif use == 'secondary':
+        timing = T.Secondary(time / DAY)
+    else:
+        timing = T.Boil(time)
+
+    quantity = _text(elem, 'DISPLAY_AMOUNT')
+    if quantity is None:
+        unit = 'kg' if _bool(elem, 'AMOUNT_IS_WEIGHT') else 'L'
+        quantity = '{:g} {}'.format(_float(elem, 'AMOUNT', 0), unit)
+    return cls(_required(elem, 'NAME'), quantity, timing)
+
+
+def _yeast(elem):
+    name = _required(elem, 'NAME')
+    product = _text(elem, 'PRODUCT_ID')
+    if product is not None and not name.startswith(product):
+        name = '{}, {}'.format(product, name)
+
+    culture = _cultures.get(name.lower())
+    if culture is None:
+        attenuation = _float(elem, 'ATTENUATION', 75)
+        culture = (name, attenuation, attenuation)
+
+    timing = (T.Secondary() if _bool(elem, 'ADD_TO_SECONDARY')
+              else T.Primary())
+    quantity = _text(elem, 'DISPLAY_AMOUNT', '1')
+    return I.Culture(culture, quantity, timing)
+
+
+def _config(elem):
+    config = {}
+    boil_time = _float(elem, 'BOIL_TIME')
+    if boil_time is not None:
+        config['boil_time'] = boil_time
+
+    efficiency = _float(elem, 'EFFICIENCY')
+    if efficiency is not None:
+        config['efficiency'] = efficiency / 100
+
+    mash = elem.find('MASH')
+    if mash is not None:
+        T_grain = _float(mash, 'GRAIN_TEMP')
+        if T_grain is not None:
+            config['T_grain'] = _c2f(T_grain)
+
+        steps = [_float(step, 'STEP_TEMP')
+                 for step in mash.iterfind('MASH_STEPS/MASH_STEP')]
+        steps = [t for t in steps if t is not None]
+        config['mash_out'] = len(steps) > 1 and steps[-1] >= MASH_OUT
+        if config['mash_out']:
+            steps = steps[:-1]
+        if len(steps) > 0:
+            config['T_rest'] = [_c2f(t) for t in steps[:-1]]
+            config['T_sacc'] = _c2f(steps[-1])
+
+    return config
+
+
+def _recipe(elem):
+    name = _text(elem, 'NAME')
+    config = _config(elem)
+    boil_time = config.get('boil_time', 60)
+    records = (('FERMENTABLES/FERMENTABLE', _fermentable),
+               ('HOPS/HOP', lambda e: _hop(e, boil_time)),
+               ('MISCS/MISC', _misc),
+               ('YEASTS/YEAST', _yeast))
+    items = []
+    for path, read in records:
+        for n, e in enumerate(elem.iterfind(path), 1):
+            try:
+                items.append(read(e))
+            except (TypeError, ValueError) as exc:
+                raise ValueError('recipe {!r}, {} {}: {}'.format(
+                    name, e.tag, n, exc)) from exc
+    return Recipe(I.Ingredients(items),
+                  _float(elem, 'BATCH_SIZE', 0) * GAL_PER_L, config, name)
+
+
+def read_beerxml(source):
+    """Read recipes from a BeerXML file, one at a time.
+
+    Parameters
+    ----------
+    source : string or file
+      File name or binary file object.
+
+    Yields
+    ------
+    recipe : Recipe
+
+    """
+    root = None
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if root is None:
+            root = elem
+        elif event == 'end' and elem.tag == 'RECIPE':
+            yield _recipe(elem)
+            # drop the recipe, and anything before it
+            root.clear()
+
+########################################################################
+
+
+def _sub(parent, tag, value):
+    child = ET.SubElement(parent, tag)
+    if isinstance(value, bool):
+        child.text = 'TRUE' if value else 'FALSE'
+    elif isinstance(value, float):
+        child.text = repr(value)
+    else:
+        child.text = str(value)
+    return child
+
+
+def _fermentable_element(item):
+    elem = ET.Element('FERMENTABLE')
+    _sub(elem, 'NAME', item.name)
+    _sub(elem, 'VERSION', 1)
+    if isinstance(item, I.Grain):
+        kind = 'Grain'
+    elif isinstance(item, I.Sugar):
+        kind = 'Sugar'
+    else:
+        kind = 'Adjunct'
+    _sub(elem, 'TYPE', kind)
+    if isinstance(item, I.Unfermentable):
+        _sub(elem, 'BREW_TYPE', 'Unfermentable')
+    _sub(elem, 'AMOUNT', item.weight / LB_PER_KG)
+    _sub(elem, 'YIELD', item.ppg / PPG_SUCROSE * 100)
+    _sub(elem, 'COLOR', 0)
+    timing = item.timing
+    _sub(elem, 'ADD_AFTER_BOIL', timing is not None
+         and timing >= T.Primary())
+    return elem
+
+
+def _hop_element(item):
+    elem = ET.Element('HOP')
+    _sub(elem, 'NAME', item.name)
+    _sub(elem, 'VERSION', 1)
+    _sub(elem, 'ALPHA', float(item.alpha))
+    _sub(elem, 'AMOUNT', item.weight / OZ_PER_KG)
+
+    timing = item.timing
+    time = 0.0
+    if isinstance(timing, T.FirstWort):
+        use = 'First Wort'
+        time = float(timing.time)
+    elif isinstance(timing, T.Mash):
+        use = 'Mash'
+    elif isinstance(timing, T.HopStand):
+        use = 'Aroma'
+        time = float(timing.time)
+    elif isinstance(timing, T.Secondary):
+        use = 'Dry Hop'
+        time = float(timing.time) * DAY
+    elif isinstance(timing, T.Primary):
+        use = 'Dry Hop'
+    else:
+        use = 'Boil'
+        time = float(getattr(timing, 'time', 0))
+    _sub(elem, 'USE', use)
+    _sub(elem, 'TIME', time)
+    _sub(elem, 'FORM', 'Leaf' if item.whole else 'Pellet')
+    if item.beta is not None:
+        _sub(elem, 'BETA', float(item.beta))
+    return elem
+
+
+def _misc_element(item):
+    elem = ET.Element('MISC')
+    _sub(elem, 'NAME', item.name)
+    _sub(elem, 'VERSION', 1)
+    if isinstance(item, I.Spice):
+        kind = 'Spice'
+    elif isinstance(item, I.WaterTreatment):
+        kind = 'Water Agent'
+    else:
+        kind = 'Other'
+    _sub(elem, 'TYPE', kind)
+
+    timing = item.timing
+    time = 0.0
+    if isinstance(timing, (T.Mash, T.Vorlauf, T.Sparge, T.Lauter)):
+        use = 'Mash'
+    elif isinstance(timing, T.Primary):
+        use = 'Primary'
+    elif isinstance(timing, T.Secondary):
+        use = 'Secondary'
+        time = float(timing.time) * DAY
+    elif isinstance(timing, (T.Packaging, T.Final)):
+        use = 'Bottling'
+    else:
+        use = 'Boil'
+        time = float(getattr(timing, 'time', 0) or 0)
+    _sub(elem, 'USE', use)
+    _sub(elem, 'TIME', time)
+    _sub(elem, 'AMOUNT', 0.0)
+    _sub(elem, 'DISPLAY_AMOUNT', item.quantity)
+    return elem
+
+
+def _yeast_element(item):
+    elem = ET.Element('YEAST')
+    _sub(elem, 'NAME', item.name)
+    _sub(elem, 'VERSION', 1)
+    _sub(elem, 'TYPE', 'Ale')
+    _sub(elem, 'FORM', 'Liquid')
+    _sub(elem, 'AMOUNT', 0.0)
+    _sub(elem, 'DISPLAY_AMOUNT', item.quantity)
+    _sub(elem, 'ATTENUATION', float(sum(item.attenuation) / 2))
+    _sub(elem, 'ADD_TO_SECONDARY', isinstance(item.timing, T.Secondary))
+    return elem
+
+
+def _recipe_element(ingredients, target_volume, config, name):
+    if not isinstance(ingredients, I.Ingredients):
+        ingredients = I.Ingredients(ingredients)
+    config = {} if config is None else dict(config)
+    full = get_config(config.pop('parameter_sets', None))
+    full.update(config)
+
+    elem = ET.Element('RECIPE')
+    _sub(elem, 'NAME', name)
+    _sub(elem, 'VERSION', 1)
+    _sub(elem, 'TYPE', 'All Grain')
+    _sub(elem, 'BREWER', '')
+    batch_size = target_volume / GAL_PER_L
+    _sub(elem, 'BATCH_SIZE', batch_size)
+    _sub(elem, 'BOIL_SIZE', batch_size
+         + full['r_boil'] * full['boil_time'] / 60 / GAL_PER_L)
+    _sub(elem, 'BOIL_TIME', float(full['boil_time']))
+    _sub(elem, 'EFFICIENCY', full['efficiency'] * 100)
+
+    groups = (('FERMENTABLES', _fermentable_element,
+               (I.Fermentable, I.Unfermentable)),
+              ('HOPS', _hop_element, (I.Hop,)),
+              ('MISCS', _misc_element, (I.Spice, I.Other, I.WaterTreatment,
+                                        I.Priming)),
+              ('YEASTS', _yeast_element, (I.Culture,)))
+    for tag, element, types in groups:
+        group = ET.SubElement(elem, tag)
+        group.extend(element(item) for item in ingredients.filter(*types))
+    ET.SubElement(elem, 'WATERS')
+
+    mash = ET.SubElement(elem, 'MASH')
+    _sub(mash, 'NAME', 'Mash')
+    _sub(mash, 'VERSION', 1)
+    _sub(mash, 'GRAIN_TEMP', _f2c(float(full['T_grain'])))
+    steps = ET.SubElement(mash, 'MASH_STEPS')
+    T_rest = full['T_rest']
+    T_rest = list(T_rest) if isinstance(T_rest, (list, tuple)) else [T_rest]
+    T_sacc = full['T_sacc']
+    T_sacc = list(T_sacc) if isinstance(T_sacc, (list, tuple)) else [T_sacc]
+    temperatures = [('Rest', t) for t in T_rest]
+    temperatures += [('Saccharification', t) for t in T_sacc]
+    if full['mash_out']:
+        temperatures.append(('Mash out', 168))
+    for step_name, t in temperatures:
+        step = ET.SubElement(steps, 'MASH_STEP')
+        _sub(step, 'NAME', step_name)
+        _sub(step, 'VERSION', 1)
+        _sub(step, 'TYPE', 'Infusion')
+        _sub(step, 'STEP_TEMP', _f2c(float(t)))
+        _sub(step, 'STEP_TIME', 60.0 if step_name == 'Saccharification'
+             else 10.0)
+    return elem
+
+
+def write_beerxml(recipes, target):
+    """Write recipes to a BeerXML file, one at a time.
+
+    Parameters
+    ----------
+    recipes : iterable
+      `Recipe` items, or the `(ingredients, target_volume, config)`
+      tuples of `brew.batch`, which are named 'Recipe 1', 'Recipe 2',
+      etc.
+    target : string or file
+      File name or text file object.
+
+    """
+    if isinstance(target, str):
+        with open(target, 'w', encoding='utf-8') as f:
+            return write_beerxml(recipes, f)
+
+    target.write('<?xml version="1.0" encoding="UTF-8"?>\n<RECIPES>\n')
+    for i, recipe in enumerate(recipes):
+        if len(recipe) == 3:
+            recipe = Recipe(*recipe, name='Recipe {}'.format(i + 1))
+        elem = _recipe_element(*recipe)
+        target.write(ET.tostring(elem, encoding='unicode'))
+        target.write('\n')
+    target.write('</RECIPES>\n')
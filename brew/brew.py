@@ -6,10 +6,67 @@ brew --- Brew some beer.
 
 """
 
+from collections.abc import Iterable
+from functools import wraps
+from . import timing as T
+from .configuration import get_config
+from .ingredients import (Ingredients, Fermentable, Unfermentable, Hop,
+                          Culture)
+from .profiling import profiled
+from .render import show
+from .results import MashResult, BoilResult, FermentResult
+from .timeline import Timeline
+from .util import (abv, calories, carbohydrates, final_gravity,
+                   infusion_volume, sg2brix, strike_water)
+from .util.bbtn import sg2plato
+
 __all__ = [
     'Brew',
 ]
 
+# index ingredient sets at least this large with an `IngredientFrame`,
+# smaller sets are faster as objects
+frame_threshold = 500
+
+# Brew parameters and ingredient groups each stage depends on, in
+# addition to the target volume and the upstream stage results
+_volume_parameters = ('absorption', 'mlt_gap', 'boil_time', 'r_boil',
+                      'kettle_gap')
+_dependencies = {
+    'infusion': (_volume_parameters + ('r_mash', 'T_grain', 'T_water',
+                                       'T_rest', 'T_sacc', 'mash_out'),
+                 ('other',)),
+    'mash': (_volume_parameters + ('efficiency',), ('other',)),
+    'boil': (_volume_parameters + ('efficiency', 'hop_stand'),
+             ('other', 'hops')),
+    'ferment': (_volume_parameters + ('efficiency', 'T_sacc'),
+                ('other', 'cultures')),
+}
+
+
+def _indexed(method):
+    """Share ingredient indices for the duration of a method call.
+
+    The frame and ingredient states are built on first use, and nested
+    calls share them.
+
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._indexing:
+            return method(self, *args, **kwargs)
+
+        self._indexing = True
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._indexing = False
+            self._frame = None
+            self._states = {}
+
+    return wrapper
+
 
 class Brew:
     """Brew some beer.
@@ -65,15 +122,17 @@ class Brew:
 
     def __init__(self, ingredients, target_volume, parameter_sets=None,
                  **kwargs):
-        from collections import Iterable
-        from .configuration import get_config
-        from .ingredients import Ingredients
-
         assert isinstance(ingredients, Ingredients)
         assert isinstance(target_volume, (float, int))
 
         self.ingredients = ingredients
         self.target_volume = float(target_volume)
+        self._indexing = False
+        self._frame = None
+        # (ingredients, version, state of 'other' or None, timeline)
+        self._timeline = None
+        self._states = {}
+        self._cache = {}
         self.config = get_config(parameter_sets)
         self.config.update(kwargs)
 
@@ -98,6 +157,25 @@ class Brew:
     def __getitem__(self, k):
         return self.config[k]
 
+    def to_dict(self):
+        """Flat dictionary of the recipe and configuration.
+
+        The ingredients are as `Ingredients.to_dict`, plus
+        'target_volume' and 'config'.  See `from_dict`.
+
+        """
+        d = self.ingredients.to_dict()
+        d['target_volume'] = self.target_volume
+        d['config'] = {k: list(v) if isinstance(v, tuple) else v
+                       for k, v in self.config.items()}
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        """A `Brew` from a dictionary, see `to_dict`."""
+        return cls(Ingredients.from_dict(d), d['target_volume'],
+                   **d['config'])
+
     def __setitem__(self, k, v):
         assert k in self.config, '{} is not parameter ({})'.format(
             k, ', '.join(self.config.keys()))
@@ -110,6 +188,116 @@ class Brew:
             T += (170,)
         return T
 
+    @property
+    def frame(self):
+        """The ingredients as an `IngredientFrame`.
+
+        Shared during `compute_mash`, `compute_boil`, and
+        `compute_ferment`, otherwise built for each request.
+
+        """
+        # numpy is imported on first use
+        from .frame import IngredientFrame
+
+        if self._frame is not None:
+            return self._frame
+
+        frame = IngredientFrame.from_ingredients(self.ingredients)
+        if self._indexing:
+            self._frame = frame
+        return frame
+
+    @property
+    def timeline(self):
+        """The ingredients indexed by timing.
+
+        Built from the `frame` for large ingredient sets (see
+        `frame_threshold`), and kept until ingredients are added,
+        removed, replaced, or retimed.  `compute_mash`,
+        `compute_boil`, and `compute_ferment` also rebuild it after
+        other changes to the ingredients, e.g., a new grain weight;
+        otherwise, call `clear_cache` after such changes.
+
+        """
+        ingredients = self.ingredients
+        # registers the items for timing changes, see `Ingredients._own`
+        ingredients._buckets()
+        state = self._state('other') if self._indexing else None
+        if self._timeline is not None:
+            last, version, last_state, timeline = self._timeline
+            if (last is ingredients and version == ingredients._version
+                    and (state is None or state == last_state)):
+                return timeline
+
+        if len(ingredients) >= frame_threshold:
+            timeline = Timeline.from_frame(self.frame)
+        else:
+            timeline = Timeline(ingredients)
+
+        self._timeline = ingredients, ingredients._version, state, timeline
+        return timeline
+
+    def _state(self, group):
+        """Comparable state of the 'hops', 'cultures', or 'other' ingredients."""
+        if group in self._states:
+            return self._states[group]
+
+        if group == 'hops':
+            items = self.ingredients.hops
+        elif group == 'cultures':
+            items = self.ingredients.cultures
+        else:
+            items = [i for i in self.ingredients
+                     if not isinstance(i, (Hop, Culture))]
+
+        state = [(type(i), i._values()) for i in items]
+        if self._indexing:
+            self._states[group] = state
+        return state
+
+    def _lookup(self, stage, inputs=(), links={}):
+        """Look up the last result of a stage.
+
+        Parameters
+        ----------
+        stage : string
+          The stage name in `_dependencies`.
+        inputs : tuple, optional
+          Other inputs of the stage, e.g., the upstream wort.
+        links : dict, optional
+          Result fields that are passed through from upstream stages,
+          e.g., `mash` of `BoilResult`.  They are not inputs, but are
+          replaced in a reused result.
+
+        Returns
+        -------
+        key : tuple
+          The inputs of the stage, store with the new result in
+          `_cache`.
+        result : StageResult or None
+          The last result, if the inputs are unchanged.
+
+        """
+
+        parameters, groups = _dependencies[stage]
+        key = (self.target_volume, [self[k] for k in parameters],
+               [self._state(g) for g in groups], inputs)
+
+        last = self._cache.get(stage)
+        if last is None or last[0] != key:
+            return key, None
+
+        result = last[1]
+        if any([getattr(result, k) != v for k, v in links.items()]):
+            result = result.replace(**links)
+            self._cache[stage] = key, result
+        return key, result
+
+    def clear_cache(self):
+        """Forget all stage results and the timeline."""
+        self._cache.clear()
+        self._timeline = None
+
     @property
     def hop_stand(self):
         """Post-boil hop stand?
@@ -118,8 +306,9 @@ class Brew:
         `hop_stand` parameter is enabled.
 
         """
-        return self['hop_stand'] or (len(self.ingredients.hop_stand) > 0)
+        return self['hop_stand'] or bool(self.ingredients.hop_stand)
 
+    @profiled('volume')
     def volume(self, time, upto=False):
         """Volume at time in gallons.
 
@@ -132,14 +321,8 @@ class Brew:
 
         """
 
-        from . import timing as T
-
-        if upto:
-            ingredients = self.ingredients.upto(time)
-        else:
-            ingredients = self.ingredients.at(time)
-
-        volume = sum([i.volume for i in ingredients if hasattr(i, 'volume')])
+        timeline = self.timeline
+        volume = timeline.volume(time, upto=upto)
         volume += self.target_volume
 
         if (time < T.Primary()) or (upto and (time == T.Primary())):
@@ -152,7 +335,7 @@ class Brew:
             volume += self['boil_time'] / 60 * self['r_boil']
 
         if time < T.Lauter():
-            weight = sum([f.weight for f in ingredients.grains])
+            weight = timeline.grain_weight(time, upto=upto)
             volume += self['mlt_gap'] + weight * self['absorption'] / 4
 
         return volume
@@ -166,11 +349,10 @@ class Brew:
           Ingredients to consider.
 
         """
-        from . import timing as T
-
         extract = [f.extract(self['efficiency']) for f in ingredients]
         return extract
 
+    @profiled('extract')
     def extract(self, time, upto=False):
         """Extract at time.
 
@@ -181,16 +363,27 @@ class Brew:
         upto : bool, optional
           Include all additions up to `time`, but not at `time`.
 
+        Returns
+        -------
+        extract : list of float
+          Extract of each fermentable, in ingredient order.
+
         """
+        return self.timeline.extracts(time, self['efficiency'], upto=upto)
 
-        from . import timing as T
+    @profiled('extract')
+    def total_extract(self, time, upto=False):
+        """Total extract at time.
 
-        if upto:
-            ingredients = self.ingredients.fermentables.upto(time)
-        else:
-            ingredients = self.ingredients.fermentables.at(time)
+        Parameters
+        ----------
+        time : Timing
+          Include all additions up to and at `time`.
+        upto : bool, optional
+          Include all additions up to `time`, but not at `time`.
 
-        return self._extract(ingredients)
+        """
+        return self.timeline.extract(time, self['efficiency'], upto=upto)
 
     def grain_extract(self):
         """Extract from grains."""
@@ -200,6 +393,8 @@ class Brew:
         """Extract from unfermentables."""
         return self._extract(self.ingredients.unfermentables)
 
+    @profiled('infusion')
+    @_indexed
     def infusion(self):
         """Strike water and infusion volumes.
 
@@ -214,11 +409,11 @@ class Brew:
 
         """
 
-        from . import timing as T
-        from .util import strike_water, infusion_volume
+        key, result = self._lookup('infusion')
+        if result is not None:
+            return result
 
-        grain_weight = sum([f.weight for f in
-                            self.ingredients.at(T.Sparge()).grains])
+        grain_weight = self.timeline.grain_weight(T.Sparge())
         v_infusion = []
         T_infusion = []
         for i in range(len(self.T_mash)):
@@ -237,25 +432,34 @@ class Brew:
         v_sparge = self.volume(T.Sparge()) - v_mash
         assert v_sparge >= 0, 'Negative sparge volume, lower r_mash or change temperature steps.'
 
-        return tuple(T_infusion), tuple(v_infusion), v_sparge
+        result = tuple(T_infusion), tuple(v_infusion), v_sparge
+        self._cache['infusion'] = key, result
+        return result
 
-    def mash(self):
-        """Mash and lauter grains to make wort.
+    @profiled('mash')
+    @_indexed
+    def compute_mash(self):
+        """Mash and lauter grains, without any output.
 
         Returns
         -------
-        wort : Wort
-          The pre-boil wort.
+        result : MashResult
+          The mash and lauter results, including the pre-boil wort.
 
         """
 
-        from . import timing as T
-        from .table import Table
-        from .ingredients import Ingredients, Fermentable, Unfermentable
-        from . import _default_format
-
-        # all ingredients with extract, and just the mashed ones
-        ingredients = self.ingredients.filter(Fermentable, Unfermentable)
+        T_infusion, v_infusion, v_sparge = self.infusion()
+        infusion = dict(T_mash=self.T_mash, T_infusion=T_infusion,
+                        v_infusion=v_infusion, v_mash=sum(v_infusion),
+                        v_sparge=v_sparge)
+        key, result = self._lookup('mash', links=infusion)
+        if result is not None:
+            return result
+
+        # all ingredients with extract (a copy for the results), and a
+        # view of just the mashed ones
+        ingredients = Ingredients(
+            self.ingredients.filter(Fermentable, Unfermentable))
         mashed = ingredients.filter(T.Mash, T.Vorlauf, T.Sparge, T.Lauter)
 
         total_weight = sum([f.weight for f in ingredients])
@@ -268,52 +472,44 @@ class Brew:
         total_extract = sum(extract)
 
         preboil_sg = 1 + mash_extract / v_kettle / 1000
-        wort = Wort(preboil_sg, v_kettle)
 
-        T_infusion, v_infusion, v_sparge = self.infusion()
-        v_mash = sum(v_infusion)
+        result = MashResult(
+            fermentables=ingredients,
+            weight_fraction=tuple(i.weight / total_weight
+                                  for i in ingredients),
+            extract=tuple(extract),
+            extract_fraction=tuple(ex / total_extract for ex in extract),
+            grain_weight=grain_weight,
+            efficiency=self['efficiency'],
+            v_kettle=v_kettle,
+            preboil_sg=preboil_sg,
+            wort=Wort(preboil_sg, v_kettle),
+            **infusion
+        )
+        self._cache['mash'] = key, result
+        return result
 
-        # Extract table
-        tab = Table(data=([i.name for i in ingredients],
-                          [i.timing.name for i in ingredients],
-                          [i.weight for i in ingredients],
-                          [i.weight / total_weight for i in ingredients],
-                          [i.ppg for i in ingredients],
-                          extract,
-                          [ex / total_extract for ex in extract]),
-                    names=('Grain/Adjunct', 'Timing', 'Weight',
-                           'Weight Fraction', 'PPG', 'Extract',
-                           'Extract Fraction'),
-                    caption='Mash',
-                    format=_default_format)
-        tab.colformats = ('{}', '{}', '{:.3f}', '{:.1%}', '{:d}', '{:.1f}',
-                          '{:.1%}')
-        tab.footer = '''Kettle volume: {:.1f} gal
-Efficiency: {:.0%}
-Pre-boil specific gravity: {:.3f}
-'''.format(v_kettle, self['efficiency'], preboil_sg)
-
-        if _default_format == 'yaml':
-            print('    mash-and-lauter:')
-        print(tab)
-
-        # Infusion schedule table
-        tab = Table(data=(self.T_mash, T_infusion, v_infusion),
-                    names=('T mash (F)', 'T water (F)', 'Volume (gal)'),
-                    caption='Lauter and sparge',
-                    format=_default_format)
-        tab.colformats = ('{:.0f}', '{:.0f}', '{:.2f}')
-        tab.footer = '''Total mash water: {:.1f} gal ({:.1f} qt/lb)
-Sparge with {:.1f} gal of water
-Collect {:.1f} gal of wort
-'''.format(v_mash, v_mash * 4 / grain_weight, v_sparge, v_kettle)
-
-        print(tab)
-
-        return wort
+    def mash(self):
+        """Mash and lauter grains to make wort.
 
-    def boil(self, wort=None):
-        """Boil the wort.
+        Prints the extract and infusion schedule tables.  See
+        `compute_mash` for a silent version.
+
+        Returns
+        -------
+        wort : Wort
+          The pre-boil wort.
+
+        """
+
+        result = self.compute_mash()
+        show(result)
+        return result.wort
+
+    @profiled('boil')
+    @_indexed
+    def compute_boil(self, wort=None):
+        """Boil the wort, without any output.
 
         Uses gravity at start of boil.  John Palmer's How to Brew
         suggests this is OK.
@@ -321,97 +517,148 @@ Collect {:.1f} gal of wort
         Parameters
         ----------
         wort : Wort, optional
-          Boil this wort, else use `mash`.
+          Boil this wort, else use `compute_mash`.
 
         Returns
         -------
-        boiled_wort : Wort
-          Includes bittereness after all α-acid conversions, IBU.
+        result : BoilResult
+          The boil results, including the post-boil wort.  If `wort`
+          was not provided, `result.mash` holds the mash results.
 
         """
 
-        from . import timing as T
-        from .table import Table
-        from . import _default_format
-
+        mash = None
         if wort is None:
-            wort = self.mash()
+            mash = self.compute_mash()
+            wort = mash.wort
+
+        key, result = self._lookup('boil', (wort.gravity, wort.volume),
+                                   links=dict(mash=mash))
+        if result is not None:
+            return result
 
         v_preboil = wort.volume
         v_postboil = self.volume(T.Primary(), upto=True)
 
         sg_preboil = wort.gravity
 
-        ex_postboil = sum(self.extract(T.Primary(), upto=True))
+        ex_postboil = self.total_extract(T.Primary(), upto=True)
         sg_postboil = 1 + ex_postboil / v_postboil / 1000
 
-        util = []
-        bit = []
-        hops = self.ingredients.hops
-        for hop in hops:
-            r = hop.bitterness(sg_preboil, v_postboil,
-                               boil=self['boil_time'],
-                               hop_stand=self.hop_stand)
-            util.append(r[0])
-            bit.append(r[1])
-
-        # Bitterness table
-        tab = Table(
-            data=([hop.name for hop in hops],
-                  [('Whole leaf' if hop.whole else 'Pellets') for hop in hops],
-                  [hop.alpha for hop in hops],
-                  [hop.weight for hop in hops],
-                  [str(hop.timing) for hop in hops],
-                  util,
-                  bit),
-            names=('Hop', 'Type', 'Alpha', 'Weight', 'Time', 'Utilization',
-                   'Bitterness'),
-            caption='Hops',
-            format=_default_format)
-        tab.colformats = ('{}', '{}', '{:.1f}', '{:.1f}', '{}', '{:.1f}',
-                          '{:.0f}')
-        tab.footer = '''Pre-boil: {:.1f} gal at {:.3f}
-Post-boil: {:.1f} gal at {:.3f}, {:.0f} IBU
-'''.format(v_preboil, sg_preboil, v_postboil, sg_postboil, sum(bit))
-        if self.hop_stand:
-            tab.footer += '\nHop stand'
-
-        if _default_format == 'yaml':
-            print('    hopping:')
-        print(tab)
-
-        return Wort(sg_postboil, v_postboil, sum(bit))
-
-    def ferment(self, wort=None, grain_attenuation=None):
-        """Ferment wort.
+        hops = Ingredients(self.ingredients.hops)
+        hop_stand = self.hop_stand
+        if len(self.ingredients) < frame_threshold:
+            util = []
+            bit = []
+            for hop in hops:
+                r = hop.bitterness(sg_preboil, v_postboil,
+                                   boil=self['boil_time'],
+                                   hop_stand=hop_stand)
+                util.append(r[0])
+                bit.append(r[1])
+        else:
+            util, bit = self.frame.bitterness(sg_preboil, v_postboil,
+                                              boil=self['boil_time'],
+                                              hop_stand=hop_stand)
+            util = util.tolist()
+            bit = bit.tolist()
+
+        result = BoilResult(
+            hops=hops,
+            utilization=tuple(util),
+            bitterness=tuple(bit),
+            hop_stand=hop_stand,
+            v_preboil=v_preboil,
+            sg_preboil=sg_preboil,
+            v_postboil=v_postboil,
+            sg_postboil=sg_postboil,
+            ibu=sum(bit),
+            wort=Wort(sg_postboil, v_postboil, sum(bit)),
+            mash=mash
+        )
+        self._cache['boil'] = key, result
+        return result
+
+    def boil(self, wort=None):
+        """Boil the wort.
+
+        Uses gravity at start of boil.  John Palmer's How to Brew
+        suggests this is OK.
+
+        Prints the hop schedule table.  See `compute_boil` for a
+        silent version.
 
         Parameters
         ----------
         wort : Wort, optional
-          Ferment this wort, else use `boil`.
+          Boil this wort, else use `mash`.
+
+        Returns
+        -------
+        boiled_wort : Wort
+          Includes bittereness after all α-acid conversions, IBU.
+
+        """
+
+        result = self.compute_boil(wort)
+        show(result)
+        return result.wort
+
+    @profiled('ferment')
+    @_indexed
+    def compute_ferment(self, wort=None, grain_attenuation=None, cache=None):
+        """Ferment wort, without any output.
+
+        Parameters
+        ----------
+        wort : Wort, optional
+          Ferment this wort, else use `compute_boil`.
         grain_attenuation : float, optional
           Force fermentation to match this apparent attenuation for grains.
+        cache : ResultCache, optional
+          Reuse the result of an identical recipe and configuration
+          from this cache, or store the new result in it.  See
+          `brew.cache`.
 
         Returns
         -------
-        beer : Beer
-          Beer.
+        result : FermentResult
+          The fermentation results, including the beer.  If `wort`
+          was not provided, `result.boil` holds the boil results.
 
         """
 
-        from collections import Iterable
-        from . import timing as T
-        from .util import final_gravity
+        if cache is None:
+            return self._compute_ferment(wort, grain_attenuation)
+
+        key = cache.key(self, wort, grain_attenuation)
+        result = cache.get(key, self.ingredients)
+        if result is None:
+            result = self._compute_ferment(wort, grain_attenuation)
+            cache.put(key, result, self.ingredients)
+        return result
+
+    def _compute_ferment(self, wort, grain_attenuation):
+        """`compute_ferment` without a result cache."""
 
+        boil = None
         if wort is None:
-            wort = self.boil()
+            boil = self.compute_boil()
+            wort = boil.wort
+
+        key, result = self._lookup(
+            'ferment', (grain_attenuation, wort.gravity, wort.volume,
+                        wort.bitterness),
+            links=dict(boil=boil))
+        if result is not None:
+            return result
 
         v_primary = wort.volume - self['kettle_gap']
         v_final = self.volume(T.Final())
         bit = wort.bitterness * v_primary / v_final
 
-        ex_preferm = sum(self.extract(T.Primary(), upto=True))
-        ex_final = sum(self.extract(T.Final()))
+        ex_preferm = self.total_extract(T.Primary(), upto=True)
+        ex_final = self.total_extract(T.Final())
         ex_ferm = ex_final - ex_preferm
         ex_wort = v_primary * (wort.gravity - 1) * 1000
         ex = ex_wort + ex_ferm
@@ -438,17 +685,43 @@ Post-boil: {:.1f} gal at {:.3f}, {:.0f} IBU
         i = a.index(max(a))
         beer = beer[i]
 
-        print('''Starting gravity: {sg:.3f}
-Final gravity: {fg:.3f}
-Bitterness: {bit:.0f} IBU
-Apparent attenutation: {aa:.0f}%
-ABV: {abv:.1f}%
-Calories: {cals:.0f}
-Carbohydrates: {carbs:.1f} g
-'''.format(sg=beer.sg, fg=beer.fg, bit=bit, aa=beer.app_attenuation,
-           abv=beer.abv, cals=beer.calories, carbs=beer.carbohydrates))
+        result = FermentResult(
+            v_primary=v_primary,
+            v_final=v_final,
+            bitterness=bit,
+            attenuation=beer.app_attenuation,
+            beer=beer,
+            boil=boil
+        )
+        self._cache['ferment'] = key, result
+        return result
+
+    def ferment(self, wort=None, grain_attenuation=None, cache=None):
+        """Ferment wort.
+
+        Prints a summary of the beer, preceded by the mash and boil
+        tables when `wort` is not provided.  See `compute_ferment` for
+        a silent version.
+
+        Parameters
+        ----------
+        wort : Wort, optional
+          Ferment this wort, else use `boil`.
+        grain_attenuation : float, optional
+          Force fermentation to match this apparent attenuation for grains.
+        cache : ResultCache, optional
+          See `compute_ferment`.
 
-        return beer
+        Returns
+        -------
+        beer : Beer
+          Beer.
+
+        """
+
+        result = self.compute_ferment(wort, grain_attenuation, cache)
+        show(result)
+        return result.beer
 
 
 class Wort:
@@ -470,14 +743,20 @@ class Wort:
         self.volume = volume
         self.bitterness = bitterness
 
+    def to_dict(self):
+        return {'gravity': self.gravity, 'volume': self.volume,
+                'bitterness': self.bitterness}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d['gravity'], d['volume'], d.get('bitterness'))
+
     @property
     def brix(self):
-        from .util import sg2brix
         return sg2brix(self.gravity)
 
     @property
     def plato(self):
-        from .util import sg2plato
         return sg2plato(self.gravity)
 
 
@@ -504,9 +783,15 @@ class Beer:
         self.fg = fg
         self.bitterness = int(bitterness)
 
+    def to_dict(self):
+        return {'sg': self.sg, 'fg': self.fg, 'bitterness': self.bitterness}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(float(d['sg']), float(d['fg']), d['bitterness'])
+
     @property
     def abv(self):
-        from .util import abv
         return abv(self.sg, self.fg)
 
     @property
@@ -515,10 +800,8 @@ class Beer:
 
     @property
     def calories(self):
-        from .util import calories
         return calories(self.sg, self.fg)
 
     @property
     def carbohydrates(self):
-        from .util import carbohydrates
         return carbohydrates(self.sg, self.fg)
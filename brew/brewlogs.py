@@ -0,0 +1,195 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+brewlogs --- Brew directories of brewlogs in parallel.
+======================================================
+
+Each brewlog file is parsed and its batches brewed in a process pool,
+after a change to the configuration, for example::
+
+    >>> for log in load_directory('logs', cache='logs.json'):
+    ...     if log.error is not None:
+    ...         print(log.path, log.error)
+
+Batches are brewed with `brew.yaml.batch_recipe`, and summarized as
+by `brew.batch.evaluate`.  With a cache, files are skipped when their
+content and the configuration are the same as in the last run.
+
+"""
+
+import glob
+import hashlib
+import json
+import os
+from collections import namedtuple
+from multiprocessing import Pool
+import numpy as np
+from .batch import _evaluate, summary_dtype
+from .configuration import load_config, set_config
+from .yaml import batch_recipe, iter_brewlog
+
+__all__ = [
+    'LogResult',
+    'imap_brewlogs',
+    'load_directory',
+]
+
+CACHE_VERSION = 1
+
+LogResult = namedtuple('LogResult', ['path', 'summary', 'error', 'cached'])
+LogResult.__doc__ = """Results for one brewlog file.
+
+Parameters
+----------
+path : string
+  The file.
+summary : ndarray or None
+  One row per batch, with `summary_dtype`, NaN for batches without a
+  target volume.  `None` on error.
+error : string or None
+  The error that stopped reading or brewing the file.
+cached : bool
+  The summary is from the cache.
+
+"""
+
+
+def _brew_log(content):
+    """Brew all batches of a brewlog, from a worker."""
+    try:
+        rows = []
+        for batch in iter_brewlog(content):
+            recipe = batch_recipe(batch)
+            if recipe is None:
+                rows.append((np.nan,) * len(summary_dtype))
+            else:
+                rows.append(_evaluate((batch.ingredients,) + recipe))
+        return rows, None
+    except Exception as e:
+        return None, '{}: {}'.format(type(e).__name__, e)
+
+
+def _summary(rows):
+    return np.array([tuple(row) for row in rows], summary_dtype)
+
+
+def _read_cache(path):
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if cache.get('version') != CACHE_VERSION:
+        return {}
+    return cache['files']
+
+
+def _write_cache(path, files):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'version': CACHE_VERSION, 'files': files}, f)
+    os.replace(tmp, path)
+
+
+def imap_brewlogs(paths, cache=None, workers=None, chunksize=1):
+    """Brew brewlog files, yielding results in file order.
+
+    Parameters
+    ----------
+    paths : iterable of strings
+      The brewlog files.
+    cache : string, optional
+      JSON file of the results of the last run, rewritten when the
+      iteration ends.  Files with the same content and configuration
+      are not brewed again.
+    workers : int, optional
+      Number of worker processes, default is the number of CPUs.  Use
+      1 to brew in this process.
+    chunksize : int, optional
+      Number of files sent to a worker at a time.
+
+    Yields
+    ------
+    log : LogResult
+
+    """
+    config = load_config()
+    h = hashlib.sha1(json.dumps(config, sort_keys=True).encode())
+    files = {} if cache is None else _read_cache(cache)
+
+    # read and hash here, so that workers need not read the files;
+    # logs are (path, digest, content, error), or (path, None, cached
+    # rows, None)
+    logs = []
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except OSError as e:
+            logs.append((path, None, None, '{}: {}'.format(
+                type(e).__name__, e)))
+            continue
+
+        digest = h.copy()
+        digest.update(content)
+        digest = digest.hexdigest()
+        key = os.path.abspath(path)
+        hit = files.get(key)
+        if hit is not None and hit['digest'] == digest:
+            logs.append((path, None, hit['summary'], None))
+        else:
+            logs.append((path, digest, content, None))
+
+    todo = [data for path, digest, data, error in logs
+            if digest is not None]
+
+    def brew(results):
+        for path, digest, data, error in logs:
+            if error is not None:
+                yield LogResult(path, None, error, False)
+            elif digest is None:
+                yield LogResult(path, _summary(data), None, True)
+            else:
+                rows, error = next(results)
+                if error is None:
+                    files[os.path.abspath(path)] = {'digest': digest,
+                                                    'summary': rows}
+                else:
+                    files.pop(os.path.abspath(path), None)
+                yield LogResult(path, None if rows is None
+                                else _summary(rows), error, False)
+
+    try:
+        if workers == 1 or len(todo) == 0:
+            yield from brew(map(_brew_log, todo))
+        else:
+            # read the configuration once, workers keep it in memory
+            with Pool(workers, initializer=set_config,
+                      initargs=(config,)) as pool:
+                yield from brew(pool.imap(_brew_log, todo,
+                                          chunksize=chunksize))
+    finally:
+        if cache is not None:
+            _write_cache(cache, files)
+
+
+def load_directory(directory, pattern='*.yaml', cache=None, workers=None):
+    """Brew all brewlogs in a directory.
+
+    Parameters
+    ----------
+    directory : string
+      The directory.
+    pattern : string, optional
+      Brewlog file names, a glob pattern.
+    cache, workers
+      See `imap_brewlogs`.
+
+    Returns
+    -------
+    logs : list of LogResult
+      Sorted by file name.
+
+    """
+    paths = sorted(glob.glob(os.path.join(directory, pattern)))
+    return list(imap_brewlogs(paths, cache=cache, workers=workers))
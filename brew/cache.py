@@ -0,0 +1,273 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+cache --- Fermentation results in a SQLite database.
+====================================================
+
+A `ResultCache` stores `FermentResult`s, with their worts, beer, and
+infusion schedule, keyed by a hash of the recipe and configuration
+(`recipe_key`), and shared by all processes that open the same file::
+
+    >>> cache = ResultCache('results.sqlite')
+    >>> beer = Brew(ingredients, 5.5).ferment(cache=cache)
+
+or with `brew.batch.evaluate(recipes, cache=cache)`.  The least
+recently used results are removed when the results exceed `max_size`
+bytes.
+
+"""
+
+import hashlib
+import json
+import sqlite3
+from threading import Lock
+from .ingredients import Ingredients
+from .results import FermentResult
+
+__all__ = [
+    'recipe_key',
+    'ResultCache',
+]
+
+# change to invalidate all cached results, e.g., when the calculations
+# change
+KEY_VERSION = 1
+
+_schema = """
+CREATE TABLE IF NOT EXISTS result (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL,
+  size INTEGER NOT NULL,
+  used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS result_used ON result (used);
+CREATE TABLE IF NOT EXISTS total (
+  id INTEGER PRIMARY KEY CHECK (id = 0),
+  size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO total VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS result_insert AFTER INSERT ON result
+BEGIN
+  UPDATE total SET size = size + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS result_delete AFTER DELETE ON result
+BEGIN
+  UPDATE total SET size = size - OLD.size;
+END;
+"""
+
+# `FermentResult` fields that are selections of the recipe's
+# ingredients, stored as positions in the recipe
+_selections = (('boil', 'hops'), ('boil', 'mash', 'fermentables'))
+
+# least recently used results have the smallest `used`
+_next_use = 'SELECT COALESCE(MAX(used), 0) + 1 FROM result'
+
+# open file caches of this process, see `ResultCache.__reduce__`
+_caches = {}
+
+
+def _open(path, max_size):
+    cache = _caches.get(path)
+    if cache is None:
+        cache = ResultCache(path, max_size)
+    cache.max_size = max_size
+    return cache
+
+
+def recipe_key(brew, wort=None, grain_attenuation=None):
+    """Hash of the inputs of `Brew.compute_ferment`.
+
+    The ingredients (`Ingredient.to_dict` values, without
+    descriptions), the target volume, the full `Brew.config`, and the
+    arguments.
+
+    Returns
+    -------
+    key : string
+      SHA-256, hexadecimal.
+
+    """
+    ingredients = []
+    for item in brew.ingredients:
+        d = item.to_dict()
+        d.pop('desc', None)
+        ingredients.append(list(d.values()))
+
+    state = [KEY_VERSION, ingredients, brew.target_volume,
+             sorted(brew.config.items()),
+             None if wort is None else wort.to_dict(), grain_attenuation]
+    s = json.dumps(state, separators=(',', ':'))
+    return hashlib.sha256(s.encode()).hexdigest()
+
+
+class ResultCache:
+    """Fermentation results in a SQLite database.
+
+    Parameters
+    ----------
+    path : string, optional
+      Database file, created as needed.  The default is an in-memory
+      database, which cannot be shared with worker processes.
+    max_size : int, optional
+      Remove the least recently used results when the stored results
+      exceed this many bytes.  `None` for no limit.
+
+    """
+
+    def __init__(self, path=None, max_size=64 << 20):
+        self.path = path
+        self.max_size = max_size
+        self._lock = Lock()
+        self._db = sqlite3.connect(':memory:' if path is None else path,
+                                   timeout=30, check_same_thread=False)
+        if path is not None:
+            self._db.execute('PRAGMA journal_mode=WAL')
+        with self._db:
+            self._db.executescript(_schema)
+        if path is not None:
+            _caches.setdefault(path, self)
+
+    def __reduce__(self):
+        if self.path is None:
+            raise TypeError('an in-memory ResultCache cannot be shared')
+        return _open, (self.path, self.max_size)
+
+    def close(self):
+        """Close the database."""
+        self._db.close()
+        if _caches.get(self.path) is self:
+            del _caches[self.path]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                'SELECT COUNT(*) FROM result').fetchone()[0]
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._db.execute('SELECT 1 FROM result WHERE key = ?',
+                                    (key,)).fetchone() is not None
+
+    def __repr__(self):
+        return '<ResultCache: {} results, {} bytes>'.format(
+            len(self), self.size)
+
+    @property
+    def size(self):
+        """Size of the stored results, bytes."""
+        with self._lock:
+            return self._db.execute(
+                'SELECT size FROM total').fetchone()[0]
+
+    # for `Brew.compute_ferment`, which does not import this module
+    key = staticmethod(recipe_key)
+
+    def get(self, key, ingredients=None):
+        """A result, or `None` if it is not in the cache.
+
+        Parameters
+        ----------
+        key : string
+          From `recipe_key`.
+        ingredients : Ingredients, optional
+          The recipe's ingredients, required if they were given to
+          `put`.
+
+        """
+        with self._lock, self._db:
+            row = self._db.execute('SELECT value FROM result WHERE key = ?',
+                                   (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute('UPDATE result SET used = ({}) WHERE key = ?'
+                             .format(_next_use), (key,))
+
+        value = json.loads(row[0])
+        result = FermentResult.from_dict(value['result'])
+        for path, positions in zip(_selections, value['selections']):
+            if positions is None:
+                continue
+            if ingredients is None:
+                raise ValueError('the ingredients of this result are '
+                                 'required')
+            parent = result
+            for k in path[:-1]:
+                parent = getattr(parent, k)
+            setattr(parent, path[-1],
+                    Ingredients([ingredients[i] for i in positions]))
+        return result
+
+    def put(self, key, result, ingredients=None):
+        """Store a result, then remove old results as needed.
+
+        Parameters
+        ----------
+        key : string
+          From `recipe_key`.
+        result : FermentResult
+          The result.
+        ingredients : Ingredients, optional
+          The recipe's ingredients.  Hops and fermentables of the
+          result are stored as their positions in `ingredients`, which
+          is faster, but `get` then requires the ingredients.
+
+        """
+        d = result.to_dict()
+        selections = []
+        position = ({} if ingredients is None
+                    else {id(item): i for i, item in enumerate(ingredients)})
+        for path in _selections:
+            parent, stage = d, result
+            for k in path[:-1]:
+                if stage is None:
+                    break
+                parent, stage = parent[k], getattr(stage, k)
+            selection = None if stage is None else getattr(stage, path[-1])
+            positions = (None if selection is None else
+                         [position.get(id(item)) for item in selection])
+            if positions is None or None in positions:
+                selections.append(None)
+            else:
+                parent[path[-1]] = None
+                selections.append(positions)
+
+        value = json.dumps({'result': d, 'selections': selections},
+                           separators=(',', ':'))
+        size = len(value)
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM result WHERE key = ?', (key,))
+            self._db.execute(
+                'INSERT INTO result (key, value, size, used)'
+                ' VALUES (?, ?, ?, ({}))'.format(_next_use),
+                (key, value, size))
+            if self.max_size is not None:
+                self._evict(self.max_size)
+
+    def _evict(self, max_size):
+        """Remove least recently used results, the caller holds the lock."""
+        total = self._db.execute('SELECT size FROM total').fetchone()[0]
+        excess = total - max_size
+        if excess <= 0:
+            return
+
+        keys = []
+        cursor = self._db.execute('SELECT key, size FROM result ORDER BY used')
+        for key, size in cursor:
+            keys.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        cursor.close()
+        self._db.executemany('DELETE FROM result WHERE key = ?', keys)
+
+    def clear(self):
+        """Remove all results."""
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM result')
@@ -0,0 +1,398 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+catalog --- Ingredient specifications in a SQLite database.
+===========================================================
+
+A `Catalog` holds specifications of grains, sugars, cultures, and hops
+(`Spec` rows), and makes ingredients from them::
+
+    >>> from brew.catalog import Catalog
+    >>> catalog = Catalog()
+    >>> catalog.ingredient('Maris Otter', 10)
+    <Grain: Maris Otter (38 PPG), 10.00 lbs at Mash>
+
+The database is seeded from the `PPG` and `CultureBank` enumerations.
+Names, types, and PPG, attenuation, and alpha acid ranges are indexed.
+Each thread reads through its own connection, taken from a pool.
+
+"""
+
+import os
+import sqlite3
+from collections import namedtuple
+from contextlib import contextmanager
+from difflib import get_close_matches
+from itertools import count
+from queue import Empty, SimpleQueue
+from threading import Lock
+from urllib.request import pathname2url
+from . import ingredients as I
+
+__all__ = [
+    'Spec',
+    'Catalog',
+]
+
+Spec = namedtuple('Spec', ['type', 'name', 'ppg', 'attenuation_min',
+                           'attenuation_max', 'alpha', 'beta', 'desc'])
+Spec.__new__.__defaults__ = (None,) * 6
+Spec.__doc__ = """Ingredient specification.
+
+Parameters
+----------
+type : string
+  Ingredient class name: 'Grain', 'Sugar', 'Fermentable',
+  'Unfermentable', 'Culture', or 'Hop'.
+name : string
+  Ingredient name.
+ppg : int, optional
+  Gravity points per pound per gallon, for fermentables.
+attenuation_min, attenuation_max : float, optional
+  Apparent attenuation range, percent, for cultures.
+alpha, beta : float, optional
+  Acid percentages, for hops.
+desc : string, optional
+  Long-form description.
+
+"""
+
+TYPES = {
+    'Grain': I.Grain,
+    'Sugar': I.Sugar,
+    'Fermentable': I.Fermentable,
+    'Unfermentable': I.Unfermentable,
+    'Culture': I.Culture,
+    'Hop': I.Hop,
+}
+
+# PPG items that are not grains
+_ppg_types = dict.fromkeys([
+    'DriedMaltExtract', 'AgaveSyrup', 'BelgianCandiSugar',
+    'BelgianCandiSyrup', 'CaneSugar', 'TableSugar', 'TurbinadoSugar',
+    'LightBrownSugar', 'DarkBrownSugar', 'CornSugarDextrose', 'Honey',
+    'MapleSap', 'MapleSyrup', 'Molasses', 'Rapadura', 'RiceExtract',
+    'WhiteSorghumSyrup'], 'Sugar')
+_ppg_types['Lactose'] = 'Unfermentable'
+_ppg_types['PumpkinPuree'] = 'Fermentable'
+
+_schema = """
+CREATE TABLE IF NOT EXISTS spec (
+  type TEXT NOT NULL,
+  name TEXT NOT NULL COLLATE NOCASE,
+  ppg REAL,
+  attenuation_min REAL,
+  attenuation_max REAL,
+  alpha REAL,
+  beta REAL,
+  desc TEXT,
+  UNIQUE (type, name)
+);
+CREATE INDEX IF NOT EXISTS spec_name ON spec (name);
+CREATE INDEX IF NOT EXISTS spec_ppg ON spec (type, ppg);
+CREATE INDEX IF NOT EXISTS spec_attenuation
+  ON spec (type, attenuation_min, attenuation_max);
+CREATE INDEX IF NOT EXISTS spec_alpha ON spec (type, alpha);
+"""
+
+_columns = ', '.join(Spec._fields)
+
+# names of in-memory databases, which are shared between connections
+_memory = count()
+
+
+def seed_specs():
+    """Specifications from the `PPG` and `CultureBank` enumerations."""
+    for ppg in I.PPG:
+        name, points = ppg.value
+        yield Spec(_ppg_types.get(ppg.name, 'Grain'), name, ppg=points)
+
+    for culture in I.CultureBank:
+        name, amin, amax = culture.value[:3]
+        yield Spec('Culture', name, attenuation_min=amin,
+                   attenuation_max=amax)
+
+
+def _escape(s):
+    """Escape LIKE wildcards."""
+    return s.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+class Catalog:
+    """Ingredient specifications in a SQLite database.
+
+    Parameters
+    ----------
+    path : string, optional
+      Database file, created as needed.  The default is an in-memory
+      database.
+    seed : bool, optional
+      Import the `PPG` and `CultureBank` enumerations into an empty
+      database.
+
+    """
+
+    def __init__(self, path=None, seed=True):
+        if path is None:
+            self._uri = 'file:brew-catalog-{}?mode=memory&cache=shared'.format(
+                next(_memory))
+        else:
+            self._uri = 'file:' + pathname2url(os.path.abspath(path))
+
+        # one writer, and a pool of read-only connections
+        self._lock = Lock()
+        self._pool = SimpleQueue()
+        # `_lower_names` results, and the number of inserts
+        self._names = {}
+        self._version = 0
+        self._db = self._connect()
+        if path is not None:
+            self._db.execute('PRAGMA journal_mode=WAL')
+        with self._db:
+            self._db.executescript(_schema)
+
+        if seed and len(self) == 0:
+            self.insert(seed_specs())
+
+    def _connect(self, readonly=False):
+        db = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        if readonly:
+            db.execute('PRAGMA query_only = ON')
+        return db
+
+    @contextmanager
+    def _reader(self):
+        """A read-only connection from the pool."""
+        try:
+            db = self._pool.get_nowait()
+        except Empty:
+            db = self._connect(readonly=True)
+
+        try:
+            yield db
+        finally:
+            self._pool.put(db)
+
+    def _query(self, where='', args=(), order='name', limit=None):
+        sql = 'SELECT {} FROM spec'.format(_columns)
+        if where:
+            sql += ' WHERE ' + where
+        sql += ' ORDER BY ' + order
+        if limit is not None:
+            sql += ' LIMIT {:d}'.format(limit)
+
+        with self._reader() as db:
+            return [Spec._make(row) for row in db.execute(sql, args)]
+
+    def close(self):
+        """Close all database connections."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except Empty:
+                break
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        with self._reader() as db:
+            return db.execute('SELECT COUNT(*) FROM spec').fetchone()[0]
+
+    def __repr__(self):
+        return '<Catalog: {} specs>'.format(len(self))
+
+    def insert(self, specs):
+        """Add or replace specifications, in one transaction.
+
+        Parameters
+        ----------
+        specs : iterable of Spec or tuple
+          The specifications, tuples are in `Spec` field order.
+
+        """
+        if isinstance(specs, Spec):
+            raise TypeError('specs must be an iterable of Spec')
+
+        rows = (spec if isinstance(spec, Spec) else Spec(*spec)
+                for spec in specs)
+        sql = 'INSERT OR REPLACE INTO spec ({}) VALUES ({})'.format(
+            _columns, ', '.join('?' * len(Spec._fields)))
+        with self._lock, self._db:
+            self._db.executemany(sql, rows)
+            self._names = {}
+            self._version += 1
+
+    def get(self, name, type=None):
+        """Specification by name, case insensitive.
+
+        Parameters
+        ----------
+        name : string
+          The name.
+        type : string, optional
+          Ingredient type, see `Spec`.
+
+        Raises
+        ------
+        KeyError
+          When there is no such specification.
+
+        """
+        where, args = 'name = ?', [name]
+        if type is not None:
+            where += ' AND type = ?'
+            args.append(type)
+
+        specs = self._query(where, args, order='type', limit=1)
+        if len(specs) == 0:
+            raise KeyError(name)
+        return specs[0]
+
+    def find(self, prefix=None, type=None, ppg=None, attenuation=None,
+             alpha=None, limit=None):
+        """Search specifications.
+
+        Parameters
+        ----------
+        prefix : string, optional
+          Names that start with this string, case insensitive.
+        type : string or tuple of strings, optional
+          Ingredient types, see `Spec`.
+        ppg, attenuation, alpha : tuple, optional
+          `(min, max)` ranges, inclusive.  `None` for an open end.
+          Attenuation ranges must overlap the culture's range.
+        limit : int, optional
+          Return at most this many specifications.
+
+        Returns
+        -------
+        specs : list of Spec
+          Sorted by name.
+
+        """
+        where = []
+        args = []
+        if prefix is not None:
+            where.append("name LIKE ? ESCAPE '\\'")
+            args.append(_escape(prefix) + '%')
+
+        if type is not None:
+            types = (type,) if isinstance(type, str) else tuple(type)
+            where.append('type IN ({})'.format(', '.join('?' * len(types))))
+            args.extend(types)
+
+        ranges = (('ppg', 'ppg', ppg),
+                  ('attenuation_max', 'attenuation_min', attenuation),
+                  ('alpha', 'alpha', alpha))
+        for lower, upper, r in ranges:
+            if r is None:
+                continue
+            if r[0] is not None:
+                where.append('{} >= ?'.format(lower))
+                args.append(r[0])
+            if r[1] is not None:
+                where.append('{} <= ?'.format(upper))
+                args.append(r[1])
+
+        return self._query(' AND '.join(where), args, limit=limit)
+
+    def _lower_names(self, type):
+        """Lower case name to name, cached until the next insert."""
+        # inserts commit before they release the lock
+        with self._lock:
+            names = self._names.get(type)
+            version = self._version
+        if names is not None:
+            return names
+
+        sql = 'SELECT DISTINCT name FROM spec'
+        args = ()
+        if type is not None:
+            sql += ' WHERE type = ?'
+            args = (type,)
+        sql += ' ORDER BY name'
+        with self._reader() as db:
+            names = {row[0].lower(): row[0]
+                     for row in db.execute(sql, args)}
+
+        # not if an insert happened meanwhile
+        with self._lock:
+            if self._version == version:
+                self._names[type] = names
+        return names
+
+    def names(self, type=None):
+        """All names, optionally of one type."""
+        return list(self._lower_names(type).values())
+
+    def fuzzy(self, name, type=None, n=5, cutoff=0.6):
+        """Specifications with names similar to `name`.
+
+        Parameters
+        ----------
+        name : string
+          The name to match, case insensitive.
+        type : string, optional
+          Ingredient type, see `Spec`.
+        n : int, optional
+          Maximum number of matches.
+        cutoff : float, optional
+          Minimum similarity, 0 to 1, see `difflib.get_close_matches`.
+
+        Returns
+        -------
+        specs : list of Spec
+          Best match first.
+
+        """
+        names = self._lower_names(type)
+        matches = get_close_matches(name.lower(), names, n=n, cutoff=cutoff)
+        specs = []
+        for k in matches:
+            specs.append(self.get(names[k], type=type))
+        return specs
+
+    def ingredient(self, spec, amount, timing=None, type=None, **kwargs):
+        """Make an ingredient from a specification.
+
+        Parameters
+        ----------
+        spec : Spec or string
+          The specification, or its name.
+        amount : float or string
+          Weight (lbs for fermentables, oz for hops), or the quantity
+          of a culture.
+        timing : Timing, optional
+          Timing of the addition, otherwise the ingredient's default.
+        type : string, optional
+          Ingredient type, when `spec` is a name.
+        **kwargs
+          Passed on to the ingredient.
+
+        Returns
+        -------
+        ingredient : Grain, Sugar, Fermentable, Unfermentable, Culture,
+          or Hop
+
+        """
+        if isinstance(spec, str):
+            spec = self.get(spec, type=type)
+
+        cls = TYPES[spec.type]
+        if timing is not None:
+            kwargs['timing'] = timing
+        kwargs.setdefault('desc', spec.desc)
+
+        if cls is I.Culture:
+            culture = (spec.name, spec.attenuation_min, spec.attenuation_max)
+            return cls(culture, str(amount), **kwargs)
+        elif cls is I.Hop:
+            kwargs.setdefault('beta', spec.beta)
+            return cls(spec.name, spec.alpha, amount, **kwargs)
+        else:
+            return cls(int(spec.ppg), amount, name=spec.name, **kwargs)
@@ -6,9 +6,11 @@ configuration --- Brew calculator parameters.
 
 """
 
+import json
 import os
 from collections import OrderedDict
-import json
+from collections.abc import Iterable
+from .profiling import profiled
 
 config_file = os.sep.join([os.path.expanduser('~'), '.config',
                            'brew', 'config.json'])
@@ -31,54 +33,136 @@ config_default = OrderedDict(
     )
 )
 
-def get_config(parameter_sets=None):
-    """Read parameters from the configuration file.
+# parsed configuration files: path -> ((mtime, size), config, merged)
+_cache = {}
+
+# in-memory configuration, replaces the file when set
+_config = None
+
+
+def set_config(config):
+    """Use an in-memory configuration instead of the file.
+
+    Useful for worker processes, which then never touch the disk.
 
     Parameters
     ----------
-    parameter_sets : string or list of strings, optional
-      Load these parameter sets, in order.
+    config : dict or None
+      The configuration, in the same format as the file, i.e., with a
+      'default' section and optional parameter sets.  Set to `None`
+      to read the file again.
+
+    """
+    global _config
+
+    assert isinstance(config, (dict, type(None)))
+    if config is not None and 'default' not in config:
+        raise ValueError("configuration must have a 'default' section")
+
+    _config = config
+
+
+def clear_cache():
+    """Forget all parsed configuration files."""
+    _cache.clear()
+
+
+def load_config():
+    """The full configuration.
+
+    Returns the in-memory configuration, if set with `set_config`.
+    Otherwise the configuration file is read, or created with the
+    defaults when it does not exist.  The parsed file is cached, and
+    read again only when its modification time or size changes.
 
     Returns
     -------
     config : dict
+      All sections of the configuration.  Do not modify.
 
     """
 
-    from collections import Iterable
-    
-    global config_file, config_default
+    if _config is not None:
+        return _config
 
-    assert isinstance(parameter_sets, (Iterable, type(None)))
-    if isinstance(parameter_sets, str):
-        parameter_sets = [parameter_sets]
+    return _load_file()[0]
+
+
+def _load_file():
+    """Parsed configuration file and its merged parameter sets."""
 
-    config = OrderedDict()
-    if not os.path.exists(config_file):
-        directory = os.path.dirname(config_file)
-        if not os.path.exists(directory):
-            directories = directory.split(os.path.sep)
-            for i in range(len(directories)):
-                d = os.path.sep.join(directories[:(i+1)])
-                if d == '':
-                    continue
-
-                try:
-                    os.mkdir(d)
-                except FileExistsError:
-                    pass
-            
+    global config_file, config_default
+
+    try:
+        stat = os.stat(config_file)
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(config_file), exist_ok=True)
+        config = OrderedDict()
         config['default'] = config_default
         with open(config_file, 'w') as outf:
             json.dump(config, outf, indent=2)
-    else:
+        stat = os.stat(config_file)
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(config_file)
+    if cached is None or cached[0] != key:
         with open(config_file, 'r') as inf:
             config = json.load(inf)
+        cached = (key, config, {})
+        _cache[config_file] = cached
 
-    c = {}
-    c.update(config['default'])
-    if parameter_sets is not None:
+    return cached[1:]
+
+
+@profiled('config')
+def get_config(parameter_sets=None, config=None):
+    """Read parameters from the configuration file.
+
+    Parameters
+    ----------
+    parameter_sets : string or list of strings, optional
+      Load these parameter sets, in order.
+    config : dict, optional
+      Use this configuration, in the same format as the file, rather
+      than the one from `load_config`.
+
+    Returns
+    -------
+    config : dict
+      A new dictionary, safe to modify.
+
+    """
+
+    assert isinstance(parameter_sets, (Iterable, type(None)))
+    if isinstance(parameter_sets, str):
+        parameter_sets = [parameter_sets]
+    parameter_sets = () if parameter_sets is None else tuple(parameter_sets)
+
+    merged = None
+    if config is None and _config is None:
+        config, merged = _load_file()
+    elif config is None:
+        config = _config
+
+    c = None if merged is None else merged.get(parameter_sets)
+    if c is None:
+        c = {}
+        c.update(config['default'])
         for s in parameter_sets:
             c.update(config[s])
 
-    return c
+        if merged is not None:
+            merged[parameter_sets] = c
+
+    # copy lists, e.g., T_rest, so the cache cannot be altered
+    return {k: (list(v) if isinstance(v, list) else v) for k, v in c.items()}
+
+
+def _tuples(config):
+    """A loaded configuration with lists as tuples, as in `Brew.config`.
+
+    Recipes loaded from any format then have equal configurations.
+
+    """
+    return {k: tuple(v) if isinstance(v, list) else v
+            for k, v in config.items()}
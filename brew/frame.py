@@ -0,0 +1,256 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+frame --- Columnar ingredient sets.
+===================================
+
+"""
+
+import numpy as np
+from . import timing as T
+from . import ingredients as I
+from .util import ibu, utilization
+
+__all__ = [
+    'IngredientFrame',
+]
+
+# type codes, the index in this tuple
+TYPES = (I.Ingredient, I.Culture, I.Fermentable, I.Unfermentable, I.Hop,
+         I.Spice, I.Grain, I.Sugar, I.Wort, I.Fruit, I.Other, I.Priming,
+         I.WaterTreatment, I.Water)
+
+# timing steps, 0 is for no timing (`None`)
+TIMINGS = {cls.step: cls for cls in (
+    T.Mash, T.Vorlauf, T.Sparge, T.Lauter, T.FirstWort, T.Boil, T.HopStand,
+    T.Primary, T.Secondary, T.Packaging, T.Final, T.Unspecified)}
+TIMED = (T.FirstWort, T.Boil, T.HopStand, T.Secondary)
+
+_columns = (
+    ('code', 'i1'),
+    ('step', 'i1'),
+    ('time', 'f8'),
+    ('weight', 'f8'),
+    ('ppg', 'f8'),
+    ('alpha', 'f8'),
+    ('beta', 'f8'),
+    ('whole', '?'),
+    ('volume', 'f8'),
+    ('sg', 'f8'),
+    ('density', 'f8'),
+    ('attenuation_min', 'f8'),
+    ('attenuation_max', 'f8'),
+    ('name', 'O'),
+    ('desc', 'O'),
+    ('quantity', 'O'),
+    ('culture', 'O'),
+)
+
+
+def _row(i, nan=float('nan'), codes={t: c for c, t in enumerate(TYPES)}):
+    """Column values for one ingredient, in the order of `_columns`."""
+    timing = i.timing
+    if timing is None:
+        step, time = 0, nan
+    else:
+        step = timing.step
+        time = timing.time if isinstance(timing, TIMED) else nan
+
+    weight = ppg = alpha = beta = sg = density = nan
+    attenuation = (nan, nan)
+    whole = False
+    culture = None
+    if isinstance(i, (I.Fermentable, I.Unfermentable)):
+        weight, ppg = i.weight, i.ppg
+        sg = getattr(i, 'sg', nan)
+        density = getattr(i, 'density', nan)
+    elif isinstance(i, I.Hop):
+        weight, alpha, whole = i.weight, i.alpha, i.whole
+        if i.beta is not None:
+            beta = i.beta
+    elif isinstance(i, I.Culture):
+        attenuation = i.attenuation
+        if isinstance(i.culture, I.CultureBank):
+            culture = i.culture.name
+
+    return (codes[type(i)], step, time, weight, ppg, alpha, beta, whole,
+            getattr(i, 'volume', 0), sg, density, attenuation[0],
+            attenuation[1], i.name, i.desc, i.quantity, culture)
+
+
+class IngredientFrame:
+    """Ingredients stored as columns.
+
+    Each column is a NumPy array with one item per ingredient.  Values
+    that do not apply to an ingredient type are NaN (or `None`).
+
+    Attributes
+    ----------
+    code : ndarray of int
+      Ingredient type, the index in `TYPES`.
+    step, time : ndarray
+      Timing step and time (minutes or days, NaN when untimed).  Step
+      0 is for no timing.
+    weight : ndarray
+      Weight, pounds for fermentables and ounces for hops.
+    ppg : ndarray
+      Gravity points per pound per gallon.
+    alpha, beta : ndarray
+      Hop acid percentages.
+    whole : ndarray of bool
+      Whole leaf hops.
+    volume : ndarray
+      Added volume, gallons.
+    sg, density : ndarray
+      Specific gravity and density of fruit and wort.
+    attenuation_min, attenuation_max : ndarray
+      Culture apparent attenuation range, percent.
+    name, desc, quantity, culture : ndarray of object
+      Names, descriptions, quantities, and `CultureBank` keys (`None`
+      for cultures given as tuples).
+
+    """
+
+    def __init__(self, **columns):
+        for k, dtype in _columns:
+            setattr(self, k, np.asarray(columns[k], dtype=dtype))
+
+    def __len__(self):
+        return len(self.code)
+
+    def __getitem__(self, k):
+        """Select rows with an index, slice, or mask."""
+        return IngredientFrame(**{c: getattr(self, c)[k]
+                                  for c, dtype in _columns})
+
+    def __repr__(self):
+        return '<IngredientFrame: {} items>'.format(len(self))
+
+    @classmethod
+    def from_ingredients(cls, ingredients):
+        """Convert `Ingredients` into columns."""
+        rows = [_row(i) for i in ingredients]
+        columns = list(zip(*rows)) if len(rows) > 0 else [()] * len(_columns)
+        return cls(**{k: v for (k, dtype), v in zip(_columns, columns)})
+
+    def to_ingredients(self):
+        """Convert back to `Ingredients`."""
+        return I.Ingredients([self._ingredient(i) for i in range(len(self))])
+
+    def _timing(self, i):
+        step = int(self.step[i])
+        if step == 0:
+            return None
+
+        cls = TIMINGS[step]
+        if cls in TIMED:
+            time = self.time[i]
+            return cls(int(time) if time == int(time) else float(time))
+        return cls()
+
+    def _ingredient(self, i):
+        cls = TYPES[self.code[i]]
+        timing = self._timing(i)
+        name = self.name[i]
+        desc = self.desc[i]
+
+        if cls is I.Wort:
+            return cls(float(self.sg[i]), float(self.volume[i]), timing,
+                       name=name, desc=desc)
+        elif cls is I.Fruit:
+            return cls(name, float(self.sg[i]), float(self.weight[i]),
+                       timing, density=float(self.density[i]), desc=desc)
+        elif issubclass(cls, (I.Fermentable, I.Unfermentable)):
+            return cls(int(self.ppg[i]), float(self.weight[i]), timing,
+                       name=name, desc=desc)
+        elif cls is I.Hop:
+            beta = None if np.isnan(self.beta[i]) else float(self.beta[i])
+            return cls(name, float(self.alpha[i]), float(self.weight[i]),
+                       timing, whole=bool(self.whole[i]), beta=beta,
+                       desc=desc)
+        elif cls is I.Culture:
+            if self.culture[i] is None:
+                culture = (name, float(self.attenuation_min[i]),
+                           float(self.attenuation_max[i]))
+            else:
+                culture = I.CultureBank[self.culture[i]]
+            return cls(culture, self.quantity[i], timing, desc=desc)
+        elif cls is I.Water:
+            return cls(name, float(self.volume[i]), timing, desc=desc)
+        else:
+            return cls(name, self.quantity[i], timing, desc=desc)
+
+    def isinstance(self, *types):
+        """Mask of ingredients that are instances of `types`."""
+        table = np.array([issubclass(t, types) for t in TYPES])
+        return table[self.code]
+
+    @property
+    def sort_key(self):
+        """Arrays of `Timing.sort_key` items: `(step, sub-time)`."""
+        step = np.where(self.step == 0, T.Unspecified.step, self.step)
+        sub = np.where(step == T.Boil.step, -self.time,
+                       np.where((step == T.HopStand.step)
+                                | (step == T.Secondary.step),
+                                self.time, 0))
+        return step, sub
+
+    def mashed(self):
+        """Mask of ingredients added before the lauter."""
+        step = np.where(self.step == 0, T.Unspecified.step, self.step)
+        return step < T.Lauter.step
+
+    def extract(self, efficiency):
+        """Extract of each ingredient, zero for those without extract.
+
+        Parameters
+        ----------
+        efficiency : float
+          Mash efficiency.
+
+        """
+        ex = np.where(self.isinstance(I.Fermentable, I.Unfermentable),
+                      self.weight * self.ppg, 0)
+        return np.where(self.mashed(), ex * efficiency, ex)
+
+    def bitterness(self, gravity, volume, boil=None, hop_stand=False):
+        """Compute bitterness of all hops.
+
+        See `Hop.bitterness`.
+
+        Parameters
+        ----------
+        gravity : float
+          The gravity of the boil at the start.
+        volume : float
+          The post-boil volume in gallons.
+        boil : float, optional
+          The length of the boil.  Required for mash and first wort
+          hops.
+        hop_stand : bool, optional
+          Set to `True` if there is a hop stand after the boil.
+
+        Returns
+        -------
+        util : ndarray
+          Percent utilization of each hop.
+        bit : ndarray
+          Bittereness of each hop in IBUs.
+
+        """
+
+        hops = self[self.isinstance(I.Hop)]
+        early = (hops.step == T.FirstWort.step) | (hops.step == T.Mash.step)
+        if early.any() and not isinstance(boil, (float, int)):
+            raise ValueError(
+                'Boil time is required for mash and first-wort hops.')
+
+        t = np.select(
+            [early, hops.step == T.HopStand.step, hops.step == T.Boil.step],
+            [(boil or 0) + 5, 5, hops.time + (5 if hop_stand else 0)],
+            np.nan)
+        boiled = ~np.isnan(t)
+        util = np.where(boiled, utilization(np.where(boiled, t, 0), gravity,
+                                            whole=hops.whole), 0)
+        bit = ibu(util, hops.weight, hops.alpha, volume)
+        return util, bit
@@ -0,0 +1,402 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+history --- A searchable index of brewlogs.
+===========================================
+
+A `History` is a SQLite database of batch summaries: ingredient names,
+their weight fractions of the grist (as in `Brew.compute_mash`), and
+the OG, FG, IBU, and ABV from `Brew.compute_ferment`.  Brewlogs are
+read with `iter_brewlog`, and searched without loading them again::
+
+    >>> history = History('history.db')
+    >>> history.update('brewlog.yaml')
+    >>> history.query(og=(1.060, 1.070), ibu=(None, 30),
+    ...               ingredients={'%rye%': (0.15, None)})
+    [12, 31]
+
+Updates are incremental: the last indexed batch of a brewlog, which
+may have been extended, and any batches appended after it are indexed
+again, the rest are skipped without being constructed.  A brewlog that
+was modified before its last batch is indexed again.
+
+"""
+
+import hashlib
+import os
+import sqlite3
+from collections import namedtuple
+from threading import Lock
+from .brew import Brew
+from .ingredients import Fermentable, Unfermentable
+from .yaml import _iter_batches, batch_recipe, iter_brewlog
+
+__all__ = [
+    'Summary',
+    'History',
+]
+
+Summary = namedtuple('Summary', ['id', 'source', 'index', 'og', 'fg', 'ibu',
+                                 'abv'])
+Summary.__doc__ = """Summary of an indexed batch.
+
+Parameters
+----------
+id : int
+  Batch ID.
+source : string
+  The brewlog, or `None`.
+index : int
+  Batch number in the brewlog, starting at 0.
+og, fg : float
+  Original and final gravity, or `None` if the batch was not brewed.
+ibu : float
+  Bitterness, or `None`.
+abv : float
+  Alcohol by volume, percent, or `None`.
+
+"""
+
+_schema = """
+CREATE TABLE IF NOT EXISTS source (
+  path TEXT PRIMARY KEY,
+  digest TEXT NOT NULL,
+  start INTEGER NOT NULL,
+  head TEXT NOT NULL,
+  count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS batch (
+  id INTEGER PRIMARY KEY,
+  source TEXT,
+  position INTEGER,
+  og REAL,
+  fg REAL,
+  ibu REAL,
+  abv REAL
+);
+CREATE INDEX IF NOT EXISTS batch_source ON batch (source, position);
+CREATE INDEX IF NOT EXISTS batch_og ON batch (og);
+CREATE INDEX IF NOT EXISTS batch_fg ON batch (fg);
+CREATE INDEX IF NOT EXISTS batch_ibu ON batch (ibu);
+CREATE INDEX IF NOT EXISTS batch_abv ON batch (abv);
+CREATE TABLE IF NOT EXISTS ingredient (
+  batch INTEGER NOT NULL REFERENCES batch (id) ON DELETE CASCADE,
+  name TEXT NOT NULL COLLATE NOCASE,
+  fraction REAL,
+  PRIMARY KEY (batch, name)
+);
+CREATE INDEX IF NOT EXISTS ingredient_name ON ingredient (name, fraction);
+"""
+
+# summary columns that may be searched by range
+_ranges = ('og', 'fg', 'ibu', 'abv')
+
+
+def _digests(text, start):
+    """SHA-1 of the first `start` characters, and of all of `text`."""
+    h = hashlib.sha1(text[:start].encode('utf8'))
+    head = h.hexdigest()
+    h.update(text[start:].encode('utf8'))
+    return head, h.hexdigest()
+
+
+class History:
+    """A searchable index of brewlog batches.
+
+    Parameters
+    ----------
+    path : string, optional
+      Database file, created as needed.  The default is an in-memory
+      database.
+
+    """
+
+    def __init__(self, path=None):
+        self._lock = Lock()
+        self._db = sqlite3.connect(':memory:' if path is None else path,
+                                   check_same_thread=False)
+        self._db.execute('PRAGMA foreign_keys = ON')
+        if path is not None:
+            self._db.execute('PRAGMA journal_mode=WAL')
+        with self._db:
+            self._db.executescript(_schema)
+
+    def close(self):
+        """Close the database."""
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM batch').fetchone()[0]
+
+    def __repr__(self):
+        return '<History: {} batches>'.format(len(self))
+
+    def _insert(self, batch, source, position, recipe):
+        """Index one batch, the caller holds the lock and transaction."""
+        items = batch.ingredients
+        og = fg = ibu = abv = None
+        fermentables = None
+        r = recipe(batch)
+        if r is not None:
+            target_volume, config = r
+            config = dict(config)
+            parameter_sets = config.pop('parameter_sets', None)
+            brew = Brew(items, target_volume, parameter_sets=parameter_sets,
+                        **config)
+            result = brew.compute_ferment()
+            og, fg = result.beer.sg, result.beer.fg
+            ibu, abv = result.bitterness, result.beer.abv
+            mash = result.boil.mash
+            fermentables = zip(mash.fermentables, mash.weight_fraction)
+
+        if fermentables is None:
+            # same as the mash, without brewing
+            extract = items.filter(Fermentable, Unfermentable)
+            total_weight = sum([i.weight for i in extract])
+            fermentables = [(i, i.weight / total_weight) for i in extract
+                            if total_weight > 0]
+
+        fractions = dict.fromkeys((i.name.lower() for i in items), None)
+        names = {}
+        for i in items:
+            names.setdefault(i.name.lower(), i.name)
+        for i, fraction in fermentables:
+            k = i.name.lower()
+            fractions[k] = (fractions[k] or 0) + fraction
+
+        cursor = self._db.execute(
+            'INSERT INTO batch (source, position, og, fg, ibu, abv)'
+            ' VALUES (?, ?, ?, ?, ?, ?)',
+            (source, position, og, fg, ibu, abv))
+        id = cursor.lastrowid
+        self._db.executemany(
+            'INSERT INTO ingredient (batch, name, fraction) VALUES (?, ?, ?)',
+            [(id, names[k], f) for k, f in fractions.items()])
+        return id
+
+    def add(self, batch, source=None, recipe=None):
+        """Index one batch.
+
+        Parameters
+        ----------
+        batch : Batch
+          The batch, from `iter_brewlog`.
+        source : string, optional
+          Where the batch is from.
+        recipe : function, optional
+          Called with the batch, returns its `(target_volume, config)`
+          for `Brew`, or `None` to index only the ingredients.  The
+          default is `brew.yaml.batch_recipe`.
+
+        Returns
+        -------
+        id : int
+          The batch ID.
+
+        """
+        with self._lock, self._db:
+            return self._insert(batch, source, None, recipe or batch_recipe)
+
+    def update(self, path, recipe=None):
+        """Index new batches of a brewlog.
+
+        The last batch indexed by the previous update is indexed again,
+        with a new ID, in case it was extended.
+
+        Parameters
+        ----------
+        path : string
+          The brewlog file.
+        recipe : function, optional
+          See `add`.
+
+        Returns
+        -------
+        n : int
+          The number of batches indexed, 0 if the brewlog did not
+          change.
+
+        """
+        recipe = recipe or batch_recipe
+        source = os.path.abspath(path)
+        with open(source, encoding='utf8') as f:
+            text = f.read()
+
+        with self._lock, self._db:
+            row = self._db.execute(
+                'SELECT digest, start, head, count FROM source'
+                ' WHERE path = ?', (source,)).fetchone()
+            skip = 0
+            if row is not None:
+                digest, start, head, count = row
+                digests = _digests(text, start)
+                if digests == (head, digest):
+                    return 0
+                if digests[0] == head:
+                    # the last indexed batch starts at `start`, it and
+                    # anything after it may have changed
+                    skip = max(count - 1, 0)
+
+            self._db.execute(
+                'DELETE FROM batch WHERE source = ? AND position >= ?',
+                (source, skip))
+
+            seen = [0]
+
+            def new(header):
+                seen[0] += 1
+                return seen[0] > skip
+
+            n = 0
+            start = 0
+            for start, batch in _iter_batches(text, new):
+                if batch is not None:
+                    self._insert(batch, source, seen[0] - 1, recipe)
+                    n += 1
+
+            head, digest = _digests(text, start)
+            self._db.execute(
+                'INSERT OR REPLACE INTO source'
+                ' (path, digest, start, head, count) VALUES (?, ?, ?, ?, ?)',
+                (source, digest, start, head, seen[0]))
+        return n
+
+    def remove(self, path):
+        """Remove all batches of a brewlog from the index."""
+        source = os.path.abspath(path)
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM batch WHERE source = ?', (source,))
+            self._db.execute('DELETE FROM source WHERE path = ?', (source,))
+
+    def query(self, og=None, fg=None, ibu=None, abv=None, ingredients=None,
+              source=None, limit=None):
+        """Search batches.
+
+        Parameters
+        ----------
+        og, fg, ibu, abv : tuple, optional
+          `(min, max)` ranges, inclusive.  `None` for an open end.
+        ingredients : dict or iterable, optional
+          Batches with all of these ingredients.  Names are SQL LIKE
+          patterns, case insensitive, e.g., '%rye%'.  For a dictionary,
+          values are `(min, max)` ranges of the weight fraction of the
+          grist, or `None` for any amount.
+        source : string, optional
+          Only batches from this brewlog.
+        limit : int, optional
+          Return at most this many IDs.
+
+        Returns
+        -------
+        ids : list of int
+          Batch IDs, in the order they were indexed.
+
+        """
+        where = []
+        args = []
+        for k, r in zip(_ranges, (og, fg, ibu, abv)):
+            if r is None:
+                continue
+            if r[0] is not None:
+                where.append('{} >= ?'.format(k))
+                args.append(r[0])
+            if r[1] is not None:
+                where.append('{} <= ?'.format(k))
+                args.append(r[1])
+
+        if ingredients is not None:
+            if not isinstance(ingredients, dict):
+                ingredients = dict.fromkeys(ingredients)
+            for name, r in ingredients.items():
+                sub = 'SELECT batch FROM ingredient WHERE name LIKE ?'
+                args.append(name)
+                if r is not None and r[0] is not None:
+                    sub += ' AND fraction >= ?'
+                    args.append(r[0])
+                if r is not None and r[1] is not None:
+                    sub += ' AND fraction <= ?'
+                    args.append(r[1])
+                where.append('id IN ({})'.format(sub))
+
+        if source is not None:
+            where.append('source = ?')
+            args.append(os.path.abspath(source))
+
+        sql = 'SELECT id FROM batch'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY id'
+        if limit is not None:
+            sql += ' LIMIT {:d}'.format(limit)
+
+        with self._lock:
+            return [row[0] for row in self._db.execute(sql, args)]
+
+    def get(self, id):
+        """Summary of a batch.
+
+        Raises
+        ------
+        KeyError
+          When there is no such batch.
+
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT id, source, position, og, fg, ibu, abv FROM batch'
+                ' WHERE id = ?', (id,)).fetchone()
+        if row is None:
+            raise KeyError(id)
+        return Summary._make(row)
+
+    def fractions(self, id):
+        """Ingredient names of a batch, and their grist fractions.
+
+        Returns
+        -------
+        fractions : dict
+          Name to weight fraction, `None` for ingredients that are not
+          in the grist.
+
+        """
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT name, fraction FROM ingredient WHERE batch = ?'
+                ' ORDER BY name', (id,)).fetchall()
+        return dict(rows)
+
+    def load(self, id):
+        """Load an indexed batch from its brewlog.
+
+        Returns
+        -------
+        batch : Batch
+
+        Raises
+        ------
+        KeyError
+          When there is no such batch, or it was not indexed from a
+          brewlog.
+
+        """
+        summary = self.get(id)
+        if summary.source is None:
+            raise KeyError(id)
+
+        seen = [-1]
+
+        def this(header):
+            seen[0] += 1
+            return seen[0] == summary.index
+
+        with open(summary.source, 'rb') as f:
+            for batch in iter_brewlog(f, this):
+                return batch
+        raise KeyError(id)
@@ -6,9 +6,16 @@ ingredients --- Beer ingredients
 
 """
 
+from bisect import bisect_left, insort
 from enum import Enum
-from collections.abc import MutableSequence
+from itertools import chain
+from operator import attrgetter
+from collections.abc import Iterable, MutableSequence, Sequence
+from weakref import ref
 from . import timing as T
+from .profiling import count_copy
+from .table import Table
+from .util import ibu, utilization
 
 __all__ = [
     'PPG',
@@ -28,8 +35,20 @@ __all__ = [
     'Water',
     'WaterTreatment',
     'Ingredients',
+    'IngredientsView',
 ]
 
+# `Ingredient._owner` of items held by the timing buckets of several
+# `Ingredients`
+_shared = object()
+
+# incremented when the timing of a shared item is changed, see
+# `Ingredients._stale`
+_shared_generation = 0
+
+# attribute getters for `Ingredient._values`, by class
+_value_getters = {}
+
 # Source: Home Brewer's Companion
 # Beersmith: http://www.beersmith.com/Grains/Grains/GrainList.htm
 # name, PPG
@@ -185,6 +204,14 @@ class Ingredient:
 
     """
 
+    # `_owner` is a weak reference to the `Ingredients` with timing
+    # buckets that may hold this item, or `_shared`, see
+    # `Ingredients._own`
+    __slots__ = ('name', 'quantity', '_timing', 'desc', '_owner')
+
+    # constructor arguments, except timing, see `to_dict`
+    _args = ('name', 'quantity', 'desc')
+
     def __init__(self, name, quantity, timing=T.Unspecified(), desc=None):
         if not isinstance(name, str):
             raise TypeError('name')
@@ -194,9 +221,107 @@ class Ingredient:
 
         self.name = name
         self.quantity = quantity
-        self.timing = timing
+        self._timing = timing
         self.desc = name if desc is None else desc
 
+    # attrgetter is faster than a function
+    timing = property(attrgetter('_timing'), doc='When to add it.')
+
+    @timing.setter
+    def timing(self, timing):
+        self._timing = timing
+        # the timing buckets of collections with this item are out of date
+        owner = getattr(self, '_owner', None)
+        if owner is _shared:
+            global _shared_generation
+            _shared_generation += 1
+        elif owner is not None:
+            owner = owner()
+            if owner is not None:
+                owner._timings = None
+                owner._version += 1
+
+    def _slots(self):
+        """Slot descriptors of this object, some shadowed by properties."""
+        for cls in type(self).__mro__[:-1]:
+            for k in cls.__dict__.get('__slots__', ()):
+                if k != '_owner':
+                    yield k, cls.__dict__[k]
+
+    def _values(self):
+        """Attribute values, for comparisons between ingredient states."""
+        cls = type(self)
+        try:
+            getter = _value_getters[cls]
+        except KeyError:
+            # slots shadowed by properties are not set
+            names = [k for k, slot in self._slots() if getattr(cls, k) is slot]
+            getter = _value_getters[cls] = attrgetter(*names)
+        return getter(self)
+
+    def __getstate__(self):
+        state = {}
+        for k, slot in self._slots():
+            try:
+                state[k] = slot.__get__(self)
+            except AttributeError:
+                pass
+        return state
+
+    def __setstate__(self, state):
+        for k, slot in self._slots():
+            if k in state:
+                slot.__set__(self, state[k])
+
+    def to_dict(self):
+        """Flat dictionary of the ingredient, see `from_dict`.
+
+        The keys are 'type', the class name, the constructor arguments,
+        and those of `Timing.to_dict`.
+
+        """
+        d = {'type': type(self).__name__}
+        for k in self._args:
+            d[k] = getattr(self, k)
+        if self._timing is None:
+            d['timing'] = None
+        else:
+            d.update(self._timing.to_dict())
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        """Ingredient from a dictionary, see `to_dict`.
+
+        Parameters
+        ----------
+        d : dict
+          The ingredient.  ``d['type']`` must be this class or a
+          subclass.
+
+        """
+        try:
+            kind = _ingredient_types[d['type']]
+        except KeyError:
+            raise ValueError('Not an ingredient: {}'.format(d['type']))
+
+        if not issubclass(kind, cls):
+            raise TypeError('{} is not a {}'.format(d['type'], cls.__name__))
+
+        return kind._from_dict(d)
+
+    @classmethod
+    def _from_dict(cls, d):
+        kwargs = {k: d[k] for k in cls._args if k in d}
+        if 'timing' in d:
+            kwargs['timing'] = T.Timing.from_dict(d)
+        item = cls(**kwargs)
+
+        # some constructors replace a missing description with the name
+        if 'desc' in d:
+            item.desc = d['desc']
+        return item
+
     def __repr__(self):
         return "<{}: {}>".format(type(self).__name__, str(self))
 
@@ -221,8 +346,14 @@ class Culture(Ingredient):
 
     """
 
+    __slots__ = ('culture', 'attenuation')
+    _args = ('quantity', 'desc')
+
     def __init__(self, culture, quantity='1', timing=T.Primary(), desc=None):
-        if not isinstance(culture, CultureBank):
+        if isinstance(culture, tuple):
+            if len(culture) != 3:
+                raise ValueError('culture tuple must be (name, min, max)')
+        elif not isinstance(culture, CultureBank):
             raise TypeError('culture')
 
         if not isinstance(quantity, str):
@@ -236,11 +367,36 @@ class Culture(Ingredient):
 
         self.culture = culture
         self.quantity = quantity
-        self.timing = timing
-        self.name = self.culture.value[0]
-        self.attenuation = (self.culture.value[1], self.culture.value[2])
+        self._timing = timing
+        value = culture if isinstance(culture, tuple) else culture.value
+        self.name = value[0]
+        self.attenuation = (value[1], value[2])
         self.desc = self.name if desc is None else desc
 
+    def to_dict(self):
+        """Flat dictionary of the culture, see `Ingredient.from_dict`.
+
+        'culture' is the `CultureBank` key, or `None` for cultures given
+        as tuples, which are rebuilt from 'name', 'attenuation_min', and
+        'attenuation_max'.
+
+        """
+        d = Ingredient.to_dict(self)
+        d['culture'] = (self.culture.name
+                        if isinstance(self.culture, CultureBank) else None)
+        d['name'] = self.name
+        d['attenuation_min'], d['attenuation_max'] = self.attenuation
+        return d
+
+    @classmethod
+    def _from_dict(cls, d):
+        if d.get('culture') is None:
+            culture = (d['name'], d['attenuation_min'], d['attenuation_max'])
+        else:
+            culture = CultureBank[d['culture']]
+        return cls(culture, d.get('quantity', '1'), T.Timing.from_dict(d),
+                   d.get('desc'))
+
 
 class Fermentable(Ingredient):
     """Grains and adjuncts.
@@ -262,6 +418,9 @@ class Fermentable(Ingredient):
 
     """
 
+    __slots__ = ('ppg', 'weight')
+    _args = ('ppg', 'weight', 'name', 'desc')
+
     def __init__(self, ppg, weight, timing=T.Mash(), name=None, desc=None):
         if not isinstance(ppg, (PPG, float, int)):
             raise TypeError('ppg')
@@ -289,7 +448,7 @@ class Fermentable(Ingredient):
             self.name = name
 
         self.weight = float(weight)
-        self.timing = timing
+        self._timing = timing
         self.desc = name if desc is None else desc
 
     def __str__(self):
@@ -331,6 +490,9 @@ class Unfermentable(Ingredient):
 
     """
 
+    __slots__ = ('ppg', 'weight')
+    _args = ('ppg', 'weight', 'name', 'desc')
+
     def __init__(self, ppg, weight, timing=T.Mash(), name=None, desc=None):
         if not isinstance(ppg, (PPG, float, int)):
             raise TypeError('ppg')
@@ -352,13 +514,13 @@ class Unfermentable(Ingredient):
             if name is not None:
                 self.name = name
         else:
-            ppg = int(ppg)
+            self.ppg = int(ppg)
             if name is None:
                 raise ValueError('`name` is required when `ppg` is a float.')
             self.name = name
 
         self.weight = float(weight)
-        self.timing = timing
+        self._timing = timing
         self.desc = name if desc is None else desc
 
     def __str__(self):
@@ -400,6 +562,9 @@ class Hop(Ingredient):
 
     """
 
+    __slots__ = ('alpha', 'weight', 'whole', 'beta')
+    _args = ('name', 'alpha', 'weight', 'whole', 'beta', 'desc')
+
     def __init__(self, name, alpha, weight, timing=None, whole=False,
                  beta=None, desc=None):
         if not isinstance(name, str):
@@ -426,7 +591,7 @@ class Hop(Ingredient):
         self.name = name
         self.alpha = alpha
         self.weight = weight
-        self.timing = timing
+        self._timing = timing
         self.whole = whole
         self.beta = beta
         self.desc = name if desc is None else desc
@@ -475,8 +640,6 @@ class Hop(Ingredient):
 
         """
 
-        from .util import ibu, utilization
-
         if not isinstance(gravity, float):
             raise TypeError('gravity')
 
@@ -503,12 +666,14 @@ class Hop(Ingredient):
 
 
 class Spice(Ingredient):
-    pass
+    __slots__ = ()
 
 
 class Grain(Fermentable):
     """A mashable grain or similar."""
 
+    __slots__ = ()
+
     def __init__(self, ppg, weight, timing=T.Mash(), name=None, desc=None):
         Fermentable.__init__(self, ppg, weight, timing=timing, name=name,
                              desc=desc)
@@ -517,6 +682,8 @@ class Grain(Fermentable):
 class Sugar(Fermentable):
     """Sugars, syrups, and similar 100% fermentables."""
 
+    __slots__ = ()
+
     def __init__(self, ppg, weight, timing=T.Boil(0), name=None, desc=None):
         Fermentable.__init__(self, ppg, weight, timing=timing, name=name,
                              desc=desc)
@@ -525,11 +692,14 @@ class Sugar(Fermentable):
 class Wort(Fermentable):
     """Wort."""
 
+    __slots__ = ('sg', 'volume')
+    _args = ('sg', 'volume', 'name', 'desc')
+
     def __init__(self, sg, volume, timing=T.Boil(0), name=None, desc=None):
         self.name = name
         self.sg = float(sg)
         self.volume = volume
-        self.timing = timing
+        self._timing = timing
         self.desc = name if desc is None else desc
 
     @property
@@ -577,6 +747,9 @@ class Fruit(Fermentable):
 
     """
 
+    __slots__ = ('sg', 'density')
+    _args = ('name', 'sg', 'weight', 'density', 'desc')
+
     def __init__(self, name, sg, weight, timing=T.Secondary(),
                  density=1.0, desc=None):
         if not isinstance(name, str):
@@ -600,7 +773,7 @@ class Fruit(Fermentable):
         self.name = name
         self.sg = float(sg)
         self.weight = float(weight)
-        self.timing = timing
+        self._timing = timing
         self.density = float(density)
         self.desc = name if desc is None else desc
 
@@ -627,15 +800,15 @@ class Fruit(Fermentable):
 
 
 class Other(Ingredient):
-    pass
+    __slots__ = ()
 
 
 class Priming(Ingredient):
-    pass
+    __slots__ = ()
 
 
 class WaterTreatment(Ingredient):
-    pass
+    __slots__ = ()
 
 
 class Water(Ingredient):
@@ -654,6 +827,9 @@ class Water(Ingredient):
 
     """
 
+    __slots__ = ('volume',)
+    _args = ('name', 'volume', 'desc')
+
     def __init__(self, name, volume=0, timing=T.Unspecified(), desc=None):
         if not isinstance(name, str):
             raise TypeError('name')
@@ -669,7 +845,7 @@ class Water(Ingredient):
 
         self.name = name
         self.volume = float(volume)
-        self.timing = timing
+        self._timing = timing
         self.desc = name if desc is None else desc
 
     @property
@@ -680,47 +856,28 @@ class Water(Ingredient):
             return "{:.2f} gal".format(self.volume)
 
 
-class Ingredients(MutableSequence):
-    """A collection of ingredients.
-
-    Parameters
-    ----------
-    a : iterable
-      A list of `Ingredient`s.
-
-    """
-
-    def __init__(self, a=[]):
-        from collections import Iterable
-        if not isinstance(a, Iterable):
-            raise TypeError('ingredient list must be an iterable')
-
-        self._list = list(a)
-
-    def __contains__(self, value):
-        return value in self._list
+# ingredient classes by name, see `Ingredient.from_dict`
+_ingredient_types = {cls.__name__: cls for cls in (
+    Ingredient, Culture, Fermentable, Unfermentable, Hop, Spice, Grain, Sugar,
+    Wort, Fruit, Other, Priming, WaterTreatment, Water)}
 
-    def __delitem__(self, k):
-        del self._list[k]
 
-    def __iadd__(self, *args, **kwargs):
-        self._list.__iadd__(*args, **kwargs)
+class _Queries:
+    """Type and timing queries for `Ingredients` and `IngredientsView`.
 
-    def __iter__(self):
-        return iter(self._list)
+    Queries return an `IngredientsView`.
 
-    def __getitem__(self, k):
-        return self._list[k]
+    """
 
-    def __len__(self, *args, **kwargs):
-        return len(self._list)
+    def _view(self, predicate, key=None):
+        raise NotImplementedError
 
     def __repr__(self):
-        return "<Ingredients: {} items ({} fermentables, {} hops)>".format(
-            len(self), len(self.fermentables), len(self.hops))
+        return "<{}: {} items ({} fermentables, {} hops)>".format(
+            type(self).__name__, len(self), len(self.fermentables),
+            len(self.hops))
 
     def __str__(self):
-        from .table import Table
         item, quantity, timing = [], [], []
         for i in self:
             item.append(i.name)
@@ -731,39 +888,6 @@ class Ingredients(MutableSequence):
                     names=('Item', 'Quantity', 'Timing'))
         return str(tab)
 
-    def __reversed__(self, *args, **kwargs):
-        return reversed(self._list)
-
-    def __setitem__(self, index, value):
-        if not isinstance(value, Ingredient):
-            raise TypeError('Must be an Ingredient')
-
-        MutableSequence.__setitem__(self, index, value)
-
-    def append(self, v):
-        self._list.append(v)
-
-    def extend(self, iterable):
-        self._list.extend(iterable)
-
-    def count(self, *args):
-        return self._list.count(*args)
-
-    def index(self, *args):
-        return self._list(*args)
-
-    def insert(self, index, object):
-        self._list.insert(index, object)
-
-    def pop(self, *args):
-        return self._list.pop(*args)
-
-    def remove(self, v):
-        self._list.remove(v)
-
-    def reverse(self):
-        self._list.reverse()
-
     def upto(self, time):
         """All ingredients included up to `time`.
 
@@ -772,7 +896,7 @@ class Ingredients(MutableSequence):
         time : Timing
 
         """
-        return Ingredients([i for i in self if i.timing < time])
+        return self._view(lambda i: i.timing < time)
 
     def at(self, time):
         """All ingredients included at `time`.
@@ -782,7 +906,7 @@ class Ingredients(MutableSequence):
         time : Timing
 
         """
-        return Ingredients([i for i in self if i.timing <= time])
+        return self._view(lambda i: i.timing <= time)
 
     def after(self, time):
         """All ingredients included after `time`.
@@ -792,39 +916,39 @@ class Ingredients(MutableSequence):
         time : Timing
 
         """
-        return Ingredients([i for i in self if i.timing > time])
+        return self._view(lambda i: i.timing > time)
 
     @property
     def mash(self):
-        return Ingredients(list(filter(lambda v: isinstance(v.timing, T.Mash), self)))
+        return self.filter(T.Mash)
 
     @property
     def vorlauf(self):
-        return Ingredients(list(filter(lambda v: isinstance(v.timing, T.Vorlauf), self)))
+        return self.filter(T.Vorlauf)
 
     @property
     def first_wort(self):
-        return Ingredients(list(filter(lambda v: isinstance(v.timing, T.FirstWort), self)))
+        return self.filter(T.FirstWort)
 
     @property
     def boil(self):
-        return Ingredients(list(filter(lambda v: isinstance(v.timing, T.Boil), self)))
+        return self.filter(T.Boil)
 
     @property
     def hop_stand(self):
-        return Ingredients(list(filter(lambda v: isinstance(v.timing, T.HopStand), self)))
+        return self.filter(T.HopStand)
 
     @property
     def primary(self):
-        return Ingredients(list(filter(lambda v: isinstance(v.timing, T.Primary), self)))
+        return self.filter(T.Primary)
 
     @property
     def secondary(self):
-        return Ingredients(list(filter(lambda v: isinstance(v.timing, T.Secondary), self)))
+        return self.filter(T.Secondary)
 
     @property
     def packaging(self):
-        return Ingredients(list(filter(lambda v: isinstance(v.timing, T.Packaging), self)))
+        return self.filter(T.Packaging)
 
     @property
     def fermentables(self):
@@ -844,7 +968,7 @@ class Ingredients(MutableSequence):
 
     @property
     def spices(self):
-        return self.filte(Spice)
+        return self.filter(Spice)
 
     @property
     def fruits(self):
@@ -868,14 +992,360 @@ class Ingredients(MutableSequence):
 
         """
 
-        ingredients = self
+        types = tuple(x for x in t if issubclass(x, Ingredient))
+        timings = tuple(x for x in t if issubclass(x, T.Timing))
+
+        if types and timings:
+            return self.filter(*types).filter(*timings)
+        elif types:
+            return self._view(lambda i: isinstance(i, types),
+                              key=('type', types))
+        elif timings:
+            return self._view(lambda i: isinstance(i.timing, timings),
+                              key=('timing', timings))
+        else:
+            return self._view(lambda i: True)
+
+
+class Ingredients(_Queries, MutableSequence):
+    """A collection of ingredients.
+
+    Type and timing queries, e.g., `filter`, `upto`, and `hops`,
+    return an `IngredientsView`.
+
+    The positions of each ingredient type and each timing type are
+    kept in buckets, so that type and timing queries only visit the
+    matching ingredients.  Adding, removing, replacing, or reordering
+    items update the buckets; slice assignment and deletion rebuild
+    them on the next query.  Changing the timing of an item rebuilds
+    the timing buckets of the collections that hold it.
+
+    Parameters
+    ----------
+    a : iterable
+      A list of `Ingredient`s.
+
+    """
+
+    def __init__(self, a=[]):
+        if not isinstance(a, Iterable):
+            raise TypeError('ingredient list must be an iterable')
+
+        # iter() skips the __len__ of a view, a second pass
+        self._list = list(iter(a))
+        # incremented by changes to the list or the timing of an item,
+        # see `Brew.timeline`
+        self._version = 0
+        self._invalidate()
+        count_copy()
+
+    def _view(self, predicate, key=None):
+        return IngredientsView(self, ((predicate, key),))
+
+    def _invalidate(self):
+        """Rebuild the buckets on the next query."""
+        self._version += 1
+        self._types = None
+        self._timings = None
+        self._shares = False
+        self._generation = None
+
+    def _own(self, i, me):
+        """Rebuild the timing buckets when the timing of `i` changes.
+
+        `me` is ``weakref.ref(self)``, one object for all items.  An
+        item held by two collections is marked as shared, and a change
+        to its timing rebuilds the timing buckets of every collection
+        with shared items.
+
+        """
+        owner = getattr(i, '_owner', None)
+        if owner is None or owner is me:
+            i._owner = me
+            return
+
+        if owner is not _shared:
+            other = owner()
+            if other is None:
+                i._owner = me
+                return
+            other._shares = True
+            i._owner = _shared
+        self._shares = True
+
+    def _stale(self):
+        """Drop the timing buckets if a shared item changed timing."""
+        if self._shares and self._generation != _shared_generation:
+            self._timings = None
+            self._generation = _shared_generation
+            self._version += 1
+
+    def _bucket(self, key):
+        buckets = {}
+        for n, i in enumerate(self._list):
+            buckets.setdefault(key(i), []).append(n)
+        return buckets
+
+    def _buckets(self):
+        """Positions of each ingredient type and timing type."""
+        if self._types is None:
+            self._types = self._bucket(type)
+
+        self._stale()
+        if self._timings is None:
+            self._shares = False
+            me = ref(self)
+            for i in self._list:
+                self._own(i, me)
+            self._timings = self._bucket(lambda i: type(i.timing))
+            self._generation = _shared_generation
+
+        return self._types, self._timings
+
+    def _select(self, key):
+        """Ingredients of the types or timing types in `key`, in order.
+
+        Parameters
+        ----------
+        key : tuple
+          ``('type', classes)`` or ``('timing', classes)``.
+
+        """
+
+        kind, classes = key
+        types, timings = self._buckets()
+        buckets = types if kind == 'type' else timings
+        positions = [p for cls, p in buckets.items()
+                     if issubclass(cls, classes)]
+        if len(positions) == 0:
+            return []
+        elif len(positions) > 1:
+            positions = sorted(chain.from_iterable(positions))
+        else:
+            positions = positions[0]
+
+        items = self._list
+        return [items[n] for n in positions]
+
+    def _add(self, n, i):
+        """Add `i`, at position `n`, to the buckets.
+
+        Positions at and after `n` must already be shifted.
+
+        """
+        self._version += 1
+        if self._types is not None:
+            insort(self._types.setdefault(type(i), []), n)
+
+        self._stale()
+        if self._timings is not None:
+            self._own(i, ref(self))
+            insort(self._timings.setdefault(type(i.timing), []), n)
+
+    def _discard(self, n, i):
+        """Remove `i`, at position `n`, from the buckets."""
+        self._version += 1
+        self._stale()
+        for buckets, k in ((self._types, type(i)),
+                           (self._timings, type(i.timing))):
+            if buckets is None:
+                continue
+
+            positions = buckets[k]
+            positions.pop(bisect_left(positions, n))
+            if len(positions) == 0:
+                del buckets[k]
+
+    def _shift(self, n, d):
+        """Add `d` to the bucket positions at and after `n`."""
+        self._stale()
+        for buckets in (self._types, self._timings):
+            if buckets is None:
+                continue
+
+            for positions in buckets.values():
+                k = bisect_left(positions, n)
+                if k < len(positions):
+                    positions[k:] = [p + d for p in positions[k:]]
+
+    def _position(self, k):
+        """Non-negative position for index `k`."""
+        n = len(self._list)
+        if not -n <= k < n:
+            raise IndexError('Ingredients index out of range')
+        return k % n
+
+    def __contains__(self, value):
+        return value in self._list
+
+    def __delitem__(self, k):
+        if isinstance(k, int):
+            self.pop(k)
+        else:
+            del self._list[k]
+            self._invalidate()
+
+    def __iadd__(self, iterable):
+        self.extend(iterable)
+        return self
+
+    def __iter__(self):
+        return iter(self._list)
+
+    def __getitem__(self, k):
+        return self._list[k]
+
+    def __len__(self, *args, **kwargs):
+        return len(self._list)
+
+    def __reversed__(self, *args, **kwargs):
+        return reversed(self._list)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            if not all([isinstance(v, Ingredient) for v in value]):
+                raise TypeError('Must be an Ingredient')
+
+            self._list[index] = value
+            self._invalidate()
+            return
+
+        if not isinstance(value, Ingredient):
+            raise TypeError('Must be an Ingredient')
+
+        n = self._position(index)
+        self._discard(n, self._list[n])
+        self._list[n] = value
+        self._add(n, value)
+
+    def append(self, v):
+        self._add(len(self._list), v)
+        self._list.append(v)
+
+    def extend(self, iterable):
+        for v in iterable:
+            self.append(v)
+
+    def count(self, *args):
+        return self._list.count(*args)
+
+    def index(self, *args):
+        return self._list.index(*args)
+
+    def insert(self, index, object):
+        # same bounds as list.insert
+        n = len(self._list)
+        index = min(max(index + n if index < 0 else index, 0), n)
+        if index < n:
+            self._shift(index, 1)
+        self._add(index, object)
+        self._list.insert(index, object)
+
+    def pop(self, index=-1):
+        n = self._position(index)
+        self._discard(n, self._list[n])
+        if n != len(self._list) - 1:
+            self._shift(n + 1, -1)
+        return self._list.pop(n)
+
+    def remove(self, v):
+        del self[self._list.index(v)]
+
+    def reverse(self):
+        last = len(self._list) - 1
+        self._version += 1
+        self._stale()
+        for buckets in (self._types, self._timings):
+            if buckets is None:
+                continue
+
+            for positions in buckets.values():
+                positions.reverse()
+                positions[:] = [last - p for p in positions]
+        self._list.reverse()
+
+    def __getstate__(self):
+        # the items do not know about the copy, rebuild its buckets
+        return self._list
+
+    def __setstate__(self, state):
+        self._list = state
+        self._version = 0
+        self._invalidate()
 
-        if any([issubclass(x, Ingredient) for x in t]):
-            i = filter(lambda i: isinstance(i, t), ingredients)
-            ingredients = Ingredients(i)
+    def to_dict(self):
+        """Dictionary of all ingredients, see `Ingredient.to_dict`."""
+        return {'ingredients': [i.to_dict() for i in self._list]}
 
-        if any([issubclass(x, T.Timing) for x in t]):
-            i = filter(lambda i: isinstance(i.timing, t), ingredients)
-            ingredients = Ingredients(i)
+    @classmethod
+    def from_dict(cls, d):
+        """Ingredients from a dictionary, see `to_dict`."""
+        return cls([Ingredient.from_dict(i) for i in d['ingredients']])
 
-        return ingredients
+
+class IngredientsView(_Queries, Sequence):
+    """A lazy, read-only selection of `Ingredients`.
+
+    Queries on a view compose with its selection.  Nothing is copied
+    until the view is iterated or indexed, and the view always
+    reflects the current contents of the ingredients.  Use
+    `Ingredients(view)` for a copy.
+
+    Parameters
+    ----------
+    ingredients : Ingredients
+      The ingredients to select from.
+    queries : tuple
+      ``(predicate, key)`` pairs.  Ingredients are selected when
+      ``predicate(ingredient)`` is true for all queries.  The first
+      `key` that is not `None` selects a type or timing bucket of
+      `ingredients` to start from (see `Ingredients._select`).
+
+    """
+
+    def __init__(self, ingredients, queries):
+        self._ingredients = ingredients
+        self._queries = queries
+
+        self._key = None
+        self._predicates = []
+        for predicate, key in queries:
+            if self._key is None and key is not None:
+                self._key = key
+            else:
+                self._predicates.append(predicate)
+
+    def _view(self, predicate, key=None):
+        return IngredientsView(self._ingredients,
+                               self._queries + ((predicate, key),))
+
+    def __iter__(self):
+        if self._key is None:
+            items = iter(self._ingredients._list)
+        else:
+            items = iter(self._ingredients._select(self._key))
+
+        for predicate in self._predicates:
+            items = filter(predicate, items)
+        return items
+
+    def __bool__(self):
+        for i in self:
+            return True
+        return False
+
+    def __getitem__(self, k):
+        return list(self)[k]
+
+    def __len__(self):
+        n = 0
+        for i in self:
+            n += 1
+        return n
+
+    def __reversed__(self):
+        return reversed(list(self))
+
+    def index(self, *args):
+        return list(self).index(*args)
@@ -0,0 +1,116 @@
+# Licensed under an MIT style license - see LICENSE
+"""
+json --- Recipes as JSON.
+=========================
+
+`dump_recipes` and `load_recipes` encode lists of recipes,
+`(ingredients, target_volume, config)` tuples as for `brew.batch`, in
+a compact JSON document::
+
+    {"version": 1,
+     "columns": {"Grain": ["ppg", "weight", "name", "desc", "timing",
+                           "time"], ...},
+     "recipes": [{"target_volume": 5.5, "config": {...},
+                  "ingredients": [["Grain", 38, 10.0, "Maris Otter",
+                                   null, "Mash", null], ...]}, ...]}
+
+Each ingredient is a row: its type, then the values of its
+`Ingredient.to_dict` keys, which are listed once per type under
+"columns".  Single objects are serialized with their own `to_dict`
+and `from_dict` methods.
+
+"""
+import json
+from .configuration import _tuples
+from .ingredients import Ingredient, Ingredients
+
+__all__ = [
+    'dump_recipes',
+    'load_recipes',
+]
+
+VERSION = 1
+
+
+def _encode(recipes):
+    columns = {}
+    encoded = []
+    for items, target_volume, config in recipes:
+        rows = []
+        for item in items:
+            d = item.to_dict()
+            kind = d.pop('type')
+            cols = columns.get(kind)
+            if cols is None:
+                cols = columns[kind] = list(d)
+                if 'time' not in d:
+                    cols.append('time')
+            rows.append([kind] + [d.get(k) for k in cols])
+        encoded.append({'target_volume': target_volume, 'config': config,
+                        'ingredients': rows})
+    return {'version': VERSION, 'columns': columns, 'recipes': encoded}
+
+
+def _decode(doc):
+    if doc.get('version') != VERSION:
+        raise ValueError('Unsupported recipe version: {}'.format(
+            doc.get('version')))
+
+    columns = doc['columns']
+    recipes = []
+    for recipe in doc['recipes']:
+        items = []
+        for row in recipe['ingredients']:
+            d = dict(zip(columns[row[0]], row[1:]))
+            d['type'] = row[0]
+            items.append(Ingredient.from_dict(d))
+
+        config = recipe['config']
+        if config is not None:
+            config = _tuples(config)
+        recipes.append((Ingredients(items), recipe['target_volume'], config))
+    return recipes
+
+
+def dump_recipes(recipes, stream=None, **kwargs):
+    """Dump recipes as JSON.
+
+    Parameters
+    ----------
+    recipes : iterable
+      `(ingredients, target_volume, config)` tuples, as for
+      `brew.batch`.  `config` is a dictionary of JSON serializable
+      values, or `None`.
+    stream : file, optional
+      Write to this file, otherwise return a string.
+    **kwargs
+      Passed on to `json.dump`.
+
+    """
+    kwargs.setdefault('separators', (',', ':'))
+    doc = _encode(recipes)
+    if stream is None:
+        return json.dumps(doc, **kwargs)
+    json.dump(doc, stream, **kwargs)
+
+
+def load_recipes(stream):
+    """Load recipes from JSON.
+
+    Parameters
+    ----------
+    stream : string, bytes, or file
+      The JSON document from `dump_recipes`.
+
+    Returns
+    -------
+    recipes : list
+      `(ingredients, target_volume, config)` tuples.  Lists in
+      `config` are returned as tuples.
+
+    """
+    if isinstance(stream, (str, bytes, bytearray)):
+        doc = json.loads(stream)
+    else:
+        doc = json.load(stream)
+    return _decode(doc)
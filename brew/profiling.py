@@ -0,0 +1,144 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+profiling --- Opt-in per-stage timing.
+======================================
+
+Instrumented functions record their wall time and call count in all
+active `Profile` objects.  When no profile is active, the overhead is
+a single check per call.
+
+"""
+
+import json
+from functools import wraps
+from time import perf_counter
+
+__all__ = [
+    'Profile',
+    'profiled',
+]
+
+# the active profiles
+_active = []
+
+
+class Profile:
+    """Wall time and call counts per brewing stage.
+
+    Use as a context manager::
+
+        with Profile() as prof:
+            brew.ferment()
+        print(prof)
+
+    Stage times are inclusive, e.g., 'ferment' includes 'boil' when
+    the boil is computed for the fermentation.
+
+    Attributes
+    ----------
+    calls : dict
+      Number of calls per stage.
+    seconds : dict
+      Total wall time per stage.
+    copies : int
+      Number of `Ingredients` objects created.
+
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.seconds = {}
+        self.copies = 0
+
+    def __enter__(self):
+        _active.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        _active.remove(self)
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    def merge(self, other):
+        """Add the counts and times of another profile to this one."""
+        for stage, n in other.calls.items():
+            self.calls[stage] = self.calls.get(stage, 0) + n
+            self.seconds[stage] = (self.seconds.get(stage, 0)
+                                   + other.seconds[stage])
+        self.copies += other.copies
+        return self
+
+    def __add__(self, other):
+        total = Profile()
+        total += self
+        total += other
+        return total
+
+    def __repr__(self):
+        return '<Profile: {} stages, {} Ingredients copies>'.format(
+            len(self.calls), self.copies)
+
+    def __str__(self):
+        stages = sorted(self.calls, key=lambda k: -self.seconds[k])
+        tab = Table(data=(stages,
+                          [self.calls[k] for k in stages],
+                          [self.seconds[k] * 1e3 for k in stages]),
+                    names=('Stage', 'Calls', 'Time (ms)'))
+        tab.colformats = ('{}', '{:d}', '{:.3f}')
+        tab.footer = 'Ingredients copies: {}\n'.format(self.copies)
+        return str(tab)
+
+    def record(self, stage, seconds):
+        """Record one call of `stage`."""
+        self.calls[stage] = self.calls.get(stage, 0) + 1
+        self.seconds[stage] = self.seconds.get(stage, 0) + seconds
+
+    def to_dict(self):
+        return {'calls': dict(self.calls), 'seconds': dict(self.seconds),
+                'copies': self.copies}
+
+    @classmethod
+    def from_dict(cls, d):
+        prof = cls()
+        prof.calls.update(d['calls'])
+        prof.seconds.update(d['seconds'])
+        prof.copies = d['copies']
+        return prof
+
+    def to_json(self, **kwargs):
+        """JSON string, keyword arguments are passed to `json.dumps`."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+def profiled(stage):
+    """Decorator to record the wall time of a function as `stage`."""
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if not _active:
+                return f(*args, **kwargs)
+
+            t0 = perf_counter()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                dt = perf_counter() - t0
+                for prof in _active:
+                    prof.record(stage, dt)
+
+        return wrapper
+
+    return decorator
+
+
+def count_copy():
+    """Count a new `Ingredients` object."""
+    for prof in _active:
+        prof.copies += 1
+
+
+# after `profiled`, which `table` imports
+from .table import Table
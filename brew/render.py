@@ -0,0 +1,210 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+render --- Format brewing stage results.
+========================================
+
+"""
+
+from .results import MashResult, BoilResult, FermentResult
+from .table import Table
+
+__all__ = [
+    'mash_tables',
+    'boil_tables',
+    'ferment_summary',
+    'render',
+    'show',
+]
+
+# default table format, see `brew.set_format`
+default_format = 'text'
+
+
+def mash_tables(result, format=None):
+    """Extract and infusion schedule tables.
+
+    Parameters
+    ----------
+    result : MashResult
+      The mash results.
+    format : string, optional
+      Table format, default is `default_format`.
+
+    Returns
+    -------
+    items : list
+      Printable items: a yaml section header (yaml format only) and
+      the two tables.
+
+    """
+
+    if format is None:
+        format = default_format
+
+    ingredients = result.fermentables
+
+    # Extract table
+    tab = Table(data=([i.name for i in ingredients],
+                      [i.timing.name for i in ingredients],
+                      [i.weight for i in ingredients],
+                      result.weight_fraction,
+                      [i.ppg for i in ingredients],
+                      result.extract,
+                      result.extract_fraction),
+                names=('Grain/Adjunct', 'Timing', 'Weight',
+                       'Weight Fraction', 'PPG', 'Extract',
+                       'Extract Fraction'),
+                caption='Mash',
+                format=format)
+    tab.colformats = ('{}', '{}', '{:.3f}', '{:.1%}', '{:d}', '{:.1f}',
+                      '{:.1%}')
+    tab.footer = '''Kettle volume: {:.1f} gal
+Efficiency: {:.0%}
+Pre-boil specific gravity: {:.3f}
+'''.format(result.v_kettle, result.efficiency, result.preboil_sg)
+
+    items = []
+    if format == 'yaml':
+        items.append('    mash-and-lauter:')
+    items.append(tab)
+
+    # Infusion schedule table
+    tab = Table(data=(result.T_mash, result.T_infusion, result.v_infusion),
+                names=('T mash (F)', 'T water (F)', 'Volume (gal)'),
+                caption='Lauter and sparge',
+                format=format)
+    tab.colformats = ('{:.0f}', '{:.0f}', '{:.2f}')
+    # no grains, e.g., an extract recipe, no mash water
+    r_mash = (result.v_mash * 4 / result.grain_weight
+              if result.grain_weight > 0 else 0)
+    tab.footer = '''Total mash water: {:.1f} gal ({:.1f} qt/lb)
+Sparge with {:.1f} gal of water
+Collect {:.1f} gal of wort
+'''.format(result.v_mash, r_mash, result.v_sparge, result.v_kettle)
+    items.append(tab)
+
+    return items
+
+
+def boil_tables(result, format=None):
+    """Hop schedule table.
+
+    Parameters
+    ----------
+    result : BoilResult
+      The boil results.
+    format : string, optional
+      Table format, default is `default_format`.
+
+    Returns
+    -------
+    items : list
+      Printable items: a yaml section header (yaml format only) and
+      the table.
+
+    """
+
+    if format is None:
+        format = default_format
+
+    hops = result.hops
+    tab = Table(
+        data=([hop.name for hop in hops],
+              [('Whole leaf' if hop.whole else 'Pellets') for hop in hops],
+              [hop.alpha for hop in hops],
+              [hop.weight for hop in hops],
+              [str(hop.timing) for hop in hops],
+              result.utilization,
+              result.bitterness),
+        names=('Hop', 'Type', 'Alpha', 'Weight', 'Time', 'Utilization',
+               'Bitterness'),
+        caption='Hops',
+        format=format)
+    tab.colformats = ('{}', '{}', '{:.1f}', '{:.1f}', '{}', '{:.1f}',
+                      '{:.0f}')
+    tab.footer = '''Pre-boil: {:.1f} gal at {:.3f}
+Post-boil: {:.1f} gal at {:.3f}, {:.0f} IBU
+'''.format(result.v_preboil, result.sg_preboil, result.v_postboil,
+           result.sg_postboil, result.ibu)
+    if result.hop_stand:
+        tab.footer += '\nHop stand'
+
+    items = []
+    if format == 'yaml':
+        items.append('    hopping:')
+    items.append(tab)
+
+    return items
+
+
+def ferment_summary(result):
+    """Summary of the beer.
+
+    Parameters
+    ----------
+    result : FermentResult
+      The fermentation results.
+
+    Returns
+    -------
+    summary : string
+
+    """
+
+    beer = result.beer
+    return '''Starting gravity: {sg:.3f}
+Final gravity: {fg:.3f}
+Bitterness: {bit:.0f} IBU
+Apparent attenutation: {aa:.0f}%
+ABV: {abv:.1f}%
+Calories: {cals:.0f}
+Carbohydrates: {carbs:.1f} g
+'''.format(sg=beer.sg, fg=beer.fg, bit=result.bitterness,
+           aa=result.attenuation, abv=beer.abv, cals=beer.calories,
+           carbs=beer.carbohydrates)
+
+
+def render(result, format=None):
+    """Format stage results, including any upstream stages.
+
+    Parameters
+    ----------
+    result : MashResult, BoilResult, or FermentResult
+      The results to format.
+    format : string, optional
+      Table format, default is `default_format`.
+
+    Returns
+    -------
+    items : list
+      Printable items, in brewing order.
+
+    """
+
+    if isinstance(result, MashResult):
+        return mash_tables(result, format=format)
+    elif isinstance(result, BoilResult):
+        items = [] if result.mash is None else render(result.mash, format)
+        return items + boil_tables(result, format=format)
+    elif isinstance(result, FermentResult):
+        items = [] if result.boil is None else render(result.boil, format)
+        return items + [ferment_summary(result)]
+    else:
+        raise TypeError('result')
+
+
+def show(result, format=None):
+    """Print stage results, including any upstream stages.
+
+    Parameters
+    ----------
+    result : MashResult, BoilResult, or FermentResult
+      The results to print.
+    format : string, optional
+      Table format, default is `default_format`.
+
+    """
+
+    for item in render(result, format=format):
+        print(item)
@@ -0,0 +1,188 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+results --- Results of the brewing stages.
+==========================================
+
+"""
+
+from importlib import import_module
+
+__all__ = [
+    'MashResult',
+    'BoilResult',
+    'FermentResult',
+]
+
+
+class StageResult:
+    """Base class for the results of a brewing stage.
+
+    All attributes listed in `_fields` are required keyword arguments.
+
+    """
+
+    _fields = ()
+
+    # fields holding objects with `to_dict`: field -> (module, class)
+    _nested = {}
+
+    def __init__(self, **kwargs):
+        for k in self._fields:
+            setattr(self, k, kwargs.pop(k))
+
+        if len(kwargs) > 0:
+            raise TypeError('Unexpected arguments: {}'.format(
+                ', '.join(kwargs.keys())))
+
+    def replace(self, **kwargs):
+        """A copy, with the fields in `kwargs` replaced."""
+        fields = {k: getattr(self, k) for k in self._fields}
+        fields.update(kwargs)
+        return type(self)(**fields)
+
+    def to_dict(self):
+        """Dictionary of the results, see `from_dict`.
+
+        Nested objects are dictionaries, tuples are lists.
+
+        """
+        d = {}
+        for k in self._fields:
+            v = getattr(self, k)
+            if hasattr(v, 'to_dict'):
+                v = v.to_dict()
+            elif isinstance(v, tuple):
+                v = list(v)
+            d[k] = v
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        """Results from a dictionary, see `to_dict`."""
+        fields = {}
+        for k in cls._fields:
+            v = d[k]
+            if v is None:
+                pass
+            elif k in cls._nested:
+                module, name = cls._nested[k]
+                v = getattr(import_module(module, __package__),
+                            name).from_dict(v)
+            elif isinstance(v, list):
+                v = tuple(v)
+            fields[k] = v
+        return cls(**fields)
+
+    def __repr__(self):
+        return '<{}: {}>'.format(type(self).__name__, ', '.join(
+            '{}={!r}'.format(k, getattr(self, k)) for k in self._fields
+            if not isinstance(getattr(self, k), StageResult)))
+
+
+class MashResult(StageResult):
+    """Mash and lauter results.
+
+    Attributes
+    ----------
+    fermentables : Ingredients
+      All ingredients with extract (fermentables and unfermentables).
+    weight_fraction : tuple of float
+      Weight fraction of each item in `fermentables`.
+    extract : tuple of float
+      Extract of each item in `fermentables`.
+    extract_fraction : tuple of float
+      Extract fraction of each item in `fermentables`.
+    grain_weight : float
+      Weight of the mashed grains, lb.
+    efficiency : float
+      Mash and lauter efficiency.
+    v_kettle : float
+      Kettle volume, gal.
+    preboil_sg : float
+      Pre-boil specific gravity.
+    T_mash : tuple of int
+      Mash temperature steps, °F.
+    T_infusion : tuple of float
+      Infusion water temperatures, °F.
+    v_infusion : tuple of float
+      Infusion volumes, gal.
+    v_mash : float
+      Total mash water, gal.
+    v_sparge : float
+      Sparge water volume, gal.
+    wort : Wort
+      The pre-boil wort.
+
+    """
+
+    _fields = ('fermentables', 'weight_fraction', 'extract',
+               'extract_fraction', 'grain_weight', 'efficiency', 'v_kettle',
+               'preboil_sg', 'T_mash', 'T_infusion', 'v_infusion', 'v_mash',
+               'v_sparge', 'wort')
+    _nested = {'fermentables': ('.ingredients', 'Ingredients'),
+               'wort': ('.brew', 'Wort')}
+
+
+class BoilResult(StageResult):
+    """Boil results.
+
+    Attributes
+    ----------
+    hops : Ingredients
+      The hop additions.
+    utilization : tuple of float
+      Percent utilization of each hop addition.
+    bitterness : tuple of float
+      Bitterness of each hop addition, IBU.
+    hop_stand : bool
+      `True` if there was a post-boil hop stand.
+    v_preboil : float
+      Pre-boil volume, gal.
+    sg_preboil : float
+      Pre-boil specific gravity.
+    v_postboil : float
+      Post-boil volume, gal.
+    sg_postboil : float
+      Post-boil specific gravity.
+    ibu : float
+      Total bitterness, IBU.
+    wort : Wort
+      The post-boil wort.
+    mash : MashResult or None
+      The mash results, if the mash was computed for this boil.
+
+    """
+
+    _fields = ('hops', 'utilization', 'bitterness', 'hop_stand', 'v_preboil',
+               'sg_preboil', 'v_postboil', 'sg_postboil', 'ibu', 'wort',
+               'mash')
+    _nested = {'hops': ('.ingredients', 'Ingredients'),
+               'wort': ('.brew', 'Wort'),
+               'mash': ('.results', 'MashResult')}
+
+
+class FermentResult(StageResult):
+    """Fermentation results.
+
+    Attributes
+    ----------
+    v_primary : float
+      Wort volume racked to the primary, gal.
+    v_final : float
+      Final beer volume, gal.
+    bitterness : float
+      Final bitterness, IBU.
+    attenuation : float
+      Apparent attenuation, percent.
+    beer : Beer
+      The beer.
+    boil : BoilResult or None
+      The boil results, if the boil was computed for this fermentation.
+
+    """
+
+    _fields = ('v_primary', 'v_final', 'bitterness', 'attenuation', 'beer',
+               'boil')
+    _nested = {'beer': ('.brew', 'Beer'),
+               'boil': ('.results', 'BoilResult')}
@@ -0,0 +1,107 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+solve --- Find ingredient weights for target gravity and bitterness.
+====================================================================
+
+"""
+
+from . import timing as T
+from .brew import Brew
+from .ingredients import Ingredients, Fermentable, Unfermentable, Grain
+from .timeline import Timeline
+
+__all__ = [
+    'solve',
+]
+
+
+def solve(ingredients, target_volume, og, ibu, parameter_sets=None,
+          **kwargs):
+    """Grain and hop weights that hit a target gravity and bitterness.
+
+    The ratios of the grain bill and of the hop schedule are held
+    fixed; all other ingredients are unchanged.  The starting gravity
+    is linear in the grain bill scale factor, and, once the grains
+    are known, the bitterness is linear in the hop scale factor, so
+    both are solved in closed form.
+
+    Parameters
+    ----------
+    ingredients : Ingredients
+      The recipe.
+    target_volume : float
+      The target wort volume in the primary, gallons.
+    og : float
+      Target starting gravity, as computed by `Brew.ferment`.
+    ibu : float
+      Target bitterness, as computed by `Brew.ferment`.
+    parameter_sets : string or list of strings, optional
+      Load these parameter sets from the configuration file.
+    **kwargs
+      `Brew` parameters.
+
+    Returns
+    -------
+    grain_weights : tuple of float
+      New weights for `ingredients.grains`, in order, pounds.
+    hop_weights : tuple of float
+      New weights for `ingredients.hops`, in order, ounces.
+
+    """
+
+    brew = Brew(ingredients, target_volume, parameter_sets=parameter_sets,
+                **kwargs)
+    efficiency = brew['efficiency']
+
+    grains = ingredients.grains
+    if len(grains) == 0:
+        raise ValueError('The recipe has no grains to scale.')
+
+    others = Ingredients([i for i in ingredients.fermentables
+                          if not isinstance(i, Grain)])
+    timelines = (Timeline(grains), Timeline(others))
+
+    def extract(time, upto=False):
+        """Extract of grains and other fermentables."""
+        return [t.extract(time, efficiency, upto=upto) for t in timelines]
+
+    v_postboil = brew.volume(T.Primary(), upto=True)
+    v_primary = v_postboil - brew['kettle_gap']
+    v_final = brew.volume(T.Final())
+
+    # starting gravity: og - 1 = (a * scale + c) / v_final / 1000
+    postboil = extract(T.Primary(), upto=True)
+    final = extract(T.Final())
+    a, c = [v_primary * p / v_postboil + f - p
+            for p, f in zip(postboil, final)]
+    grain_scale = ((og - 1) * 1000 * v_final - c) / a
+    if grain_scale <= 0:
+        raise ValueError('Target gravity is not above the gravity from '
+                         'ingredients other than grains.')
+
+    # pre-boil gravity with the new grain bill
+    mashed = ingredients.filter(Fermentable, Unfermentable).filter(
+        T.Mash, T.Vorlauf, T.Sparge, T.Lauter)
+    mash_extract = sum([f.extract(efficiency) *
+                        (grain_scale if isinstance(f, Grain) else 1)
+                        for f in mashed])
+    sg_preboil = 1 + mash_extract / brew.volume(T.Lauter()) / 1000
+
+    # bitterness with the current hop schedule
+    bit = 0
+    for hop in ingredients.hops:
+        bit += hop.bitterness(sg_preboil, v_postboil,
+                              boil=brew['boil_time'],
+                              hop_stand=brew.hop_stand)[1]
+    bit *= v_primary / v_final
+
+    if bit == 0:
+        if ibu != 0:
+            raise ValueError('The hop schedule has no bittering potential.')
+        hop_scale = 1
+    else:
+        hop_scale = ibu / bit
+
+    return (tuple(g.weight * grain_scale for g in grains),
+            tuple(h.weight * hop_scale for h in ingredients.hops))
@@ -0,0 +1,244 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+sweep --- Evaluate a recipe over a grid of brewing parameters.
+==============================================================
+
+"""
+
+from collections import OrderedDict
+import numpy as np
+from . import timing as T
+from .configuration import get_config
+from .ingredients import Fermentable, Unfermentable
+from .timeline import Timeline
+from .util import final_gravity, infusion_volume, utilization, ibu, abv
+
+__all__ = [
+    'sweep',
+    'SweepResult',
+]
+
+
+class SweepResult:
+    """Results of a parameter sweep.
+
+    All results are arrays with the shape of the parameter grid, one
+    dimension per swept parameter, in the order of `axes`.
+
+    Attributes
+    ----------
+    axes : OrderedDict
+      The swept parameter names and their values.
+    preboil_sg : ndarray
+      Pre-boil specific gravity.
+    postboil_sg : ndarray
+      Post-boil specific gravity.
+    og : ndarray
+      Starting gravity, including any fermentables added in the
+      primary or later.
+    ibu : ndarray
+      Bitterness of the beer, IBU.
+    fg : ndarray
+      Final gravity.
+    abv : ndarray
+      Alcohol by volume, percent.
+    v_mash : ndarray
+      Total mash water, gal.
+    v_sparge : ndarray
+      Sparge water volume, gal.  Negative values are brew days that
+      cannot be done.
+
+    """
+
+    _results = ('preboil_sg', 'postboil_sg', 'og', 'ibu', 'fg', 'abv',
+                'v_mash', 'v_sparge')
+
+    def __init__(self, axes, **results):
+        self.axes = axes
+        arrays = np.broadcast_arrays(*[results[k] for k in self._results])
+        shape = tuple(len(v) for v in axes.values())
+        for k, v in zip(self._results, arrays):
+            setattr(self, k, np.array(np.broadcast_to(v, shape), float))
+
+    def __repr__(self):
+        return '<SweepResult: {}>'.format(', '.join(
+            '{} ({})'.format(k, len(v)) for k, v in self.axes.items()))
+
+    @property
+    def shape(self):
+        return self.fg.shape
+
+    def table(self):
+        """The results as a flat table, one row per grid point.
+
+        Returns
+        -------
+        table : ndarray
+          Structured array with a column for each swept parameter,
+          followed by the results.
+
+        """
+
+        dtype = ([(k, np.asarray(v).dtype) for k, v in self.axes.items()]
+                 + [(k, 'f8') for k in self._results])
+        table = np.empty(int(np.prod(self.shape)), dtype)
+        grid = np.meshgrid(*self.axes.values(), indexing='ij')
+        for k, v in zip(self.axes.keys(), grid):
+            table[k] = v.ravel()
+
+        for k in self._results:
+            table[k] = getattr(self, k).ravel()
+
+        return table
+
+
+def sweep(ingredients, target_volume, parameter_sets=None, **kwargs):
+    """Evaluate a recipe over a grid of brewing parameters.
+
+    Any `Brew` parameter, and `target_volume`, may be given as an
+    array of values to sweep.  The mash, boil, and fermentation are
+    computed in one vectorized pass over the whole grid.
+
+    For `T_rest` and `T_sacc`, each swept value is a single
+    temperature step.
+
+    Parameters
+    ----------
+    ingredients : Ingredients
+      The recipe.
+    target_volume : float or array-like
+      The target wort volume in the primary, gallons.
+    parameter_sets : string or list of strings, optional
+      Load these parameter sets from the configuration file.
+    **kwargs
+      `Brew` parameters, scalars or array-like.
+
+    Returns
+    -------
+    result : SweepResult
+
+    """
+
+    config = get_config(parameter_sets)
+    config['target_volume'] = target_volume
+    for k, v in kwargs.items():
+        assert k in config, '{} is not parameter ({})'.format(
+            k, ', '.join(config.keys()))
+        config[k] = v
+
+    # separate swept parameters into grid axes
+    axes = OrderedDict()
+    for k in ['target_volume'] + list(kwargs.keys()):
+        v = config[k]
+        if isinstance(v, (list, tuple, np.ndarray)) and not (
+                k in ['T_rest', 'T_sacc'] and k not in kwargs):
+            axes[k] = np.asarray(v)
+
+    p = {}
+    for i, k in enumerate(axes):
+        shape = [1] * len(axes)
+        shape[i] = -1
+        p[k] = axes[k].reshape(shape)
+
+    for k, v in config.items():
+        if k in p:
+            continue
+        elif k in ['T_rest', 'T_sacc']:
+            v = tuple(v) if isinstance(v, (list, tuple)) else (v,)
+        p[k] = v
+
+    # mash temperature steps
+    T_rest = (p['T_rest'],) if 'T_rest' in axes else p['T_rest']
+    T_sacc = (p['T_sacc'],) if 'T_sacc' in axes else p['T_sacc']
+
+    timeline = Timeline(ingredients)
+
+    def volume(time, upto=False):
+        v = timeline.volume(time, upto=upto) + p['target_volume']
+
+        if (time < T.Primary()) or (upto and (time == T.Primary())):
+            v = v + p['kettle_gap']
+
+        if isinstance(time, T.Boil):
+            t = np.minimum(p['boil_time'], time.time)
+            v = v + t / 60 * p['r_boil']
+        elif time.step < T.Boil.step:
+            v = v + p['boil_time'] / 60 * p['r_boil']
+
+        if time < T.Lauter():
+            weight = timeline.grain_weight(time, upto=upto)
+            v = v + p['mlt_gap'] + weight * p['absorption'] / 4
+
+        return v
+
+    def extract(items):
+        # mashed and direct extract
+        direct = sum([f.extract(0.0) for f in items])
+        mashed = sum([f.extract(1.0) for f in items]) - direct
+        return mashed * p['efficiency'] + direct
+
+    # mash
+    extracts = ingredients.filter(Fermentable, Unfermentable)
+    mashed = extracts.filter(T.Mash, T.Vorlauf, T.Sparge, T.Lauter)
+    v_kettle = volume(T.Lauter())
+    preboil_sg = 1 + extract(mashed) / v_kettle / 1000
+
+    # infusion
+    grain_weight = timeline.grain_weight(T.Sparge())
+    steps = ([(t, True) for t in T_rest + T_sacc]
+             + [(170, p['mash_out'])])
+    v_infusion = [p['r_mash'] * grain_weight / 4]
+    for i in range(1, len(steps)):
+        v = infusion_volume(sum(v_infusion) * 4, grain_weight,
+                            steps[i - 1][0], steps[i][0])
+        v_infusion.append(np.where(steps[i][1], v / 4, 0))
+
+    v_mash = sum(v_infusion)
+    v_sparge = volume(T.Sparge()) - v_mash
+
+    # boil
+    v_postboil = volume(T.Primary(), upto=True)
+    ex_postboil = timeline.extract(T.Primary(), p['efficiency'], upto=True)
+    postboil_sg = 1 + ex_postboil / v_postboil / 1000
+
+    hop_stand = np.logical_or(p['hop_stand'],
+                              len(ingredients.hop_stand) > 0)
+    bit = 0
+    for hop in ingredients.hops:
+        if isinstance(hop.timing, (T.FirstWort, T.Mash)):
+            t = p['boil_time'] + 5
+        elif isinstance(hop.timing, T.HopStand):
+            t = 5
+        elif isinstance(hop.timing, T.Boil):
+            t = hop.timing.time + np.where(hop_stand, 5, 0)
+        else:
+            continue
+
+        u = utilization(t, preboil_sg, whole=hop.whole)
+        bit = bit + ibu(u, hop.weight, hop.alpha, v_postboil)
+
+    # ferment
+    v_primary = v_postboil - p['kettle_gap']
+    v_final = volume(T.Final())
+    bit = bit * v_primary / v_final
+
+    ex_preferm = timeline.extract(T.Primary(), p['efficiency'], upto=True)
+    ex_final = timeline.extract(T.Final(), p['efficiency'])
+    ex = v_primary * (postboil_sg - 1) * 1000 + ex_final - ex_preferm
+    og = 1 + ex / v_final / 1000
+
+    grain_sg = 1 + (og - 1) * extract(ingredients.grains) / ex_final
+    unfermentable_sg = 1 + (og - 1) * extract(
+        ingredients.unfermentables) / ex_final
+
+    # if a mixed fermentation, use the highest attenuation
+    fg = np.nan
+    for culture in ingredients.cultures:
+        T_mean = T_sacc[0] if 'T_sacc' in axes else T_sacc
+        fg = np.fmin(fg, final_gravity(grain_sg, T_mean, culture)
+                     + unfermentable_sg - 1)
+
+    return SweepResult(axes, preboil_sg=preboil_sg, postboil_sg=postboil_sg,
+                       og=og, ibu=bit, fg=fg, abv=abv(og, fg),
+                       v_mash=v_mash, v_sparge=v_sparge)
@@ -6,6 +6,8 @@ table --- Simple class for tablular data.
 
 """
 
+from .profiling import profiled
+
 __all__ = [
     'Table',
 ]
@@ -54,8 +56,8 @@ class Table:
     def colformats(self, f):
         self._colformats = f
 
+    @profiled('render')
     def __str__(self):
-        from collections import OrderedDict
         ncols = len(self.data)
 
         formatted_tab = []
@@ -90,6 +92,7 @@ class Table:
         elif self.format == 'yaml':
             import textwrap
             import yaml
+            from .yaml import BrewDumper
 
             tab = {}
             tab['type'] = 'table'
@@ -105,7 +108,8 @@ class Table:
             tab['rows'] = formatted_tab
 
             # hardcoded indent for my brewlog
-            tab = textwrap.indent(yaml.dump([tab]), ' ' * 6)
+            tab = textwrap.indent(yaml.dump([tab], Dumper=BrewDumper),
+                                  ' ' * 6)
         else:
             colsize = []
             _rows = [self.names] + formatted_tab
@@ -0,0 +1,196 @@
+# Licensed under an MIT style license - see LICENSE
+
+"""
+timeline --- Cumulative ingredient totals by timing.
+====================================================
+
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from . import timing as T
+from .ingredients import Fermentable, Grain
+from .profiling import profiled
+
+__all__ = [
+    'Timeline',
+]
+
+
+def _sort_key(timing):
+    """`Timing.sort_key`, `None` is unspecified."""
+    if timing is None:
+        timing = T.Unspecified()
+    return timing.sort_key
+
+
+def _ranks(positions):
+    """Rank of each position, e.g., [4, 1, 7] -> [1, 0, 2]."""
+    ranks = [0] * len(positions)
+    for r, n in enumerate(sorted(range(len(positions)),
+                                 key=positions.__getitem__)):
+        ranks[n] = r
+    return ranks
+
+
+class Timeline:
+    """Ingredient totals indexed by timing.
+
+    Ingredients are sorted by timing, and volume, grain weight, and
+    extract are accumulated along the timeline.  Queries are a binary
+    search and a look up.
+
+    The timeline is a snapshot: it must be rebuilt after the
+    ingredients are changed.
+
+    Parameters
+    ----------
+    ingredients : Ingredients
+      The ingredients to index.
+
+    """
+
+    @profiled('timeline')
+    def __init__(self, ingredients):
+        ingredients = list(ingredients)
+        order = sorted(range(len(ingredients)),
+                       key=lambda n: _sort_key(ingredients[n].timing))
+        items = [ingredients[n] for n in order]
+        self._keys = [_sort_key(i.timing) for i in items]
+        self._volume = [0] + list(accumulate(
+            getattr(i, 'volume', 0) for i in items))
+        self._grain_weight = [0] + list(accumulate(
+            i.weight if isinstance(i, Grain) else 0 for i in items))
+
+        # extract is split into mashed (scaled by efficiency) and
+        # direct parts
+        fermentables = [i for i in items if isinstance(i, Fermentable)]
+        self._ranks = _ranks([n for n, i in zip(order, items)
+                              if isinstance(i, Fermentable)])
+        self._fermentable_keys = [_sort_key(f.timing) for f in fermentables]
+        self._direct = [f.extract(0.0) for f in fermentables]
+        self._mashed = [f.extract(1.0) - d
+                        for f, d in zip(fermentables, self._direct)]
+        self._cumulative_direct = [0] + list(accumulate(self._direct))
+        self._cumulative_mashed = [0] + list(accumulate(self._mashed))
+
+    @classmethod
+    @profiled('timeline')
+    def from_frame(cls, frame):
+        """Build a timeline from an `IngredientFrame` with array operations.
+
+        Parameters
+        ----------
+        frame : IngredientFrame
+          The ingredients to index.
+
+        """
+
+        import numpy as np
+
+        step, sub = frame.sort_key
+        order = np.lexsort((sub, step))
+        frame = frame[order]
+        step, sub = step[order], sub[order]
+
+        def cumulative(x):
+            return [0] + np.cumsum(x).tolist()
+
+        timeline = cls.__new__(cls)
+        timeline._keys = list(zip(step.tolist(), sub.tolist()))
+        timeline._volume = cumulative(frame.volume)
+        timeline._grain_weight = cumulative(
+            np.where(frame.isinstance(Grain), frame.weight, 0))
+
+        fermentable = frame.isinstance(Fermentable)
+        timeline._ranks = _ranks(order[fermentable].tolist())
+        timeline._fermentable_keys = [
+            k for k, f in zip(timeline._keys, fermentable) if f]
+        direct = frame.extract(0.0)[fermentable]
+        mashed = frame.extract(1.0)[fermentable] - direct
+        timeline._direct = direct.tolist()
+        timeline._mashed = mashed.tolist()
+        timeline._cumulative_direct = cumulative(direct)
+        timeline._cumulative_mashed = cumulative(mashed)
+        return timeline
+
+    @staticmethod
+    def _search(keys, time, upto):
+        """Number of items up to (or at) `time`."""
+        k = _sort_key(time)
+        return bisect_left(keys, k) if upto else bisect_right(keys, k)
+
+    def count(self, time, upto=False):
+        """Number of ingredients at `time`.
+
+        Parameters
+        ----------
+        time : Timing
+          Include all additions up to and at `time`.
+        upto : bool, optional
+          Include all additions up to `time`, but not at `time`.
+
+        """
+        return self._search(self._keys, time, upto)
+
+    def volume(self, time, upto=False):
+        """Total volume of ingredient additions at `time`, gallons.
+
+        Parameters
+        ----------
+        time : Timing
+          Include all additions up to and at `time`.
+        upto : bool, optional
+          Include all additions up to `time`, but not at `time`.
+
+        """
+        return self._volume[self._search(self._keys, time, upto)]
+
+    def grain_weight(self, time, upto=False):
+        """Total grain weight at `time`, pounds.
+
+        Parameters
+        ----------
+        time : Timing
+          Include all additions up to and at `time`.
+        upto : bool, optional
+          Include all additions up to `time`, but not at `time`.
+
+        """
+        return self._grain_weight[self._search(self._keys, time, upto)]
+
+    def extract(self, time, efficiency, upto=False):
+        """Total extract of fermentables at `time`.
+
+        Parameters
+        ----------
+        time : Timing
+          Include all additions up to and at `time`.
+        efficiency : float
+          Mash efficiency.
+        upto : bool, optional
+          Include all additions up to `time`, but not at `time`.
+
+        """
+        n = self._search(self._fermentable_keys, time, upto)
+        return (self._cumulative_mashed[n] * efficiency
+                + self._cumulative_direct[n])
+
+    def extracts(self, time, efficiency, upto=False):
+        """Extract of each fermentable at `time`, in ingredient order.
+
+        Parameters
+        ----------
+        time : Timing
+          Include all additions up to and at `time`.
+        efficiency : float
+          Mash efficiency.
+        upto : bool, optional
+          Include all additions up to `time`, but not at `time`.
+
+        """
+        n = self._search(self._fermentable_keys, time, upto)
+        extracts = [None] * len(self._ranks)
+        for r, m, d in zip(self._ranks[:n], self._mashed, self._direct):
+            extracts[r] = m * efficiency + d
+        return [x for x in extracts if x is not None]
@@ -4,6 +4,9 @@
 timing --- Timing for additions.
 ================================
 
+Timings are immutable and interned: `Boil(60)` always returns the
+same object.  They are ordered and hashed by `Timing.sort_key`.
+
 """
 
 from abc import ABC
@@ -24,9 +27,94 @@ __all__ = [
 ]
 
 
+# interned timings, keyed by (class, time)
+_interned = {}
+
+
 class Timing(ABC):
-    def __init__(self):
-        self.time = 'N/A'
+    """Timing of an addition.
+
+    Attributes
+    ----------
+    sort_key : tuple
+      ``(step, sub-time)``, the total order of timings.  The sub-time
+      is the negative of the boil time (boil additions are ordered by
+      minutes remaining, descending), the time for hop stands and the
+      secondary (ascending), and 0 for all other timings.
+
+    """
+
+    __slots__ = ('time', 'sort_key')
+
+    def __new__(cls, *args):
+        time = cls._time(*args)
+        try:
+            return _interned[cls, time]
+        except KeyError:
+            pass
+
+        self = super().__new__(cls)
+        object.__setattr__(self, 'time', time)
+        object.__setattr__(self, 'sort_key', (cls.step, cls._sub(time)))
+        _interned[cls, time] = self
+        return self
+
+    @staticmethod
+    def _time():
+        return 'N/A'
+
+    @staticmethod
+    def _sub(time):
+        return 0
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Timing objects are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('Timing objects are immutable')
+
+    def __reduce__(self):
+        return (type(self), ())
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __hash__(self):
+        return hash(self.sort_key)
+
+    def to_dict(self):
+        """Flat dictionary of the timing, see `Timing.from_dict`."""
+        if self.time == 'N/A':
+            return {'timing': type(self).__name__}
+        return {'timing': type(self).__name__, 'time': self.time}
+
+    @staticmethod
+    def from_dict(d):
+        """Timing from a dictionary.
+
+        Parameters
+        ----------
+        d : dict
+          'timing', the class name, and 'time', if needed.  Other keys
+          are ignored.
+
+        Returns
+        -------
+        timing : Timing or None
+          `None` if 'timing' is `None`.
+
+        """
+        name = d['timing']
+        if name is None:
+            return None
+        cls = globals()[name]
+        if not (isinstance(cls, type) and issubclass(cls, Timing)):
+            raise ValueError('Not a timing: {}'.format(name))
+        time = d.get('time')
+        return cls() if time is None else cls(time)
 
     def __repr__(self):
         return "<Timing: {}>".format(self.name)
@@ -35,34 +123,54 @@ class Timing(ABC):
         return self.name
 
     def __lt__(self, other):
-        return self.step < other.step
+        try:
+            return self.sort_key < other.sort_key
+        except AttributeError:
+            return NotImplemented
 
     def __le__(self, other):
-        return (self < other) or (self == other)
+        try:
+            return self.sort_key <= other.sort_key
+        except AttributeError:
+            return NotImplemented
 
     def __eq__(self, other):
-        return self.step == other.step
+        try:
+            return self.sort_key == other.sort_key
+        except AttributeError:
+            return NotImplemented
 
     def __ne__(self, other):
-        return not (self == other)
+        try:
+            return self.sort_key != other.sort_key
+        except AttributeError:
+            return NotImplemented
 
     def __gt__(self, other):
-        return self.step > other.step
+        try:
+            return self.sort_key > other.sort_key
+        except AttributeError:
+            return NotImplemented
 
     def __ge__(self, other):
-        return (self > other) or (self == other)
+        try:
+            return self.sort_key >= other.sort_key
+        except AttributeError:
+            return NotImplemented
 
 
 class Mash(Timing):
     """Mash additions."""
     name = 'Mash'
     step = 1
+    __slots__ = ()
 
 
 class Vorlauf(Timing):
     """Vorlauf additions, typically dark malts."""
     name = 'Vorlauf'
     step = 2
+    __slots__ = ()
 
 
 class Sparge(Timing):
@@ -74,6 +182,7 @@ class Sparge(Timing):
 
     name = 'Sparge'
     step = 3
+    __slots__ = ()
 
 
 class Lauter(Timing):
@@ -85,6 +194,7 @@ class Lauter(Timing):
 
     name = 'Lauter'
     step = 4
+    __slots__ = ()
 
 
 class FirstWort(Timing):
@@ -99,10 +209,15 @@ class FirstWort(Timing):
 
     name = 'First wort'
     step = 5
+    __slots__ = ()
 
-    def __init__(self, time):
+    @staticmethod
+    def _time(time):
         assert isinstance(time, (float, int))
-        self.time = int(time)
+        return int(time)
+
+    def __reduce__(self):
+        return (type(self), (self.time,))
 
     def __str__(self):
         return "{}, {}-minute boil".format(self.name, self.time)
@@ -120,31 +235,22 @@ class Boil(Timing):
 
     name = 'Boil'
     step = 6
+    __slots__ = ()
 
-    def __init__(self, time):
+    @staticmethod
+    def _time(time):
         assert isinstance(time, (float, int))
-        self.time = int(time)
+        return int(time)
 
-    def __str__(self):
-        return "{} for {} minutes".format(self.name, self.time)
+    @staticmethod
+    def _sub(time):
+        return -time
 
-    def __lt__(self, other):
-        if isinstance(other, Boil):
-            return self.time > other.time
-        else:
-            return self.step < other.step
-
-    def __eq__(self, other):
-        if isinstance(other, Boil):
-            return self.time == other.time
-        else:
-            return self.step == other.step
+    def __reduce__(self):
+        return (type(self), (self.time,))
 
-    def __gt__(self, other):
-        if isinstance(other, Boil):
-            return self.time < other.time
-        else:
-            return self.step > other.step
+    def __str__(self):
+        return "{} for {} minutes".format(self.name, self.time)
 
 
 class HopStand(Timing):
@@ -159,37 +265,29 @@ class HopStand(Timing):
 
     name = 'Hop stand'
     step = 7
+    __slots__ = ()
 
-    def __init__(self, time):
+    @staticmethod
+    def _time(time):
         assert isinstance(time, (float, int))
-        self.time = time
-
-    def __str__(self):
-        return "{} minute {}".format(self.time, self.name)
+        return time
 
-    def __lt__(self, other):
-        if isinstance(other, HopStand):
-            return self.time < other.time
-        else:
-            return self.step < other.step
+    @staticmethod
+    def _sub(time):
+        return time
 
-    def __eq__(self, other):
-        if isinstance(other, HopStand):
-            return self.time == other.time
-        else:
-            return self.step == other.step
+    def __reduce__(self):
+        return (type(self), (self.time,))
 
-    def __gt__(self, other):
-        if isinstance(other, HopStand):
-            return self.time < other.time
-        else:
-            return self.step < other.step
+    def __str__(self):
+        return "{} minute {}".format(self.time, self.name)
 
 
 class Primary(Timing):
     """Additions in the primary."""
     name = 'Primary'
     step = 8
+    __slots__ = ()
 
 
 class Secondary(Timing):
@@ -204,13 +302,22 @@ class Secondary(Timing):
 
     name = 'Secondary'
     step = 9
+    __slots__ = ()
 
-    def __init__(self, time=None):
+    @staticmethod
+    def _time(time=None):
         if time is None:
-            self.time = 0
+            return 0
         else:
             assert isinstance(time, (float, int))
-            self.time = int(time)
+            return int(time)
+
+    @staticmethod
+    def _sub(time):
+        return time
+
+    def __reduce__(self):
+        return (type(self), (self.time,))
 
     def __str__(self):
         if self.time == 0:
@@ -218,38 +325,23 @@ class Secondary(Timing):
         else:
             return "{} days in the {}".format(self.time, self.name)
 
-    def __lt__(self, other):
-        if isinstance(other, Secondary):
-            return self.time < other.time
-        else:
-            return self.step < other.step
-
-    def __eq__(self, other):
-        if isinstance(other, Secondary):
-            return self.time == other.time
-        else:
-            return self.step == other.step
-
-    def __gt__(self, other):
-        if isinstance(other, Secondary):
-            return self.time < other.time
-        else:
-            return self.step < other.step
-
 
 class Packaging(Timing):
     """Additions at packaging."""
     name = 'Packaging'
     step = 10
+    __slots__ = ()
 
 
 class Final(Timing):
     """The beer is ready!"""
     name = 'Final'
     step = 11
+    __slots__ = ()
 
 
 class Unspecified(Timing):
     """No specific time specified."""
     name = ''
     step = -1
+    __slots__ = ()
@@ -4,6 +4,10 @@
 util --- Small brewing functions.
 =================================
 
+All formulas accept NumPy arrays, broadcast against each other, and
+return arrays.  Scalar inputs return scalars.  NumPy is only imported
+when needed for arrays.
+
 """
 
 __all__ = [
@@ -26,7 +30,19 @@ __all__ = [
     'utilization',
 ]
 
-from .bbtn import calories_alcohol, calories_extract, calories_protein
+from math import exp
+from .bbtn import abw, calories_alcohol, calories_extract, calories_protein
+
+
+def _scalar(x):
+    """Return Python floats for scalar results, arrays otherwise."""
+    import numpy as np
+
+    if isinstance(x, np.ndarray):
+        return x.item() if x.ndim == 0 else x
+    elif isinstance(x, np.generic):
+        return x.item()
+    return x
 
 
 def abv(og, fg):
@@ -36,20 +52,30 @@ def abv(og, fg):
 
     Good to ±0.2%.
 
+    `og` and `fg` may be floats or arrays.
+
     """
 
     return 132.6 * (og - fg)
 
 
 def calories(og, fg):
-    """Calories per 12 oz."""
+    """Calories per 12 oz.
+
+    `og` and `fg` may be floats or arrays.
+
+    """
     return (calories_alcohol(og, fg)
             + calories_extract(og, fg)
             + calories_protein(og, fg))
 
 
 def carbohydrates(og, fg):
-    """Estimated carbohydrates per 12 oz."""
+    """Estimated carbohydrates per 12 oz.
+
+    `og` and `fg` may be floats or arrays.
+
+    """
     return calories_extract(og, fg) / 3.8
 
 
@@ -63,30 +89,28 @@ def final_gravity(sg, T_sacc, culture):
 
     Parameters
     ----------
-    sg : float
+    sg : float or ndarray
       Starting gravity, without any 100% fermentables.
-    T_sacc : int or array-like
-      Saccharification temperature(s).  For a list, the average will be used.
-    culture : CultureBank or array-like
+    T_sacc : int, list, tuple, or ndarray
+      Saccharification temperature(s).  For a list or tuple, the
+      average will be used.  Arrays are broadcast against `sg`.
+    culture : Culture or tuple
       The culture to use for fermentation, `(name, attenuation)`, or
-      `(name, min, max attenuation)`.
+      `(name, min, max attenuation)`.  Attenuations may be arrays.
 
     Returns
     -------
-    fg : float
+    fg : float or ndarray
 
     """
 
-    from collections import Iterable
-    from ..ingredients import Culture
-
-    assert isinstance(culture, (Culture, Iterable))
-    if isinstance(culture, Culture):
+    if hasattr(culture, 'attenuation'):
         aa = culture.attenuation
     else:
+        assert isinstance(culture, (list, tuple)), 'culture'
         aa = culture[1:]
 
-    if isinstance(T_sacc, Iterable):
+    if isinstance(T_sacc, (list, tuple)):
         T = sum(T_sacc) / len(T_sacc)
     else:
         T = T_sacc
@@ -104,9 +128,9 @@ def hydrometer_correct(sg, T):
 
     Parmeters
     ---------
-    sg : float
+    sg : float or ndarray
       Specific gravity.
-    T : float
+    T : float or ndarray
       Temperature, °F.
 
     Notes
@@ -122,7 +146,11 @@ def hydrometer_correct(sg, T):
 
 
 def ibu(utilization, weight, alpha, volume):
-    """Utilization and alpha in percent, weight in oz, volume in gallons."""
+    """Utilization and alpha in percent, weight in oz, volume in gallons.
+
+    All parameters may be floats or arrays.
+
+    """
     return 0.746 * utilization * weight * alpha / volume
 
 
@@ -131,15 +159,15 @@ def infusion_volume(volume, weight, T, T_target, T_water=200.):
 
     Parameters
     ----------
-    volume : float
+    volume : float or ndarray
       Present water volume. [qt]
-    weight : float
+    weight : float or ndarray
       Grain weight. [lb]
-    T : float
+    T : float or ndarray
       Present mash temperature. [F]
-    T_target : float
+    T_target : float or ndarray
       Target temperature. [F]
-    T_water : float, optional
+    T_water : float or ndarray, optional
       Infusion water temperature. [F]
 
     """
@@ -151,12 +179,12 @@ def priming_sugar(T, r, v, fermentable='table sugar'):
 
     Parameters
     ----------
-    T : float
+    T : float or ndarray
       Fermentation temperature in Fahrenheit.
-    r : float
+    r : float or ndarray
       Ratio of CO2 volume at STP to beer volume (i.e., volumes of
       dissolved CO2).
-    v : float
+    v : float or ndarray
       Volume of beer, gallons.
     fermentable : string
       Type of fermentable: corn sugar, table sugar, dry malt extract,
@@ -196,11 +224,11 @@ def refractometer_correct(sg0, sg_r, wcf=1.0):
 
     Parameters
     ----------
-    sg0 : float
+    sg0 : float or ndarray
       Starting specific gravity.
-    sg_m : float
+    sg_m : float or ndarray
       Measured (apparent) specific gravity from refractometer.
-    wcf : float, optional
+    wcf : float or ndarray, optional
       Wort correction factor.
 
     """
@@ -212,7 +240,7 @@ def sg2brix(sg):
 
     Parmeters
     ---------
-    sg : float
+    sg : float or ndarray
       Specific gravity.
 
     Notes
@@ -228,15 +256,15 @@ def strike_water(r, T_grain, T_target):
 
     Parameters
     ----------
-    r : float
+    r : float or ndarray
       Ratio of water volume to grain weight. [qt/lb]
-    T_grain : float
+    T_grain : float or ndarray
       Temperature of grain. [F]
-    T_target : float
+    T_target : float or ndarray
       Target temperature. [F]
 
     """
-    return 0.2 / r * (float(T_target) - T_grain) + T_target
+    return 0.2 / r * (T_target - T_grain) + T_target
 
 
 def utilization(t, sg, whole=False):
@@ -248,17 +276,29 @@ def utilization(t, sg, whole=False):
 
     Parameters
     ----------
-    t : float
+    t : float or ndarray
       Time in the boil. [min]
-    sg : float
+    sg : float or ndarray
       Specific gravity of the boil.
-    whole : bool
+    whole : bool or ndarray
       Set to `True` if using whole hops.  `False` assumes pellets.
 
+    Returns
+    -------
+    u : float or ndarray
+      A float for scalar inputs, otherwise an array broadcast from
+      `t`, `sg`, and `whole`.
+
     """
 
-    from math import exp
+    if all(isinstance(x, (float, int)) for x in (t, sg, whole)):
+        # scalar fast path, avoids importing numpy
+        u = 1.65 * 0.000125**(sg - 1) * (1 - exp(-0.04 * t)) / 4.15
+        u *= 0.85 if whole else 1.0
+        return u * 100
+
+    import numpy as np
 
-    u = 1.65 * 0.000125**(sg - 1) * (1 - exp(-0.04 * t)) / 4.15
-    u *= 0.85 if whole else 1.0
-    return u * 100
+    u = 1.65 * 0.000125**(sg - 1) * (1 - np.exp(-0.04 * t)) / 4.15
+    u = u * np.where(whole, 0.85, 1.0)
+    return _scalar(u * 100)
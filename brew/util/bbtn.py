@@ -7,6 +7,9 @@ Alcohol and extract calculations from Hall (1995).
 
 Hall, Brew by the Numbers, Zymergy, Summer 1995.
 
+All formulas accept NumPy arrays, broadcast against each other, and
+return arrays.  Scalar inputs return scalars.
+
 """
 
 __all__ = [
@@ -16,7 +19,7 @@ __all__ = [
     'calories_extract',
     'calories_protein',
     'plato2sg',
-    'real_attenutation',
+    'real_attenuation',
     'real_extract',
     'sg2plato'
 ]
@@ -78,7 +81,7 @@ def plato2sg(E):
 
     Parmeters
     ---------
-    E : float
+    E : float or ndarray
       Extract in degrees plato.
 
     Notes
@@ -121,7 +124,7 @@ def sg2plato(sg):
 
     Parmeters
     ---------
-    sg : float
+    sg : float or ndarray
       Specific gravity.
 
     Notes
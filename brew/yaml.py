@@ -1,15 +1,103 @@
 # Licensed under an MIT style license - see LICENSE
-"""brewlog class definitions for pyyaml"""
+"""
+yaml --- Brewlog tags for PyYAML.
+=================================
+
+Ingredients, timings, and gravity measurements are registered with
+PyYAML's default `Loader` and `Dumper`, and with `BrewLoader` and
+`BrewDumper`, which use libyaml when it is available.  Use the latter
+through `load_brewlog` and `dump_brewlog`, or read a long brewlog one
+batch at a time with `iter_brewlog`.
+
+"""
+from collections import namedtuple
 import yaml
+from yaml.composer import Composer
+from yaml.events import (DocumentEndEvent, SequenceEndEvent,
+                         SequenceStartEvent, StreamEndEvent)
+from yaml.nodes import MappingNode, ScalarNode
 from . import ingredients
 from . import timing
+from .configuration import _tuples
+from .util import abv, hydrometer_correct, refractometer_correct
+
+try:
+    from yaml import CSafeLoader as _Loader, CDumper as _Dumper
+except ImportError:  # PyYAML without libyaml
+    from yaml import SafeLoader as _Loader, Dumper as _Dumper
+
+__all__ = [
+    'BrewLoader',
+    'BrewDumper',
+    'load_brewlog',
+    'dump_brewlog',
+    'Batch',
+    'iter_brewlog',
+    'batch_recipe',
+]
+
+
+class BrewLoader(_Loader):
+    """Safe loader for the brew tags, libyaml based when available."""
+
+
+class BrewDumper(_Dumper):
+    """Dumper for the brew tags, libyaml based when available."""
+
+
+def add_representer(cls, representer):
+    """Register `representer` with the default and brew dumpers."""
+    yaml.add_representer(cls, representer)
+    BrewDumper.add_representer(cls, representer)
+
+
+def add_constructor(tag, constructor):
+    """Register `constructor` with the default and brew loaders."""
+    yaml.add_constructor(tag, constructor)
+    BrewLoader.add_constructor(tag, constructor)
+
+
+def load_brewlog(stream):
+    """Load all documents of a brewlog.
+
+    Parameters
+    ----------
+    stream : string or file
+      The YAML stream.
+
+    Returns
+    -------
+    documents : list
+
+    """
+    return list(yaml.load_all(stream, Loader=BrewLoader))
+
+
+def dump_brewlog(documents, stream=None, **kwargs):
+    """Dump documents as a brewlog.
+
+    Parameters
+    ----------
+    documents : list
+      The documents.
+    stream : file, optional
+      Write to this file, otherwise return a string.
+    **kwargs
+      Passed on to `yaml.dump_all`.
+
+    """
+    return yaml.dump_all(documents, stream, Dumper=BrewDumper, **kwargs)
 
 ########################################################################
 
 
 def culture_representer(dumper, item):
+    if isinstance(item.culture, ingredients.CultureBank):
+        culture = item.culture.name
+    else:
+        culture = list(item.culture)
     data = {
-        'culture': item.culture.name,
+        'culture': culture,
         'quantity': item.quantity,
         'timing': item.timing,
         'desc': item.desc,
@@ -18,15 +106,19 @@ def culture_representer(dumper, item):
 
 
 def culture_constructor(loader, node):
-    data = loader.construct_mapping(node)
-    culture = getattr(ingredients.CultureBank, data.pop('culture'))
+    data = loader.construct_mapping(node, deep=True)
+    culture = data.pop('culture')
+    if isinstance(culture, list):
+        culture = tuple(culture)
+    else:
+        culture = getattr(ingredients.CultureBank, culture)
     if 'name' in data:
         del data['name']
     return ingredients.Culture(culture, **data)
 
 
-yaml.add_representer(ingredients.Culture, culture_representer)
-yaml.add_constructor('!Culture', culture_constructor)
+add_representer(ingredients.Culture, culture_representer)
+add_constructor('!Culture', culture_constructor)
 
 ########################################################################
 
@@ -40,8 +132,8 @@ def ppg_constructor(loader, node):
     return getattr(ingredients.PPG, name)
 
 
-yaml.add_representer(ingredients.PPG, ppg_representer)
-yaml.add_constructor('!PPG', ppg_constructor)
+add_representer(ingredients.PPG, ppg_representer)
+add_constructor('!PPG', ppg_constructor)
 
 ########################################################################
 
@@ -69,8 +161,8 @@ def ingredient_constructor(cls):
 
 for name in ['Ingredient', 'Spice', 'Other', 'Priming']:
     cls = getattr(ingredients, name)
-    yaml.add_representer(cls, ingredient_representer('!' + name))
-    yaml.add_constructor('!' + name, ingredient_constructor(cls))
+    add_representer(cls, ingredient_representer('!' + name))
+    add_constructor('!' + name, ingredient_constructor(cls))
 
 ########################################################################
 
@@ -99,8 +191,8 @@ def fermentable_constructor(cls):
 
 for name in ['Fermentable', 'Grain', 'Sugar', 'Unfermentable']:
     cls = getattr(ingredients, name)
-    yaml.add_representer(cls, fermentable_representer('!' + name))
-    yaml.add_constructor('!' + name, fermentable_constructor(cls))
+    add_representer(cls, fermentable_representer('!' + name))
+    add_constructor('!' + name, fermentable_constructor(cls))
 
 ########################################################################
 
@@ -109,11 +201,11 @@ def wort_representer(dumper, item):
     data = {
         'name': item.name,
         'sg': item.sg,
-        'volume': item.weight,
+        'volume': item.volume,
         'timing': item.timing,
         'desc': item.desc,
     }
-    return dumper.represent_mapping(name, data)
+    return dumper.represent_mapping('!Wort', data)
 
 
 def wort_constructor(loader, node):
@@ -123,8 +215,8 @@ def wort_constructor(loader, node):
     return ingredients.Wort(sg, volume, **data)
 
 
-yaml.add_representer(ingredients.Wort, wort_representer)
-yaml.add_constructor('!Wort', wort_constructor)
+add_representer(ingredients.Wort, wort_representer)
+add_constructor('!Wort', wort_constructor)
 
 ########################################################################
 
@@ -138,7 +230,7 @@ def fruit_representer(dumper, item):
         'density': item.density,
         'desc': item.desc,
     }
-    return dumper.represent_mapping(name, data)
+    return dumper.represent_mapping('!Fruit', data)
 
 
 def fruit_constructor(loader, node):
@@ -149,8 +241,8 @@ def fruit_constructor(loader, node):
     return ingredients.Fruit(name, sg, weight, **data)
 
 
-yaml.add_representer(ingredients.Fruit, fruit_representer)
-yaml.add_constructor('!Fruit', fruit_constructor)
+add_representer(ingredients.Fruit, fruit_representer)
+add_constructor('!Fruit', fruit_constructor)
 
 ########################################################################
 
@@ -171,8 +263,8 @@ def water_constructor(loader, node):
     return ingredients.Water(name, **data)
 
 
-yaml.add_representer(ingredients.Water, water_representer)
-yaml.add_constructor('!Water', water_constructor)
+add_representer(ingredients.Water, water_representer)
+add_constructor('!Water', water_constructor)
 
 ########################################################################
 
@@ -180,8 +272,9 @@ yaml.add_constructor('!Water', water_constructor)
 def water_treatment_representer(dumper, item):
     data = {
         'name': item.name,
-        'quantity': item.volume,
-        'timing': item.timing
+        'quantity': item.quantity,
+        'timing': item.timing,
+        'desc': item.desc,
     }
     return dumper.represent_mapping('!WaterTreatment', data)
 
@@ -192,8 +285,8 @@ def water_treatment_constructor(loader, node):
     return ingredients.WaterTreatment(name, **data)
 
 
-yaml.add_representer(ingredients.WaterTreatment, water_treatment_representer)
-yaml.add_constructor('!WaterTreatment', water_treatment_constructor)
+add_representer(ingredients.WaterTreatment, water_treatment_representer)
+add_constructor('!WaterTreatment', water_treatment_constructor)
 
 ########################################################################
 
@@ -209,7 +302,7 @@ def timing_representer(name):
 
 def timing_constructor(cls):
     def con(loader, node):
-        if node.value is '':
+        if node.value == '':
             return cls()
         else:
             return cls(float(node.value))
@@ -220,8 +313,8 @@ for name in ['Mash', 'Vorlauf', 'Sparge', 'Lauter', 'FirstWort', 'Boil',
              'HopStand', 'Primary', 'Secondary', 'Packaging', 'Final',
              'Unspecified']:
     cls = getattr(timing, name)
-    yaml.add_representer(cls, timing_representer('!' + name))
-    yaml.add_constructor('!' + name, timing_constructor(cls))
+    add_representer(cls, timing_representer('!' + name))
+    add_constructor('!' + name, timing_constructor(cls))
 
 ########################################################################
 
@@ -247,8 +340,8 @@ def hop_constructor(loader, node):
     return ingredients.Hop(name, alpha, weight, **data)
 
 
-yaml.add_representer(ingredients.Hop, hop_representer)
-yaml.add_constructor('!Hop', hop_constructor)
+add_representer(ingredients.Hop, hop_representer)
+add_constructor('!Hop', hop_constructor)
 
 ########################################################################
 
@@ -273,7 +366,6 @@ class GravityMeasurement(yaml.YAMLObject):
         return '{:.0f}'.format((og - float(self.cor_grav(og))) / (og - 1) * 100)
 
     def abv(self, og):
-        from .util import abv
         return '{:.1f}'.format(abv(og, float(self.cor_grav(og))))
 
 
@@ -281,7 +373,6 @@ class Hydrometer(GravityMeasurement):
     yaml_tag = '!Hydrometer'
 
     def cor_grav(self, og):
-        from .util import hydrometer_correct
         return '{:.3f}'.format(hydrometer_correct(self.gravity, self.T))
 
 ########################################################################
@@ -291,7 +382,169 @@ class Refractometer(GravityMeasurement):
     yaml_tag = '!Refractometer'
 
     def cor_grav(self, og):
-        from .util import refractometer_correct
         if og is None:
             return '{:.3f}'.format(self.gravity)
         return '{:.3f}'.format(refractometer_correct(og, self.gravity))
+
+
+for cls in (GravityMeasurement, Hydrometer, Refractometer):
+    BrewLoader.add_constructor(cls.yaml_tag, cls.from_yaml)
+    BrewDumper.add_representer(cls, cls.to_yaml)
+
+########################################################################
+
+Batch = namedtuple('Batch', ['data', 'ingredients', 'measurements'])
+Batch.__doc__ = """One batch of a brewlog.
+
+Parameters
+----------
+data : dict
+  The batch, as loaded.
+ingredients : Ingredients
+  All ingredients in the batch, in document order.
+measurements : list of GravityMeasurement
+  All gravity measurements in the batch, in document order.
+
+"""
+
+
+class _StreamLoader(BrewLoader):
+    """`BrewLoader` that composes one node at a time."""
+
+    # libyaml composes whole documents, PyYAML's composer can be driven
+    # event by event
+    compose_node = Composer.compose_node
+    compose_scalar_node = Composer.compose_scalar_node
+    compose_sequence_node = Composer.compose_sequence_node
+    compose_mapping_node = Composer.compose_mapping_node
+
+    def __init__(self, stream):
+        BrewLoader.__init__(self, stream)
+        self.anchors = {}
+
+    def batch_nodes(self):
+        """Batch nodes: mapping documents, or items of sequence documents.
+
+        Other documents and items are skipped.  Anchors are valid
+        until the end of their document.
+
+        """
+        self.get_event()
+        while not self.check_event(StreamEndEvent):
+            self.get_event()
+            if self.check_event(SequenceStartEvent):
+                self.get_event()
+                while not self.check_event(SequenceEndEvent):
+                    node = self.compose_node(None, None)
+                    if isinstance(node, MappingNode):
+                        yield node
+                self.get_event()
+            else:
+                node = self.compose_node(None, None)
+                if isinstance(node, MappingNode):
+                    yield node
+
+            assert self.check_event(DocumentEndEvent)
+            self.get_event()
+            self.anchors = {}
+        self.get_event()
+
+    def header(self, node):
+        """Keys with untagged scalar values, without constructing the rest."""
+        header = {}
+        for key, value in node.value:
+            if (isinstance(key, ScalarNode) and isinstance(value, ScalarNode)
+                    and value.tag.startswith('tag:yaml.org,2002:')):
+                header[self.construct_object(key)] = self.construct_object(
+                    value)
+        self.constructed_objects = {}
+        return header
+
+
+def _collect(data, items, measurements):
+    """Find ingredients and measurements in loaded data."""
+    if isinstance(data, ingredients.Ingredient):
+        items.append(data)
+    elif isinstance(data, GravityMeasurement):
+        measurements.append(data)
+    elif isinstance(data, dict):
+        for v in data.values():
+            _collect(v, items, measurements)
+    elif isinstance(data, list):
+        for v in data:
+            _collect(v, items, measurements)
+
+
+def iter_brewlog(stream, predicate=None):
+    """Read a brewlog one batch at a time.
+
+    A batch is a mapping document, or a mapping in a document that is a
+    sequence.  Only one batch is loaded at a time.
+
+    Parameters
+    ----------
+    stream : string or file
+      The YAML stream.
+    predicate : function, optional
+      Called with a dictionary of the batch's untagged scalar items,
+      e.g., dates, names, and numbers.  The batch is skipped, without
+      constructing its ingredients, unless the return value is true.
+
+    Yields
+    ------
+    batch : Batch
+
+    """
+    for start, batch in _iter_batches(stream, predicate):
+        if batch is not None:
+            yield batch
+
+
+def _iter_batches(stream, predicate=None):
+    """`iter_brewlog`, with the position of each batch.
+
+    Yields
+    ------
+    start : int
+      Index of the first character of the batch in the stream.
+    batch : Batch or None
+      `None` when the batch is skipped by `predicate`.
+
+    """
+    loader = _StreamLoader(stream)
+    try:
+        for node in loader.batch_nodes():
+            start = node.start_mark.index
+            if predicate is not None and not predicate(loader.header(node)):
+                yield start, None
+                continue
+
+            data = loader.construct_document(node)
+            items = []
+            measurements = []
+            _collect(data, items, measurements)
+            yield start, Batch(data, ingredients.Ingredients(items),
+                               measurements)
+    finally:
+        loader.dispose()
+
+
+def batch_recipe(batch):
+    """Target volume and `Brew` configuration of a batch.
+
+    Parameters
+    ----------
+    batch : Batch
+      The batch, with optional 'target_volume' and 'config' items.
+
+    Returns
+    -------
+    recipe : tuple or None
+      `(target_volume, config)`, or `None` when the batch has no
+      target volume.  Lists in `config` are returned as tuples.
+
+    """
+    target_volume = batch.data.get('target_volume')
+    if target_volume is None:
+        return None
+    return target_volume, _tuples(batch.data.get('config') or {})
@@ -5,4 +5,5 @@ setup(
     name="Brew",
     version="2.0-beta",
     packages=find_packages(),
+    install_requires=["numpy"],
 )
@@ -0,0 +1,81 @@
+# Licensed under an MIT style license - see LICENSE
+import numpy as np
+import pytest
+import brew as b
+from brew.archive import Archive, ArchiveWriter, write_archive
+from brew.batch import evaluate
+from brew.json import dump_recipes, load_recipes
+
+
+def recipes():
+    return [
+        (b.Ingredients([
+          b.Grain(b.PPG.AmericanTwoRow, 8),
+          b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
+          b.Hop('Citra', 12.0, 1.0, b.HopStand(20), whole=True, beta=4.0),
+          b.Culture(b.CultureBank.CaliforniaAle)]),
+         5.5, {'efficiency': 0.72, 'r_mash': 1.5, 'T_rest': [122]}),
+        (b.Ingredients([
+          b.Grain(b.PPG.GermanPilsner, 9),
+          b.Sugar(b.PPG.TableSugar, 1.0, b.Boil(10)),
+          b.Hop('Saaz', 3.5, 2.0, b.FirstWort(60)),
+          b.Spice('Coriander', '1 tsp', b.Boil(5)),
+          b.Culture(('House saison', 80, 90), desc='Our saison')]),
+         5.0, {'boil_time': 90, 'r_mash': 1.5}),
+    ]
+
+
+class TestArchive:
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / 'recipes.brew')
+        results = evaluate(recipes(), workers=1)
+        write_archive(path, recipes(), results)
+
+        with Archive(path) as archive:
+            assert len(archive) == 2
+            assert np.all(archive.results == results)
+            assert not archive.records.flags.writeable
+            for i, (ingredients, target_volume, config) in enumerate(
+                    recipes()):
+                assert ([repr(x) for x in archive.ingredients(i)]
+                        == [repr(x) for x in ingredients])
+                assert archive.recipes[i]['target_volume'] == target_volume
+                # lists are tuples, as from brew.json
+                for k, v in config.items():
+                    assert archive.config(i)[k] == (
+                        tuple(v) if isinstance(v, list) else v)
+                loaded = load_recipes(dump_recipes([(
+                    ingredients, target_volume, archive.config(i))]))
+                assert loaded[0][2] == archive.config(i)
+
+            result = archive.brew(1).compute_ferment()
+            assert result.beer.abv == pytest.approx(results['abv'][1])
+
+    def test_frame(self, tmp_path):
+        path = str(tmp_path / 'recipes.brew')
+        write_archive(path, recipes())
+        archive = Archive(path)
+        frame = archive.frame(1)
+        assert np.shares_memory(frame.weight, archive.records)
+        assert list(frame.name[:2]) == ['German pilsner', 'Table sugar']
+        assert np.isnan(archive.results['og']).all()
+
+    def test_writer(self, tmp_path):
+        path = str(tmp_path / 'recipes.brew')
+        brew = b.Brew(recipes()[0][0], 5.5, efficiency=0.7)
+        with ArchiveWriter(path, chunksize=1) as writer:
+            writer.add_brew(brew, brew.compute_ferment())
+            writer.add_brew(brew)
+            with pytest.raises(ValueError):
+                writer.add([], 5, {'not_a_parameter': 1})
+
+        archive = Archive(path)
+        assert archive.brew(0).config == brew.config
+        assert archive.results['abv'][0] == pytest.approx(
+            brew.compute_ferment().beer.abv)
+        assert np.isnan(archive.results['abv'][1])
+
+        with open(path, 'r+b') as f:
+            f.write(b'NOTBREW!')
+        with pytest.raises(ValueError):
+            Archive(path)
@@ -0,0 +1,31 @@
+# Licensed under an MIT style license - see LICENSE
+import numpy as np
+import brew as b
+from brew import batch
+
+
+def recipes(n):
+    for i in range(n):
+        ingredients = b.Ingredients([
+            b.Grain(b.PPG.AmericanTwoRow, 8 + i),
+            b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
+            b.Culture(b.CultureBank.CaliforniaAle)
+        ])
+        yield ingredients, 5.0, {'efficiency': 0.7, 'r_mash': 1.5}
+
+
+class TestBatch:
+    def test_evaluate(self):
+        serial = batch.evaluate(recipes(5), workers=1)
+        parallel = batch.evaluate(recipes(5), workers=2, chunksize=2)
+        assert serial.dtype == batch.summary_dtype
+        for name in batch.summary_dtype.names:
+            assert np.allclose(serial[name], parallel[name])
+
+        # more grain, more gravity
+        assert all(np.diff(serial['og']) > 0)
+
+        ingredients, target_volume, config = next(recipes(1))
+        beer = b.Brew(ingredients, target_volume, **config).compute_ferment()
+        assert np.isclose(serial['fg'][0], beer.beer.fg)
+        assert np.isclose(serial['ibu'][0], beer.bitterness)
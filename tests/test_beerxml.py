@@ -0,0 +1,170 @@
+# Licensed under an MIT style license - see LICENSE
+import io
+import pytest
+import brew as b
+from brew.beerxml import read_beerxml, write_beerxml
+
+BURTON_ALE = b"""\
+<?xml version="1.0" encoding="UTF-8"?>
+<RECIPES>
+ <RECIPE>
+  <NAME>Burton Ale</NAME>
+  <VERSION>1</VERSION>
+  <TYPE>All Grain</TYPE>
+  <BATCH_SIZE>18.93</BATCH_SIZE>
+  <BOIL_SIZE>20.82</BOIL_SIZE>
+  <BOIL_TIME>60</BOIL_TIME>
+  <EFFICIENCY>72.0</EFFICIENCY>
+  <HOPS>
+   <HOP>
+    <NAME>Goldings, East Kent</NAME>
+    <VERSION>1</VERSION>
+    <ALPHA>5.0</ALPHA>
+    <AMOUNT>0.0638</AMOUNT>
+    <USE>Boil</USE>
+    <TIME>60.0</TIME>
+    <FORM>Pellet</FORM>
+   </HOP>
+   <HOP>
+    <NAME>Northern Brewer</NAME>
+    <VERSION>1</VERSION>
+    <ALPHA>7.5</ALPHA>
+    <AMOUNT>0.0250</AMOUNT>
+    <USE>Aroma</USE>
+    <TIME>15.0</TIME>
+    <FORM>Leaf</FORM>
+   </HOP>
+   <HOP>
+    <NAME>Cascade</NAME>
+    <VERSION>1</VERSION>
+    <ALPHA>7.5</ALPHA>
+    <AMOUNT>0.0250</AMOUNT>
+    <USE>Dry Hop</USE>
+    <TIME>4320</TIME>
+   </HOP>
+  </HOPS>
+  <FERMENTABLES>
+   <FERMENTABLE>
+    <NAME>Pale Malt (2 row) UK</NAME>
+    <VERSION>1</VERSION>
+    <AMOUNT>2.27</AMOUNT>
+    <TYPE>Grain</TYPE>
+    <YIELD>78.0</YIELD>
+    <COLOR>3.0</COLOR>
+   </FERMENTABLE>
+   <FERMENTABLE>
+    <NAME>Cane sugar</NAME>
+    <VERSION>1</VERSION>
+    <AMOUNT>0.3</AMOUNT>
+    <TYPE>Sugar</TYPE>
+    <YIELD>100.0</YIELD>
+    <COLOR>0</COLOR>
+   </FERMENTABLE>
+  </FERMENTABLES>
+  <MISCS>
+   <MISC>
+    <NAME>Irish Moss</NAME>
+    <VERSION>1</VERSION>
+    <TYPE>Fining</TYPE>
+    <USE>Boil</USE>
+    <TIME>15.0</TIME>
+    <AMOUNT>0.010</AMOUNT>
+    <AMOUNT_IS_WEIGHT>FALSE</AMOUNT_IS_WEIGHT>
+   </MISC>
+  </MISCS>
+  <YEASTS>
+   <YEAST>
+    <NAME>California Ale</NAME>
+    <VERSION>1</VERSION>
+    <TYPE>Ale</TYPE>
+    <FORM>Liquid</FORM>
+    <AMOUNT>0.035</AMOUNT>
+    <LABORATORY>White Labs</LABORATORY>
+    <PRODUCT_ID>WLP001</PRODUCT_ID>
+    <ATTENUATION>75.0</ATTENUATION>
+   </YEAST>
+  </YEASTS>
+  <MASH>
+   <NAME>Single Step</NAME>
+   <VERSION>1</VERSION>
+   <GRAIN_TEMP>22.0</GRAIN_TEMP>
+   <MASH_STEPS>
+    <MASH_STEP>
+     <NAME>Conversion</NAME>
+     <VERSION>1</VERSION>
+     <TYPE>Infusion</TYPE>
+     <STEP_TEMP>66.7</STEP_TEMP>
+     <STEP_TIME>60</STEP_TIME>
+    </MASH_STEP>
+    <MASH_STEP>
+     <NAME>Mash Out</NAME>
+     <VERSION>1</VERSION>
+     <TYPE>Temperature</TYPE>
+     <STEP_TEMP>75.6</STEP_TEMP>
+     <STEP_TIME>10</STEP_TIME>
+    </MASH_STEP>
+   </MASH_STEPS>
+  </MASH>
+ </RECIPE>
+</RECIPES>
+"""
+
+
+class TestBeerXML:
+    def test_read(self):
+        recipe, = read_beerxml(io.BytesIO(BURTON_ALE))
+        assert recipe.name == 'Burton Ale'
+        assert recipe.target_volume == pytest.approx(5.0, rel=1e-3)
+        assert recipe.config['efficiency'] == 0.72
+        assert recipe.config['T_sacc'] == pytest.approx(152.06)
+        assert recipe.config['mash_out']
+
+        grain, sugar, bittering, aroma, dry, moss, culture = \
+            recipe.ingredients
+        assert isinstance(grain, b.Grain)
+        assert grain.weight == pytest.approx(5.0, rel=1e-3)
+        assert grain.ppg == 36
+        assert isinstance(sugar, b.Sugar)
+        assert bittering.timing == b.Boil(60)
+        assert aroma.timing == b.HopStand(15) and aroma.whole
+        assert dry.timing == b.Secondary(3)
+        assert moss.quantity == '0.01 L'
+        assert culture.culture is b.CultureBank.CaliforniaAle
+
+        brew = b.Brew(recipe.ingredients, recipe.target_volume,
+                      **recipe.config)
+        assert brew.compute_ferment().beer.abv > 0
+
+    def test_round_trip(self):
+        recipe, = read_beerxml(io.BytesIO(BURTON_ALE))
+        f = io.StringIO()
+        write_beerxml([recipe, recipe[:3]], f)
+        a, c = read_beerxml(io.BytesIO(f.getvalue().encode()))
+        assert (a.name, c.name) == ('Burton Ale', 'Recipe 2')
+        assert a.target_volume == pytest.approx(recipe.target_volume)
+        assert a.config['T_sacc'] == pytest.approx(recipe.config['T_sacc'])
+        assert a.config['mash_out']
+        assert ([repr(i) for i in a.ingredients]
+                == [repr(i) for i in recipe.ingredients])
+
+    def test_adjuncts(self):
+        items = b.Ingredients([
+            b.Grain(b.PPG.MarisOtter, 10),
+            b.Unfermentable(b.PPG.Lactose, 1),
+            b.Fermentable(b.PPG.TableSugar, 0.5, timing=b.Primary()),
+        ])
+        f = io.StringIO()
+        write_beerxml([(items, 5.5, None)], f)
+        recipe, = read_beerxml(io.BytesIO(f.getvalue().encode()))
+        assert ([type(i) for i in recipe.ingredients]
+                == [b.Grain, b.Unfermentable, b.Fermentable])
+        assert recipe.ingredients[2].timing == b.Primary()
+
+    def test_missing_name(self):
+        xml = BURTON_ALE.replace(b'<NAME>Cascade</NAME>', b'')
+        with pytest.raises(ValueError, match="'Burton Ale', HOP 3: .*NAME"):
+            list(read_beerxml(io.BytesIO(xml)))
+
+        xml = BURTON_ALE.replace(b'<NAME>California Ale</NAME>', b'')
+        with pytest.raises(ValueError, match='YEAST 1: missing NAME'):
+            list(read_beerxml(io.BytesIO(xml)))
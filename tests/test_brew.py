@@ -19,8 +19,9 @@ class TestBrew:
         assert brew.volume(b.Final()) == 5.0 + 6 / 8
 
     def test_infusion(self):
+        # only grains are mashed with water
         ingredients = b.Ingredients([
-            b.Fermentable(b.PPG.AmericanTwoRow, 10),
+            b.Grain(b.PPG.AmericanTwoRow, 10),
             b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
             b.Hop('Cascade', 7.0, 0.5, b.Boil(30)),
             b.Hop('Cascade', 7.0, 0.5, b.Boil(10)),
@@ -69,11 +70,137 @@ class TestBrew:
                       r_boil=1.0, boil_time=60)
         wort = brew.boil()
 
-        # util = 1.65 * 0.000125**(1.046 - 1) * (1 - exp(-0.04 * 60)) / 4.15
+        # pre-boil sg = 1 + 37 * 10 * 0.75 / 6.5 / 1000 = 1.043
+        # util = 1.65 * 0.000125**(1.043 - 1) * (1 - exp(-0.04 * 60)) / 4.15
         # ibu = 0.746 * util * 100 * 1.0 * 7.0 / 5.5
-        assert int(wort.bitterness) == int(22.7)
+        assert int(wort.bitterness) == int(23.3)
 
         brew.ingredients[1].whole = True
         wort = brew.boil()
-        assert int(wort.bitterness) == int(22.7 * 0.85)
+        assert int(wort.bitterness) == int(23.3 * 0.85)
         
+
+    def test_compute_ferment(self, capsys):
+        ingredients = b.Ingredients([
+            b.Grain(b.PPG.AmericanTwoRow, 10),
+            b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
+            b.Culture(b.CultureBank.CaliforniaAle)
+        ])
+
+        brew = b.Brew(ingredients, 5.0, efficiency=0.75, kettle_gap=0.5,
+                      r_boil=1.0, boil_time=60)
+        result = brew.compute_ferment()
+        assert capsys.readouterr().out == ''
+
+        # stages are chained when computed from scratch
+        assert result.boil.mash.preboil_sg == result.boil.sg_preboil
+        assert result.boil.ibu == sum(result.boil.bitterness)
+        assert result.beer.sg == result.boil.wort.gravity
+
+        beer = brew.ferment()
+        assert beer.fg == result.beer.fg
+        assert 'Starting gravity' in capsys.readouterr().out
+
+    def test_timeline(self):
+        from brew.frame import IngredientFrame
+        from brew.timeline import Timeline
+
+        ingredients = b.Ingredients([
+            b.Grain(b.PPG.AmericanTwoRow, 10),
+            b.Grain(b.PPG.Black, 0.5, timing=b.Vorlauf()),
+            b.Sugar(b.PPG.TableSugar, 1, timing=b.Boil(10)),
+            b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
+            b.Water('Top off', 1.0, b.Primary()),
+            b.Fruit('Tart Cherry Puree', 1.034, 6, timing=b.Secondary(7)),
+            b.Fermentable(b.PPG.TableSugar, 0.5, timing=b.Secondary(3)),
+            b.Culture(b.CultureBank.CaliforniaAle)
+        ])
+        timeline = Timeline(ingredients)
+        frame = IngredientFrame.from_ingredients(ingredients)
+        times = [b.Mash(), b.Vorlauf(), b.Lauter(), b.Boil(60), b.Boil(10),
+                 b.Boil(0), b.Primary(), b.Secondary(3), b.Secondary(5),
+                 b.Final()]
+        for time in times:
+            for upto in [False, True]:
+                subset = (ingredients.upto(time) if upto
+                          else ingredients.at(time))
+                assert timeline.count(time, upto=upto) == len(subset)
+                assert timeline.grain_weight(time, upto=upto) == sum(
+                    [f.weight for f in subset.grains])
+                assert timeline.volume(time, upto=upto) == sum(
+                    [i.volume for i in subset if hasattr(i, 'volume')])
+                assert abs(timeline.extract(time, 0.7, upto=upto) - sum(
+                    [f.extract(0.7) for f in subset.fermentables])) < 1e-9
+                # ingredient order, as `ingredients.fermentables`
+                for t in (timeline, Timeline.from_frame(frame)):
+                    assert t.extracts(time, 0.7, upto=upto) == [
+                        f.extract(0.7) for f in subset.fermentables]
+
+    def test_timeline_cache(self):
+        ingredients = b.Ingredients([
+            b.Grain(b.PPG.AmericanTwoRow, 10),
+            b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
+            b.Sugar(b.PPG.TableSugar, 1, timing=b.Boil(10)),
+        ])
+        brew = b.Brew(ingredients, 5.0)
+        timeline = brew.timeline
+        brew.volume(b.Mash())
+        brew.extract(b.Final())
+        assert brew.timeline is timeline
+
+        ingredients.append(b.Grain(b.PPG.Black, 0.5, timing=b.Vorlauf()))
+        assert brew.timeline is not timeline
+        assert brew.total_extract(b.Vorlauf()) == sum(
+            brew.extract(b.Vorlauf()))
+
+        timeline = brew.timeline
+        before = brew.total_extract(b.Mash())
+        ingredients[2].timing = b.Mash()
+        assert brew.timeline is not timeline
+        assert brew.total_extract(b.Mash()) > before
+
+        # in-place changes are found by the stages
+        v_mash = brew.compute_mash().v_mash
+        ingredients[0].weight = 11
+        assert brew.compute_mash().v_mash > v_mash
+
+    def test_stage_cache(self):
+        ingredients = b.Ingredients([
+            b.Grain(b.PPG.AmericanTwoRow, 10),
+            b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
+            b.Culture(b.CultureBank.CaliforniaAle)
+        ])
+
+        brew = b.Brew(ingredients, 5.0, r_mash=1.5)
+        first = brew.compute_ferment()
+        assert brew.compute_ferment() is first
+
+        # hops: boil and ferment
+        ingredients.hops[0].alpha = 8.0
+        result = brew.compute_ferment()
+        assert result.boil.mash is first.boil.mash
+        assert result.boil is not first.boil
+        assert result.bitterness > first.bitterness
+
+        # cultures: ferment only
+        boil = result.boil
+        ingredients[2] = b.Culture(b.CultureBank.EnglishAle)
+        result = brew.compute_ferment()
+        assert result.boil is boil
+        assert result.beer.fg > first.beer.fg
+
+        # T_sacc: infusion and fermentation, the boil is reused
+        brew['T_sacc'] = (156,)
+        result = brew.compute_ferment()
+        assert result.boil.mash.T_infusion != boil.mash.T_infusion
+        assert result.boil.mash.extract is boil.mash.extract
+        assert result.boil.utilization is boil.utilization
+        assert result.beer.fg != first.beer.fg
+
+        # grains: everything
+        ingredients[0].weight = 11
+        result = brew.compute_ferment()
+        assert result.boil.mash.extract != boil.mash.extract
+
+        brew.clear_cache()
+        assert brew.compute_ferment() is not result
@@ -0,0 +1,90 @@
+# Licensed under an MIT style license - see LICENSE
+import copy
+import numpy as np
+import brew as b
+from brew import configuration
+from brew.brewlogs import imap_brewlogs, load_directory
+from brew.yaml import dump_brewlog
+
+
+def batch(grain=8):
+    return {
+        'target_volume': 5.0,
+        'config': {'efficiency': 0.7, 'r_mash': 1.5},
+        'ingredients': [
+            b.Grain(b.PPG.AmericanTwoRow, grain),
+            b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
+            b.Culture(b.CultureBank.CaliforniaAle),
+        ],
+    }
+
+
+def logs(tmp_path):
+    for i in range(4):
+        with open(str(tmp_path / 'batch{}.yaml'.format(i)), 'w') as f:
+            dump_brewlog([batch(8 + i)], f)
+    with open(str(tmp_path / 'batch2.yaml'), 'a') as f:
+        f.write('- {unclosed\n')
+    with open(str(tmp_path / 'batch3.yaml'), 'w') as f:
+        dump_brewlog([batch(11), {'note': 'no recipe'}], f,
+                     explicit_start=True)
+    return str(tmp_path)
+
+
+class TestBrewlogs:
+    def test_load(self, tmp_path):
+        directory = logs(tmp_path)
+        serial = load_directory(directory, workers=1)
+        parallel = load_directory(directory, workers=2)
+        assert [log.path for log in serial] == [log.path for log in parallel]
+        assert [log.path[-11:] for log in serial] == [
+            'batch0.yaml', 'batch1.yaml', 'batch2.yaml', 'batch3.yaml']
+
+        # errors are per file
+        assert serial[2].summary is None
+        assert serial[2].error.startswith(('ParserError', 'ScannerError'))
+        assert parallel[2].error == serial[2].error
+
+        for a, c in zip(serial, parallel):
+            if a.summary is not None:
+                assert np.allclose(a.summary['og'], c.summary['og'],
+                                   equal_nan=True)
+        og = [log.summary['og'][0] for log in serial if log.error is None]
+        assert all(np.diff(og) > 0)
+        assert np.isnan(serial[3].summary['og'][1])
+
+        brew = b.Brew(b.Ingredients(batch(8)['ingredients']), 5.0,
+                      efficiency=0.7, r_mash=1.5)
+        assert np.isclose(serial[0].summary['ibu'][0],
+                          brew.compute_ferment().bitterness)
+
+    def test_cache(self, tmp_path):
+        directory = logs(tmp_path)
+        cache = str(tmp_path / 'cache.json')
+        first = load_directory(directory, cache=cache, workers=1)
+        assert not any(log.cached for log in first)
+
+        second = load_directory(directory, cache=cache, workers=1)
+        assert [log.cached for log in second] == [True, True, False, True]
+        assert np.array_equal(first[0].summary, second[0].summary)
+
+        with open(str(tmp_path / 'batch1.yaml'), 'w') as f:
+            dump_brewlog([batch(4)], f)
+        third = load_directory(directory, cache=cache, workers=1)
+        assert [log.cached for log in third] == [True, False, False, True]
+        assert third[1].summary['og'][0] < first[1].summary['og'][0]
+
+        # a new configuration brews everything again
+        config = copy.deepcopy(configuration.load_config())
+        config['default']['boil_time'] = 90
+        configuration.set_config(config)
+        try:
+            log, = imap_brewlogs(
+                [str(tmp_path / 'batch0.yaml')], cache=cache, workers=1)
+        finally:
+            configuration.set_config(None)
+        assert not log.cached
+
+    def test_missing(self, tmp_path):
+        log, = imap_brewlogs([str(tmp_path / 'missing.yaml')])
+        assert log.error.startswith('FileNotFoundError')
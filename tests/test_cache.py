@@ -0,0 +1,115 @@
+# Licensed under an MIT style license - see LICENSE
+import pickle
+import numpy as np
+import pytest
+import brew as b
+from brew import batch
+from brew.cache import ResultCache, recipe_key
+
+
+def recipe(grain=8, desc=None):
+    return b.Ingredients([
+        b.Grain(b.PPG.AmericanTwoRow, grain, desc=desc),
+        b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
+        b.Culture(b.CultureBank.CaliforniaAle),
+    ])
+
+
+def brew(grain=8, **config):
+    config.setdefault('efficiency', 0.7)
+    return b.Brew(recipe(grain), 5.0, r_mash=1.5, **config)
+
+
+class TestResultCache:
+    def test_key(self):
+        key = recipe_key(brew())
+        assert key == recipe_key(brew())
+        assert key == recipe_key(b.Brew(recipe(desc='base malt'), 5.0,
+                                        r_mash=1.5, efficiency=0.7))
+        assert key != recipe_key(brew(9))
+        assert key != recipe_key(brew(efficiency=0.75))
+        assert key != recipe_key(brew(), grain_attenuation=80)
+        assert key != recipe_key(b.Brew(recipe(), 5.5, r_mash=1.5,
+                                        efficiency=0.7))
+
+    def test_ferment(self, capsys):
+        cache = ResultCache()
+        result = brew().compute_ferment(cache=cache)
+        assert len(cache) == 1
+
+        cached = brew().compute_ferment(cache=cache)
+        assert cached is not result
+        assert cached.beer.abv == result.beer.abv
+        assert cached.boil.wort.gravity == result.boil.wort.gravity
+        assert cached.boil.mash.T_infusion == result.boil.mash.T_infusion
+        assert cached.boil.mash.v_infusion == result.boil.mash.v_infusion
+        assert repr(cached.boil.hops) == repr(result.boil.hops)
+
+        # without the recipe
+        key = recipe_key(brew(), grain_attenuation=75)
+        other = brew().compute_ferment(grain_attenuation=75)
+        cache.put(key, other)
+        cached = cache.get(key)
+        assert (repr(cached.boil.mash.fermentables)
+                == repr(other.boil.mash.fermentables))
+        assert len(cache) == 2
+        cache.clear()
+        brew().compute_ferment(cache=cache)
+
+        # same output
+        brew().ferment()
+        fresh = capsys.readouterr().out
+        beer = brew().ferment(cache=cache)
+        assert capsys.readouterr().out == fresh
+        assert beer.fg == result.beer.fg
+        assert len(cache) == 1
+
+    def test_lru(self):
+        cache = ResultCache(max_size=None)
+        brews = [brew(grain) for grain in range(5, 9)]
+        keys = [recipe_key(b_) for b_ in brews]
+        for b_ in brews:
+            b_.compute_ferment(cache=cache)
+        size = cache.size
+        assert size > 0 and len(cache) == 4
+
+        # hops and fermentables are stored as positions in the recipe
+        with pytest.raises(ValueError):
+            cache.get(keys[0])
+
+        # use the oldest, then limit to about three results
+        assert cache.get(keys[0], brews[0].ingredients) is not None
+        cache.max_size = size * 3 // 4
+        brew(9).compute_ferment(cache=cache)
+        assert cache.size <= cache.max_size
+        assert keys[0] in cache and keys[1] not in cache
+        assert keys[3] in cache
+
+        cache.clear()
+        assert len(cache) == 0 and cache.size == 0
+
+    def test_shared(self, tmp_path):
+        path = str(tmp_path / 'results.sqlite')
+        with ResultCache(path) as cache:
+            brew().compute_ferment(cache=cache)
+            copy = pickle.loads(pickle.dumps(cache))
+            assert copy is cache
+
+        with ResultCache(path) as cache:
+            assert recipe_key(brew()) in cache
+
+        with pytest.raises(TypeError):
+            pickle.dumps(ResultCache())
+
+    def test_batch(self, tmp_path):
+        cache = ResultCache(str(tmp_path / 'results.sqlite'))
+        recipes = [(recipe(8 + i), 5.0, {'efficiency': 0.7, 'r_mash': 1.5})
+                   for i in range(4)]
+        fresh = batch.evaluate(recipes, workers=1)
+        first = batch.evaluate(recipes, workers=2, chunksize=1, cache=cache)
+        assert len(cache) == 4
+        second = batch.evaluate(recipes, workers=1, cache=cache)
+        for name in batch.summary_dtype.names:
+            assert np.allclose(fresh[name], first[name])
+            assert np.array_equal(first[name], second[name])
+        cache.close()
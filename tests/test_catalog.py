@@ -0,0 +1,104 @@
+# Licensed under an MIT style license - see LICENSE
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import brew as b
+from brew.catalog import Catalog, Spec
+from brew.frame import IngredientFrame
+
+
+class TestCatalog:
+    def test_seed(self):
+        catalog = Catalog()
+        assert len(catalog) == len(b.PPG) + len(b.CultureBank)
+
+        grain = catalog.ingredient('maris otter', 10)
+        expected = b.Grain(b.PPG.MarisOtter, 10)
+        assert type(grain) is b.Grain
+        assert str(grain) == str(expected)
+        assert type(catalog.ingredient('Table sugar', 1)) is b.Sugar
+        assert type(catalog.ingredient('Lactose', 1)) is b.Unfermentable
+
+        culture = catalog.ingredient('WLP001, California Ale', 1)
+        expected = b.Culture(b.CultureBank.CaliforniaAle)
+        assert culture.name == expected.name
+        assert culture.attenuation == expected.attenuation
+        assert culture.timing == expected.timing
+
+        with pytest.raises(KeyError):
+            catalog.get('Marris Otter')
+
+    def test_find(self):
+        catalog = Catalog()
+        names = [s.name for s in catalog.find(prefix='american CARAMEL')]
+        assert names == sorted(names)
+        assert len(names) == 5
+        assert catalog.find(prefix='100%') == []
+
+        for spec in catalog.find(type='Grain', ppg=(38, None)):
+            assert spec.type == 'Grain' and spec.ppg >= 38
+
+        specs = catalog.find(type='Culture', attenuation=(81, 82))
+        assert 'US-05, American Ale' in [s.name for s in specs]
+        for spec in specs:
+            assert spec.attenuation_max >= 81 and spec.attenuation_min <= 82
+
+        assert len(catalog.find(type=('Sugar', 'Unfermentable'), limit=3)) == 3
+
+    def test_fuzzy(self):
+        catalog = Catalog()
+        assert catalog.fuzzy('marris oter')[0].name == 'Maris Otter'
+        specs = catalog.fuzzy('california ale', type='Culture')
+        assert specs[0].name == 'WLP001, California Ale'
+        assert catalog.fuzzy('xyzzy') == []
+
+    def test_insert(self, tmp_path):
+        path = str(tmp_path / 'catalog.sqlite')
+        with Catalog(path, seed=False) as catalog:
+            catalog.insert([Spec('Hop', 'Citra', alpha=12.0, beta=3.5),
+                            ('Hop', 'Saaz', None, None, None, 3.5)])
+            assert catalog.names('Hop') == ['Citra', 'Saaz']
+            catalog.insert([Spec('Hop', 'Saaz', alpha=4.0)])
+            assert catalog.names('Hop') == ['Citra', 'Saaz']
+
+        catalog = Catalog(path)
+        assert len(catalog) == 2
+        assert [s.name for s in catalog.find(alpha=(4, 13))] == [
+            'Citra', 'Saaz']
+
+        hop = catalog.ingredient('citra', 1.0, b.Boil(10))
+        assert (hop.name, hop.alpha, hop.beta) == ('Citra', 12.0, 3.5)
+        assert hop.timing == b.Boil(10)
+
+    def test_threads(self):
+        catalog = Catalog()
+        with ThreadPoolExecutor(4) as pool:
+            specs = list(pool.map(catalog.get, ['Maris Otter'] * 20))
+        assert all(s.ppg == 38 for s in specs)
+
+    def test_insert_while_reading(self):
+        catalog = Catalog(seed=False)
+        catalog.insert([Spec('Hop', 'Citra', alpha=12.0)])
+        reader = catalog._reader
+
+        @contextmanager
+        def insert_after_read():
+            with reader() as db:
+                yield db
+            catalog.insert([Spec('Hop', 'Saaz', alpha=4.0)])
+
+        catalog._reader = insert_after_read
+        assert catalog.names('Hop') == ['Citra']
+        del catalog._reader
+        assert catalog.names('Hop') == ['Citra', 'Saaz']
+
+    def test_culture_tuple(self):
+        culture = b.Culture(('House ale', 70, 76))
+        assert culture.attenuation == (70, 76)
+        with pytest.raises(ValueError):
+            b.Culture(('House ale', 70))
+
+        frame = IngredientFrame.from_ingredients([culture])
+        copy = frame.to_ingredients()[0]
+        assert copy.name == 'House ale'
+        assert copy.attenuation == (70, 76)
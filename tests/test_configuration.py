@@ -0,0 +1,47 @@
+# Licensed under an MIT style license - see LICENSE
+import os
+import json
+import pytest
+from brew import configuration
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    fn = str(tmp_path / 'brew' / 'config.json')
+    monkeypatch.setattr(configuration, 'config_file', fn)
+    configuration.clear_cache()
+    yield fn
+    configuration.clear_cache()
+
+
+class TestConfiguration:
+    def test_create(self, config_file):
+        config = configuration.get_config()
+        assert os.path.exists(config_file)
+        assert config == dict(configuration.config_default)
+
+    def test_cache(self, config_file):
+        configuration.get_config()
+        with open(config_file, 'w') as outf:
+            json.dump({'default': {'r_mash': 1.5},
+                       'thin': {'r_mash': 3.0}}, outf)
+        os.utime(config_file, ns=(0, 0))
+        assert configuration.get_config(['thin']) == {'r_mash': 3.0}
+
+        # returned values are copies
+        configuration.get_config('thin')['r_mash'] = 0
+        assert configuration.get_config('thin') == {'r_mash': 3.0}
+
+        # modified files are read again
+        with open(config_file, 'w') as outf:
+            json.dump({'default': {'r_mash': 1.25}}, outf)
+        os.utime(config_file, ns=(10**9, 10**9))
+        assert configuration.get_config() == {'r_mash': 1.25}
+
+    def test_set_config(self, config_file):
+        configuration.set_config({'default': {'r_mash': 2.0}})
+        try:
+            assert configuration.get_config() == {'r_mash': 2.0}
+            assert not os.path.exists(config_file)
+        finally:
+            configuration.set_config(None)
@@ -0,0 +1,71 @@
+# Licensed under an MIT style license - see LICENSE
+import pytest
+import brew as b
+from brew.frame import IngredientFrame
+from brew.timeline import Timeline
+
+
+def recipe():
+    return b.Ingredients([
+        b.Grain(b.PPG.AmericanTwoRow, 8),
+        b.Grain(b.PPG.GermanMunich, 2),
+        b.Unfermentable(b.PPG.Lactose, 0.5, timing=b.Boil(10)),
+        b.Hop('Magnum', 12.0, 0.5, b.FirstWort(60)),
+        b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
+        b.Hop('Cascade', 7.0, 0.5, b.Boil(10), whole=True),
+        b.Hop('Citra', 12.0, 1.0, b.HopStand(20)),
+        b.Hop('Citra', 12.0, 1.0, b.Secondary(3)),
+        b.Sugar(b.PPG.TableSugar, 0.5, timing=b.Primary()),
+        b.Culture(b.CultureBank.CaliforniaAle),
+    ])
+
+
+class TestIngredientFrame:
+    def test_round_trip(self):
+        ingredients = recipe()
+        frame = IngredientFrame.from_ingredients(ingredients)
+        assert len(frame) == len(ingredients)
+        for a, c in zip(ingredients, frame.to_ingredients()):
+            assert type(a) is type(c)
+            assert a.name == c.name
+            assert a.timing == c.timing
+            assert getattr(a, 'weight', None) == getattr(c, 'weight', None)
+
+    def test_extract(self):
+        ingredients = recipe()
+        frame = IngredientFrame.from_ingredients(ingredients)
+        fermentables = frame.isinstance(b.Fermentable, b.Unfermentable)
+        expected = [i.extract(0.7) for i in
+                    ingredients.filter(b.Fermentable, b.Unfermentable)]
+        assert frame.extract(0.7)[fermentables] == pytest.approx(expected)
+
+    def test_bitterness(self):
+        ingredients = recipe()
+        frame = IngredientFrame.from_ingredients(ingredients)
+        util, bit = frame.bitterness(1.050, 5.5, boil=60, hop_stand=True)
+        for i, hop in enumerate(ingredients.hops):
+            expected = hop.bitterness(1.050, 5.5, boil=60, hop_stand=True)
+            assert util[i] == pytest.approx(expected[0])
+            assert bit[i] == pytest.approx(expected[1])
+
+    def test_timeline(self):
+        ingredients = recipe()
+        frame = IngredientFrame.from_ingredients(ingredients)
+        a = Timeline(ingredients)
+        c = Timeline.from_frame(frame)
+        for time in (b.Mash(), b.Boil(30), b.Primary(), b.Final()):
+            assert a.count(time) == c.count(time)
+            assert a.grain_weight(time) == pytest.approx(c.grain_weight(time))
+            assert (a.extract(time, 0.7, upto=True)
+                    == pytest.approx(c.extract(time, 0.7, upto=True)))
+
+    def test_brew(self, monkeypatch):
+        kwargs = dict(efficiency=0.72, r_mash=1.5)
+        expected = b.Brew(recipe(), 5.5, **kwargs).compute_ferment()
+
+        monkeypatch.setattr('brew.brew.frame_threshold', 0)
+        result = b.Brew(recipe(), 5.5, **kwargs).compute_ferment()
+        assert result.beer.sg == pytest.approx(expected.beer.sg)
+        assert result.bitterness == pytest.approx(expected.bitterness)
+        assert (result.boil.utilization
+                == pytest.approx(expected.boil.utilization))
@@ -0,0 +1,123 @@
+# Licensed under an MIT style license - see LICENSE
+import pytest
+import brew as b
+from brew.history import History
+from brew.yaml import dump_brewlog, iter_brewlog
+
+
+def batch(n, rye=2, hops=1.0, target_volume=5.5):
+    data = {
+        'batch': n,
+        'ingredients': [
+            b.Grain(b.PPG.MarisOtter, 8),
+            b.Grain(b.PPG.AmericanRyeMalt, rye),
+            b.Hop('Cascade', 7.0, hops, b.Boil(60)),
+            b.Culture(b.CultureBank.CaliforniaAle),
+        ],
+    }
+    if target_volume is not None:
+        data['target_volume'] = target_volume
+        data['config'] = {'efficiency': 0.7}
+    return data
+
+
+def write(path, documents):
+    with open(str(path), 'a') as f:
+        dump_brewlog(documents, f, explicit_start=True)
+
+
+class TestHistory:
+    def test_query(self, tmp_path):
+        log = tmp_path / 'brewlog.yaml'
+        write(log, [batch(1), batch(2, rye=0.5), batch(3, hops=4.0),
+                    batch(4, target_volume=None)])
+        history = History(str(tmp_path / 'history.db'))
+        assert history.update(str(log)) == 4
+        assert len(history) == 4
+
+        one = history.get(1)
+        assert one.index == 0 and one.og > 1.04
+        assert one.ibu < history.get(3).ibu
+        assert history.get(4).og is None
+        assert history.fractions(1)['American rye malt'] == pytest.approx(0.2)
+        assert history.fractions(4)['American rye malt'] == pytest.approx(0.2)
+        assert history.fractions(1)['Cascade'] is None
+
+        assert history.query(ingredients={'%rye%': (0.15, None)}) == [1, 3, 4]
+        assert history.query(ingredients=['CASCADE']) == [1, 2, 3, 4]
+        assert history.query(ingredients={'%rye%': (0.15, None)},
+                             ibu=(None, 30)) == [1]
+        assert history.query(og=(one.og, one.og)) == [1, 3]
+        assert history.query(og=(None, 2)) == [1, 2, 3]
+        assert history.query(source=str(log), limit=2) == [1, 2]
+
+        loaded = history.load(3)
+        assert loaded.data['batch'] == 3
+        history.close()
+
+    def test_update(self, tmp_path):
+        log = tmp_path / 'brewlog.yaml'
+        write(log, [batch(1), batch(2)])
+        history = History()
+        assert history.update(str(log)) == 2
+        assert history.update(str(log)) == 0
+
+        # appended batches, and the last batch again
+        write(log, [batch(3, rye=0.5)])
+        assert history.update(str(log)) == 2
+        assert [history.get(i).index for i in history.query()] == [0, 1, 2]
+        assert history.load(3).data['batch'] == 3
+
+        # rewritten
+        log.write_text('')
+        write(log, [batch(5)])
+        assert history.update(str(log)) == 1
+        assert len(history) == 1
+
+        history.remove(str(log))
+        assert len(history) == 0
+
+    def test_add(self):
+        history = History()
+        log = dump_brewlog([batch(1)])
+        for item in iter_brewlog(log):
+            id = history.add(item, recipe=lambda batch: None)
+        assert history.get(id).og is None
+        rye = {'american rye malt': (0.1, 0.3)}
+        assert history.query(ingredients=rye) == [id]
+        with pytest.raises(KeyError):
+            history.load(id)
+        with pytest.raises(KeyError):
+            history.get(id + 1)
+
+    def test_extend_last(self, tmp_path):
+        log = tmp_path / 'brewlog.yaml'
+        batches = [batch(1), batch(2)]
+        for data in batches:
+            data['ingredients'] = data.pop('ingredients')
+        with open(str(log), 'w') as f:
+            dump_brewlog(batches, f, sort_keys=False)
+        history = History()
+        assert history.update(str(log)) == 2
+        ibu = history.get(2).ibu
+
+        # a new ingredient in the last batch, which ends the file
+        with open(str(log), 'a') as f:
+            f.write('- !Hop {name: Magnum, alpha: 14.0, weight: 2.0, '
+                    'timing: !Boil 60}\n')
+        assert history.update(str(log)) == 1
+        assert len(history) == 2
+        id = history.query()[-1]
+        assert history.get(id).index == 1
+        assert history.get(id).ibu > ibu
+        assert 'Magnum' in history.fractions(id)
+
+        fresh = History()
+        fresh.update(str(log))
+        assert history.get(id).ibu == fresh.get(2).ibu
+        assert history.get(1) == fresh.get(1)
+
+        # an edit before the last batch indexes everything again
+        log.write_text(log.read_text().replace('batch: 1', 'batch: 7'))
+        assert history.update(str(log)) == 2
+        assert history.load(history.query()[0]).data['batch'] == 7
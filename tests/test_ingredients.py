@@ -0,0 +1,135 @@
+# Licensed under an MIT style license - see LICENSE
+import tracemalloc
+import brew as b
+from brew.profiling import Profile
+
+
+def recipe():
+    return b.Ingredients([
+        b.Grain(b.PPG.AmericanTwoRow, 8),
+        b.Grain(b.PPG.CornFlaked, 1, timing=b.Vorlauf()),
+        b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
+        b.Hop('Cascade', 7.0, 0.5, b.Boil(10)),
+        b.Sugar(b.PPG.TableSugar, 0.5, timing=b.Primary()),
+        b.Culture(b.CultureBank.CaliforniaAle),
+    ])
+
+
+class TestIngredientsView:
+    def test_queries(self):
+        ingredients = recipe()
+        assert len(ingredients.fermentables) == 3
+        assert len(ingredients.hops) == 2
+        assert list(ingredients.filter(b.Grain, b.Mash)) == [ingredients[0]]
+        assert list(ingredients.fermentables.upto(b.Primary())) == \
+            list(ingredients[:2])
+        assert ingredients.hops[-1] is ingredients[3]
+        assert ingredients.boil.hops.at(b.Boil(60)).index(ingredients[2]) == 0
+        assert not ingredients.hop_stand
+        assert ingredients.primary
+
+    def test_no_copies(self):
+        ingredients = recipe()
+        with Profile() as prof:
+            list(ingredients.fermentables.upto(b.Primary()).grains)
+        assert prof.copies == 0
+
+        copy = b.Ingredients(ingredients.hops)
+        assert isinstance(copy, b.Ingredients)
+        assert len(copy) == 2
+
+    def test_live(self):
+        ingredients = recipe()
+        hops = ingredients.hops
+        ingredients.append(b.Hop('Citra', 12.0, 1.0, b.HopStand(20)))
+        assert len(hops) == 3
+        assert ingredients.hop_stand
+
+
+class TestBuckets:
+    def check(self, ingredients):
+        for t in (b.Grain, b.Hop, b.Fermentable, b.Culture):
+            assert (list(ingredients.filter(t))
+                    == [i for i in ingredients if isinstance(i, t)])
+        for t in (b.Mash, b.Boil, b.Primary):
+            assert (list(ingredients.filter(t))
+                    == [i for i in ingredients if isinstance(i.timing, t)])
+
+    def test_mutations(self):
+        ingredients = recipe()
+        self.check(ingredients)
+
+        ingredients.append(b.Hop('Citra', 12.0, 1.0, b.HopStand(20)))
+        ingredients.extend([b.Grain(b.PPG.GermanMunich, 1)])
+        self.check(ingredients)
+
+        ingredients.pop()
+        ingredients[0] = b.Sugar(b.PPG.Honey, 1.0, b.Boil(5))
+        self.check(ingredients)
+
+        ingredients.insert(1, b.Grain(b.PPG.GermanMunich, 1))
+        del ingredients[2]
+        ingredients.remove(ingredients[-1])
+        self.check(ingredients)
+
+        ingredients += [b.Hop('Saaz', 3.0, 1.0, b.Boil(15))]
+        self.check(ingredients)
+
+    def test_shifts(self):
+        ingredients = recipe()
+        self.check(ingredients)
+        buckets = ingredients._types, ingredients._timings
+
+        ingredients.insert(0, b.Hop('Citra', 12.0, 1.0, b.HopStand(20)))
+        ingredients.insert(-2, b.Grain(b.PPG.GermanMunich, 1))
+        ingredients.insert(-100, b.Sugar(b.PPG.Honey, 1.0, b.Boil(5)))
+        self.check(ingredients)
+
+        ingredients.pop(1)
+        del ingredients[-3]
+        ingredients.remove(ingredients[2])
+        self.check(ingredients)
+
+        ingredients.reverse()
+        self.check(ingredients)
+
+        # updated, not rebuilt
+        assert ingredients._types is buckets[0]
+        assert ingredients._timings is buckets[1]
+
+    def test_timing_change(self):
+        ingredients = recipe()
+        self.check(ingredients)
+        ingredients.hops[0].timing = b.Primary()
+        self.check(ingredients)
+        ingredients.pop()
+        ingredients[-1] = b.Hop('Saaz', 3.0, 1.0, b.Mash())
+        self.check(ingredients)
+
+    def test_timing_scope(self):
+        ingredients = recipe()
+        other = recipe()
+        shared = b.Ingredients(ingredients.hops)
+        for x in (ingredients, other, shared):
+            self.check(x)
+
+        timings = other._timings
+        ingredients.hops[0].timing = b.Primary()
+        assert other._timings is timings
+        for x in (ingredients, other, shared):
+            self.check(x)
+
+    def test_memory(self):
+        # bytes per item of the buckets, mostly their positions
+        n = 20000
+        ingredients = b.Ingredients([b.Grain(b.PPG.MarisOtter, 1.0)
+                                     for i in range(n)])
+        tracemalloc.start()
+        try:
+            list(ingredients.grains.filter(b.Mash))
+            copy = b.Ingredients(ingredients)
+            list(copy.filter(b.Mash))
+            size = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        assert size / n < 2 * 128
@@ -0,0 +1,95 @@
+# Licensed under an MIT style license - see LICENSE
+import io
+import json
+import pytest
+import brew as b
+from brew.json import dump_recipes, load_recipes
+from brew.results import FermentResult
+
+
+def recipe():
+    return b.Ingredients([
+        b.Grain(b.PPG.MarisOtter, 10),
+        b.Sugar(b.PPG.CaneSugar, 1, desc='late addition'),
+        b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
+        b.Hop('Citra', 12.0, 1.0, b.HopStand(20), whole=True, beta=4.0),
+        b.Hop('Mosaic', 12.0, 1.0, b.Secondary(3)),
+        b.Culture(b.CultureBank.CaliforniaAle),
+        b.Culture(('House', 70, 80), '2'),
+        b.Spice('Coriander', '1 tsp', b.Boil(5)),
+        b.WaterTreatment('Gypsum', '1 tsp'),
+        b.Wort(1.050, 2.0),
+        b.Fruit('Cherry', 1.060, 3.0),
+        b.Water('Tap', 7.0),
+    ])
+
+
+def reprs(items):
+    return [repr(i) for i in items]
+
+
+class TestToDict:
+    def test_ingredients(self):
+        items = recipe()
+        d = json.loads(json.dumps(items.to_dict()))
+        loaded = b.Ingredients.from_dict(d)
+        assert reprs(loaded) == reprs(items)
+        assert [i.desc for i in loaded] == [i.desc for i in items]
+        assert loaded[3].beta == 4.0 and loaded[3].whole
+        assert loaded[6].attenuation == (70, 80)
+
+    def test_timing(self):
+        for timing in (b.Mash(), b.Boil(60), b.Secondary(3), b.Final()):
+            assert b.timing.Timing.from_dict(timing.to_dict()) == timing
+        assert 'time' not in b.Primary().to_dict()
+
+    def test_errors(self):
+        with pytest.raises(ValueError):
+            b.Ingredient.from_dict({'type': 'Brew'})
+        with pytest.raises(TypeError):
+            b.Hop.from_dict(b.Grain(b.PPG.MarisOtter, 1).to_dict())
+
+    def test_brew(self):
+        items = b.Ingredients([i for i in recipe()
+                               if not isinstance(i, (b.Wort, b.Fruit))])
+        brew = b.Brew(items, 5.5, efficiency=0.7, T_sacc=152)
+        d = json.loads(json.dumps(brew.to_dict()))
+        loaded = b.Brew.from_dict(d)
+        assert loaded.config == brew.config
+        assert reprs(loaded.ingredients) == reprs(brew.ingredients)
+
+        result = brew.compute_ferment()
+        d = json.loads(json.dumps(result.to_dict()))
+        loaded = FermentResult.from_dict(d)
+        assert loaded.beer.abv == result.beer.abv
+        assert loaded.boil.mash.T_infusion == result.boil.mash.T_infusion
+        assert reprs(loaded.boil.hops) == reprs(result.boil.hops)
+
+
+class TestRecipes:
+    def test_round_trip(self):
+        recipes = [(recipe(), 5.5, {'efficiency': 0.7, 'T_rest': [122]}),
+                   (recipe()[:3], 3.0, None)]
+        s = dump_recipes(recipes)
+        loaded = load_recipes(s)
+        assert len(loaded) == 2
+        for a, c in zip(recipes, loaded):
+            assert reprs(a[0]) == reprs(c[0])
+            assert a[1] == c[1]
+        assert loaded[0][2] == {'efficiency': 0.7, 'T_rest': (122,)}
+        assert loaded[1][2] is None
+
+        # columns are listed once per type
+        doc = json.loads(s)
+        assert set(doc['columns']) == {type(i).__name__ for i in recipe()}
+
+    def test_stream(self):
+        f = io.StringIO()
+        dump_recipes([(recipe(), 5.5, {})], f)
+        f.seek(0)
+        (items, target_volume, config), = load_recipes(f)
+        assert reprs(items) == reprs(recipe())
+
+    def test_version(self):
+        with pytest.raises(ValueError):
+            load_recipes('{"version": 0}')
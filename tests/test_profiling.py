@@ -0,0 +1,45 @@
+# Licensed under an MIT style license - see LICENSE
+import json
+import brew as b
+from brew import batch
+from brew.profiling import Profile
+
+
+def ingredients():
+    return b.Ingredients([
+        b.Grain(b.PPG.AmericanTwoRow, 10),
+        b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
+        b.Culture(b.CultureBank.CaliforniaAle)
+    ])
+
+
+class TestProfiling:
+    def test_profile(self, capsys):
+        brew = b.Brew(ingredients(), 5.0)
+        with Profile() as prof:
+            brew.ferment()
+
+        for stage in ['mash', 'infusion', 'boil', 'ferment', 'volume',
+                      'extract', 'render']:
+            assert prof.calls[stage] > 0
+            assert prof.seconds[stage] >= 0
+
+        # one shared timeline for the whole fermentation
+        assert prof.calls['timeline'] == 1
+        assert prof.copies > 0
+
+        # inactive profiles are not updated
+        brew.ferment()
+        assert prof.calls['ferment'] == 1
+
+        d = json.loads(prof.to_json())
+        assert Profile.from_dict(d).calls == prof.calls
+        assert (prof + prof).calls['ferment'] == 2
+        assert 'ferment' in str(prof)
+
+    def test_batch(self):
+        recipes = [(ingredients(), 5.0, {'r_mash': 1.5})] * 3
+        prof = Profile()
+        batch.evaluate(recipes, workers=2, chunksize=1, profile=prof)
+        assert prof.calls['ferment'] == 3
+        assert prof.calls['config'] == 3
@@ -0,0 +1,41 @@
+# Licensed under an MIT style license - see LICENSE
+import pytest
+import brew as b
+from brew.solve import solve
+
+
+class TestSolve:
+    def test_solve(self):
+        ingredients = b.Ingredients([
+            b.Grain(b.PPG.AmericanTwoRow, 8),
+            b.Grain(b.PPG.GermanMunich, 2),
+            b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
+            b.Hop('Cascade', 7.0, 0.5, b.Boil(10)),
+            b.Sugar(b.PPG.TableSugar, 0.5, timing=b.Primary()),
+            b.Culture(b.CultureBank.CaliforniaAle)
+        ])
+
+        kwargs = dict(efficiency=0.72, r_mash=1.5)
+        grain_weights, hop_weights = solve(ingredients, 5.5, 1.062, 45,
+                                           **kwargs)
+
+        # ratios are unchanged
+        assert grain_weights[0] / grain_weights[1] == pytest.approx(4)
+        assert hop_weights[0] / hop_weights[1] == pytest.approx(2)
+
+        for grain, weight in zip(ingredients.grains, grain_weights):
+            grain.weight = weight
+        for hop, weight in zip(ingredients.hops, hop_weights):
+            hop.weight = weight
+
+        result = b.Brew(ingredients, 5.5, **kwargs).compute_ferment()
+        assert result.beer.sg == pytest.approx(1.062)
+        assert result.bitterness == pytest.approx(45)
+
+    def test_unreachable(self):
+        ingredients = b.Ingredients([
+            b.Grain(b.PPG.AmericanTwoRow, 8),
+            b.Sugar(b.PPG.TableSugar, 5, timing=b.Primary()),
+        ])
+        with pytest.raises(ValueError):
+            solve(ingredients, 5.5, 1.030, 0)
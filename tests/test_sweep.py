@@ -0,0 +1,46 @@
+# Licensed under an MIT style license - see LICENSE
+import numpy as np
+import brew as b
+from brew.sweep import sweep
+
+
+class TestSweep:
+    def test_sweep(self):
+        ingredients = b.Ingredients([
+            b.Grain(b.PPG.AmericanTwoRow, 10),
+            b.Grain(b.PPG.GermanMunich, 2),
+            b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
+            b.Hop('Cascade', 7.0, 1.0, b.Boil(5)),
+            b.Sugar(b.PPG.TableSugar, 1, timing=b.Primary()),
+            b.Culture(b.CultureBank.CaliforniaAle)
+        ])
+
+        efficiency = np.linspace(0.6, 0.8, 3)
+        r_mash = [1.25, 1.5]
+        boil_time = [60, 90]
+        T_sacc = [148, 154]
+        result = sweep(ingredients, 5.5, efficiency=efficiency,
+                       r_mash=r_mash, boil_time=boil_time, T_sacc=T_sacc,
+                       mash_out=True, hop_stand=[False, True])
+        assert result.shape == (3, 2, 2, 2, 2)
+        assert list(result.axes.keys()) == [
+            'efficiency', 'r_mash', 'boil_time', 'T_sacc', 'hop_stand']
+
+        for i in np.ndindex(result.shape):
+            kwargs = {k: v[j] for (k, v), j in zip(result.axes.items(), i)}
+            kwargs['hop_stand'] = bool(kwargs['hop_stand'])
+            brew = b.Brew(ingredients, 5.5, mash_out=True, **kwargs)
+            r = brew.compute_ferment()
+            assert np.isclose(result.preboil_sg[i], r.boil.sg_preboil)
+            assert np.isclose(result.postboil_sg[i], r.boil.sg_postboil)
+            assert np.isclose(result.og[i], r.beer.sg)
+            assert np.isclose(result.ibu[i], r.bitterness)
+            assert np.isclose(result.fg[i], r.beer.fg)
+            assert np.isclose(result.abv[i], r.beer.abv)
+            assert np.isclose(result.v_mash[i], r.boil.mash.v_mash)
+            assert np.isclose(result.v_sparge[i], r.boil.mash.v_sparge)
+
+        table = result.table()
+        assert len(table) == 48
+        assert table['efficiency'][-1] == 0.8
+        assert table['fg'][-1] == result.fg[-1, -1, -1, -1, -1]
@@ -0,0 +1,70 @@
+# Licensed under an MIT style license - see LICENSE
+from bisect import bisect_left
+import copy
+import pickle
+import pytest
+import brew as b
+from brew import timing as T
+
+
+class TestTiming:
+    def test_interned(self):
+        assert T.Boil(60) is T.Boil(60)
+        assert T.Boil(60) is T.Boil(60.0)
+        assert T.Mash() is T.Mash()
+        assert T.Secondary() is T.Secondary(0)
+        assert T.Boil(60) is not T.Boil(10)
+
+    def test_immutable(self):
+        with pytest.raises(AttributeError):
+            T.Boil(60).time = 10
+        with pytest.raises(AttributeError):
+            T.Mash().step = 3
+
+    def test_hash(self):
+        timings = [T.Mash(), T.FirstWort(60), T.Boil(60), T.Boil(10),
+                   T.HopStand(20), T.Secondary(3), T.Final()]
+        assert len(set(timings)) == len(timings)
+        assert hash(T.FirstWort(60)) == hash(T.FirstWort(90))
+        assert {T.Boil(60): 1}[T.Boil(60)] == 1
+
+    def test_pickle(self):
+        for timing in (T.Mash(), T.Boil(60), T.HopStand(20), T.Secondary()):
+            assert pickle.loads(pickle.dumps(timing)) is timing
+            assert copy.deepcopy(timing) is timing
+
+    def test_ingredient_slots(self):
+        ingredients = [b.Grain(b.PPG.AmericanTwoRow, 8),
+                       b.Hop('Cascade', 7.0, 1.0, T.Boil(60)),
+                       b.Wort(1.050, 1.0), b.Fruit('Cherry', 1.06, 2.0),
+                       b.Spice('Coriander', '1 tsp', T.Boil(5))]
+        for a in ingredients:
+            assert not hasattr(a, '__dict__')
+            c = pickle.loads(pickle.dumps(a))
+            assert type(c) is type(a)
+            assert str(c) == str(a)
+            assert c.timing is a.timing
+
+    def test_sort_key(self):
+        timings = [T.Unspecified(), T.Mash(), T.Vorlauf(), T.Sparge(),
+                   T.Lauter(), T.FirstWort(60), T.Boil(60), T.Boil(10),
+                   T.Boil(0), T.HopStand(5), T.HopStand(20), T.Primary(),
+                   T.Secondary(), T.Secondary(3), T.Packaging(), T.Final()]
+        assert sorted(reversed(timings)) == timings
+        assert sorted(timings, key=lambda t: t.sort_key) == timings
+        for a, c in zip(timings[:-1], timings[1:]):
+            assert a < c and a <= c and c > a and c >= a and a != c
+
+        assert T.HopStand(20) > T.HopStand(5)
+        assert T.Secondary(3) > T.Secondary()
+        assert T.Boil(10) > T.Boil(60)
+
+    def test_bisect(self):
+        keys = [T.Boil(60).sort_key, T.Boil(10).sort_key,
+                T.Primary().sort_key]
+        assert bisect_left(keys, T.Boil(30).sort_key) == 1
+
+    def test_not_timing(self):
+        assert T.Mash() != None  # noqa: E711
+        with pytest.raises(TypeError):
+            T.Mash() < 1
@@ -0,0 +1,102 @@
+# Licensed under an MIT style license - see LICENSE
+import numpy as np
+import pytest
+import brew as b
+from brew import util
+from brew.util import bbtn
+
+
+og = (1.040, 1.060)
+fg = (1.008, 1.012, 1.016)
+
+# functions documented to accept arrays, and two sets of values for
+# their arguments: the first argument is broadcast against the rest
+samples = {
+    util.abv: (og, fg),
+    util.abw: (og, fg),
+    util.calories: (og, fg),
+    util.calories_alcohol: (og, fg),
+    util.calories_extract: (og, fg),
+    util.calories_protein: (og, fg),
+    util.carbohydrates: (og, fg),
+    util.f2c: ((32, 212),),
+    util.hydrometer_correct: (og, (60, 70, 80)),
+    util.ibu: ((20, 30), (1.0, 2.0, 0.5), (5, 7, 12), (5, 5.5, 6)),
+    util.infusion_volume: ((10, 12), (8, 10, 12), (122, 148, 152),
+                           (152, 156, 170)),
+    util.priming_sugar: ((60, 68), (2.0, 2.4, 2.8), (5, 5.5, 6)),
+    util.refractometer_correct: (og, fg, (1.0, 1.02, 1.04)),
+    util.sg2brix: (og,),
+    util.strike_water: ((1.25, 1.5), (60, 65, 70), (148, 152, 156)),
+    util.utilization: ((10, 60), (1.040, 1.050, 1.060)),
+    bbtn.plato2sg: ((10, 15),),
+    bbtn.real_attenuation: (og, fg),
+    bbtn.real_extract: (og, fg),
+    bbtn.sg2plato: (og,),
+}
+
+
+class TestUtil:
+    @pytest.mark.parametrize('f', samples, ids=lambda f: f.__name__)
+    def test_broadcast(self, f):
+        args = samples[f]
+        arrays = ([np.array(args[0])[:, None]]
+                  + [np.array(a) for a in args[1:]])
+        result = f(*arrays)
+        arrays = np.broadcast_arrays(*arrays)
+        assert result.shape == arrays[0].shape
+        for i in np.ndindex(result.shape):
+            scalar = f(*[a[i].item() for a in arrays])
+            assert isinstance(scalar, float)
+            assert np.isclose(result[i], scalar)
+
+
+    def test_scalars(self):
+        # scalar inputs return Python floats
+        assert isinstance(util.utilization(60, 1.050), float)
+        assert isinstance(util.abv(1.050, 1.010), float)
+        assert isinstance(bbtn.sg2plato(1.050), float)
+
+    def test_utilization(self):
+        t = np.array([0, 10, 60])
+        sg = np.array([[1.040], [1.060]])
+        u = util.utilization(t, sg)
+        assert u.shape == (2, 3)
+        for i in range(2):
+            for j in range(3):
+                assert np.isclose(u[i, j], util.utilization(t[j], sg[i, 0]))
+
+        u = util.utilization(60, 1.050, whole=np.array([False, True]))
+        assert np.allclose(u[1], u[0] * 0.85)
+
+    def test_final_gravity(self):
+        sg = np.linspace(1.040, 1.080, 5)
+        fg = util.final_gravity(sg, [150, 154], ('', 70, 80))
+        for i in range(5):
+            assert np.isclose(fg[i], util.final_gravity(sg[i], 152, ('', 75)))
+
+        # arrays of temperatures are broadcast, not averaged
+        T_sacc = np.array([148, 152, 156])
+        fg = util.final_gravity(1.050, T_sacc, ('', 75))
+        assert fg.shape == (3,)
+        assert np.isclose(fg[1], util.final_gravity(1.050, 152, ('', 75)))
+
+        # attenuation from a culture, and from arrays
+        culture = b.Culture(b.CultureBank.CaliforniaAle)
+        fg = util.final_gravity(sg, 152, culture)
+        assert fg.shape == (5,)
+        assert np.isclose(fg[2], util.final_gravity(sg[2], 152, culture))
+        a = np.array([70, 75, 80])
+        fg = util.final_gravity(1.050, 152, ('', a))
+        assert np.allclose(fg, [util.final_gravity(1.050, 152, ('', x))
+                                for x in a])
+
+    def test_bbtn(self):
+        og = np.array([1.040, 1.060, 1.080])
+        fg = np.array([1.008, 1.012, 1.016])
+        assert np.allclose(bbtn.plato2sg(bbtn.sg2plato(og)), og, atol=1e-4)
+        abw = bbtn.abw(og, fg)
+        for i in range(3):
+            assert np.isclose(abw[i], bbtn.abw(og[i], fg[i]))
+            assert np.isclose(util.calories(og, fg)[i],
+                              util.calories(og[i], fg[i]))
@@ -0,0 +1,102 @@
+# Licensed under an MIT style license - see LICENSE
+from datetime import date
+import yaml
+import brew as b
+from brew.yaml import (BrewDumper, BrewLoader, Hydrometer, batch_recipe,
+                       dump_brewlog, iter_brewlog, load_brewlog)
+
+
+def batch(n=1):
+    return {
+        'batch': n,
+        'date': date(2020, 1, n),
+        'ingredients': [
+            b.Grain(b.PPG.AmericanTwoRow, 8),
+            b.Hop('Cascade', 7.0, 1.0, b.Boil(60)),
+            b.Hop('Citra', 12.0, 1.0, b.HopStand(20), whole=True),
+            b.Culture(b.CultureBank.CaliforniaAle),
+            b.Spice('Coriander', '1 tsp', b.Boil(5)),
+        ],
+        'measurements': [Hydrometer(date(2020, 1, 2), 1.050, 68, 'OG')],
+    }
+
+
+class TestBrewlog:
+    def test_round_trip(self):
+        documents = [batch(), batch()]
+        s = dump_brewlog(documents)
+        loaded = load_brewlog(s)
+        assert len(loaded) == 2
+        for a, c in zip(documents, loaded):
+            assert a['date'] == c['date']
+            assert ([repr(i) for i in a['ingredients']]
+                    == [repr(i) for i in c['ingredients']])
+            assert c['measurements'][0].gravity == 1.050
+
+        # same tags as the default loader
+        default = list(yaml.load_all(s, Loader=yaml.Loader))
+        assert (repr(default[0]['ingredients'])
+                == repr(loaded[0]['ingredients']))
+
+    def test_ingredients(self):
+        items = [b.Wort(1.050, 2.0), b.Fruit('Cherry', 1.060, 3.0),
+                 b.WaterTreatment('Gypsum', '1 tsp'),
+                 b.Culture(('House', 70, 80), '2')]
+        loaded, = load_brewlog(dump_brewlog([items]))
+        assert [repr(i) for i in loaded] == [repr(i) for i in items]
+        assert loaded[0].volume == 2.0
+
+    def test_safe(self):
+        assert issubclass(BrewLoader, yaml.SafeLoader) or (
+            yaml.__with_libyaml__ and issubclass(BrewLoader, yaml.CSafeLoader))
+        s = yaml.dump(object())
+        try:
+            load_brewlog(s)
+        except yaml.YAMLError:
+            pass
+        else:
+            raise AssertionError('loaded an arbitrary python object')
+
+    def test_dumper(self):
+        assert (BrewDumper.yaml_representers
+                is not yaml.Dumper.yaml_representers)
+        assert b.Hop not in (yaml.CSafeDumper if yaml.__with_libyaml__
+                             else yaml.SafeDumper).yaml_representers
+
+
+class TestIterBrewlog:
+    def test_batches(self):
+        s = dump_brewlog([batch(1), [batch(2), 'note', batch(3)], None])
+        batches = list(iter_brewlog(s))
+        assert [x.data['batch'] for x in batches] == [1, 2, 3]
+        for x in batches:
+            assert isinstance(x.ingredients, b.Ingredients)
+            assert ([repr(i) for i in x.ingredients]
+                    == [repr(i) for i in batch()['ingredients']])
+            assert x.measurements[0].note == 'OG'
+
+    def test_predicate(self):
+        headers = []
+
+        def predicate(header):
+            headers.append(header)
+            return header['batch'] == 2
+
+        # batch 1 is broken, but never constructed
+        s = dump_brewlog([batch(1), batch(2)]).replace('alpha: 7.0', '', 1)
+        batches = list(iter_brewlog(s, predicate))
+        assert [x.data['batch'] for x in batches] == [2]
+        assert headers == [{'batch': 1, 'date': date(2020, 1, 1)},
+                           {'batch': 2, 'date': date(2020, 1, 2)}]
+
+    def test_recipe(self):
+        data = batch()
+        data['target_volume'] = 5.5
+        data['config'] = {'T_rest': [122], 'efficiency': 0.72}
+        x, = iter_brewlog(dump_brewlog([data]))
+        target_volume, config = batch_recipe(x)
+        assert target_volume == 5.5
+        # lists are tuples, as from brew.json and brew.archive
+        assert config == {'T_rest': (122,), 'efficiency': 0.72}
+        x, = iter_brewlog(dump_brewlog([batch()]))
+        assert batch_recipe(x) is None